@@ -0,0 +1,40 @@
+"""Leaderboard score indexes for top-N and keyset pagination
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '002'
+down_revision: Union[str, None] = '001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # (mode, score DESC, id) serves the per-mode top-N page as an index range scan
+    op.create_index(
+        'ix_leaderboard_mode_score_id',
+        'leaderboard',
+        ['mode', sa.text('score DESC'), 'id'],
+        unique=False,
+    )
+    # (score DESC, id) serves the all-modes leaderboard the same way
+    op.create_index(
+        'ix_leaderboard_score_id',
+        'leaderboard',
+        [sa.text('score DESC'), 'id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_leaderboard_score_id', table_name='leaderboard')
+    op.drop_index('ix_leaderboard_mode_score_id', table_name='leaderboard')
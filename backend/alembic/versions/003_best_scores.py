@@ -0,0 +1,64 @@
+"""Best score per player and mode
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '003'
+down_revision: Union[str, None] = '002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Reuse the enum type created by 001 on PostgreSQL
+    mode_enum = sa.Enum('pass-through', 'walls', name='gammodeenum').with_variant(
+        postgresql.ENUM('pass-through', 'walls', name='gammodeenum', create_type=False),
+        'postgresql',
+    )
+    op.create_table(
+        'best_scores',
+        sa.Column('username', sa.String(), nullable=False),
+        sa.Column('mode', mode_enum, nullable=False),
+        sa.Column('score', sa.Integer(), nullable=False),
+        sa.Column('entry_id', sa.String(), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.PrimaryKeyConstraint('username', 'mode')
+    )
+    op.create_index(
+        'ix_best_scores_mode_score_username',
+        'best_scores',
+        ['mode', sa.text('score DESC'), 'username'],
+        unique=False,
+    )
+
+    # Backfill from existing submissions: the earliest highest score per player and mode
+    op.execute(
+        """
+        INSERT INTO best_scores (username, mode, score, entry_id, date)
+        SELECT username, mode, score, id, date
+        FROM (
+            SELECT username, mode, score, id, date,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY username, mode
+                       ORDER BY score DESC, date, id
+                   ) AS position
+            FROM leaderboard
+        ) ranked
+        WHERE position = 1
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_best_scores_mode_score_username', table_name='best_scores')
+    op.drop_table('best_scores')
@@ -0,0 +1,34 @@
+"""Replays of leaderboard entries
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '004'
+down_revision: Union[str, None] = '003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'replays',
+        sa.Column('entry_id', sa.String(), nullable=False),
+        sa.Column('ticks', sa.Integer(), nullable=False),
+        sa.Column('data', sa.LargeBinary(), nullable=False),
+        sa.Column('createdAt', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['entry_id'], ['leaderboard.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('entry_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('replays')
@@ -0,0 +1,71 @@
+"""Daily and weekly leaderboard rollups
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from datetime import date, timedelta
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '005'
+down_revision: Union[str, None] = '004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Reuse the enum type created by 001 on PostgreSQL
+    mode_enum = sa.Enum('pass-through', 'walls', name='gammodeenum').with_variant(
+        postgresql.ENUM('pass-through', 'walls', name='gammodeenum', create_type=False),
+        'postgresql',
+    )
+    op.create_table(
+        'leaderboard_windows',
+        sa.Column('period', sa.String(), nullable=False),
+        sa.Column('period_start', sa.Date(), nullable=False),
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('username', sa.String(), nullable=False),
+        sa.Column('score', sa.Integer(), nullable=False),
+        sa.Column('mode', mode_enum, nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.PrimaryKeyConstraint('period', 'id')
+    )
+    op.create_index(
+        'ix_leaderboard_windows_period_mode_score_id',
+        'leaderboard_windows',
+        ['period', 'period_start', 'mode', sa.text('score DESC'), 'id'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_leaderboard_windows_period_score_id',
+        'leaderboard_windows',
+        ['period', 'period_start', sa.text('score DESC'), 'id'],
+        unique=False,
+    )
+
+    # Backfill the current day and week from existing submissions
+    today = date.today()
+    for period, start in (("day", today), ("week", today - timedelta(days=today.weekday()))):
+        op.execute(
+            sa.text(
+                """
+                INSERT INTO leaderboard_windows (period, period_start, id, username, score, mode, date)
+                SELECT :period, :start, id, username, score, mode, date
+                FROM leaderboard
+                WHERE date >= :start
+                """
+            ).bindparams(sa.bindparam('period', period), sa.bindparam('start', start, type_=sa.Date()))
+        )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_leaderboard_windows_period_score_id', table_name='leaderboard_windows')
+    op.drop_index('ix_leaderboard_windows_period_mode_score_id', table_name='leaderboard_windows')
+    op.drop_table('leaderboard_windows')
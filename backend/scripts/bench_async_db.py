@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Compare request throughput with sync sessions on the event loop vs async sessions.
+
+Each simulated request reads the first leaderboard page. "sync" runs
+crud.get_leaderboard on a sync Session straight from the coroutine (how the
+routes used to work, blocking the loop for the whole query); "async" awaits
+crud.get_leaderboard_async on an AsyncSession. SQLite answers locally in
+microseconds, so --latency-ms adds a per-query server-side delay to stand in
+for the network round-trip of a real database server.
+
+Usage: python scripts/bench_async_db.py [--requests 500] [--concurrency 50] [--latency-ms 2]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from sqlalchemy import create_engine, event, insert, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from src import crud
+from src.database import Base, LeaderboardEntryDB, GameModeEnum
+from src.models import GameMode
+
+
+def add_latency(sync_engine, latency_ms: float) -> None:
+    """Register snake_sleep(), a SQL function that blocks its connection"""
+    @event.listens_for(sync_engine, "connect")
+    def register(dbapi_connection, connection_record):
+        dbapi_connection.create_function("snake_sleep", 0, lambda: time.sleep(latency_ms / 1000))
+
+
+def populate(url: str) -> None:
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(LeaderboardEntryDB),
+            [
+                {"id": str(i), "username": f"p{i}", "score": i, "mode": GameModeEnum.WALLS, "date": date(2026, 1, 1)}
+                for i in range(10_000)
+            ],
+        )
+    engine.dispose()
+
+
+async def run(label: str, handle_request, requests: int, concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            await handle_request()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    print(f"{label:<8} {requests / elapsed:>10.1f} req/s  ({elapsed:.2f}s for {requests} requests)")
+
+
+async def main(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        populate(f"sqlite:///{path}")
+
+        sync_engine = create_engine(
+            f"sqlite:///{path}", connect_args={"check_same_thread": False}, pool_size=args.concurrency
+        )
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}", pool_size=args.concurrency)
+        if args.latency_ms:
+            add_latency(sync_engine, args.latency_ms)
+            add_latency(async_engine.sync_engine, args.latency_ms)
+        SyncSession = sessionmaker(bind=sync_engine, autoflush=False)
+        AsyncSession = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+        async def sync_request():
+            with SyncSession() as db:
+                if args.latency_ms:
+                    db.execute(text("SELECT snake_sleep()"))
+                crud.get_leaderboard(db, GameMode.WALLS, limit=100)
+
+        async def async_request():
+            async with AsyncSession() as db:
+                if args.latency_ms:
+                    await db.execute(text("SELECT snake_sleep()"))
+                await crud.get_leaderboard_async(db, GameMode.WALLS, limit=100)
+
+        print(f"{args.requests} requests, concurrency {args.concurrency}, added latency {args.latency_ms}ms")
+        await run("sync", sync_request, args.requests, args.concurrency)
+        await run("async", async_request, args.requests, args.concurrency)
+
+        sync_engine.dispose()
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    asyncio.run(main(parser.parse_args()))
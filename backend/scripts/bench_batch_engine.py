@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Measure batch simulator throughput against a Python loop over SnakeGame.
+
+For each N, N pass-through games run --ticks steps with random turns (the
+same plan for both simulators) and the script reports game-ticks per second.
+Requires NumPy (uv sync --extra sim).
+
+Usage: python scripts/bench_batch_engine.py [--sizes 1 1000 100000] [--ticks 100]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import numpy as np
+
+from src.batch_engine import DIRECTIONS, NO_TURN, BatchSimulator
+from src.game_engine import SnakeGame
+from src.models import GameMode
+
+
+def make_plan(ticks: int, n: int) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    plan = rng.integers(0, 4, size=(ticks, n), dtype=np.int8)
+    plan[rng.random((ticks, n)) < 0.8] = NO_TURN
+    return plan
+
+
+def bench_batch(n: int, plan: np.ndarray) -> float:
+    sim = BatchSimulator(n, modes=[GameMode.PASS_THROUGH] * n)
+    start = time.perf_counter()
+    sim.run(len(plan), plan)
+    return int(sim.ticks.sum()) / (time.perf_counter() - start)
+
+
+def bench_scalar(n: int, plan: np.ndarray) -> float:
+    games = [SnakeGame(GameMode.PASS_THROUGH, seed=i) for i in range(n)]
+    turns = [[None if code == NO_TURN else DIRECTIONS[code] for code in row] for row in plan.tolist()]
+    start = time.perf_counter()
+    for row in turns:
+        for game, turn in zip(games, row):
+            if game.game_over:
+                continue
+            if turn is not None:
+                game.change_direction(turn)
+            game.tick()
+    return sum(game.ticks for game in games) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 1_000, 100_000])
+    parser.add_argument("--ticks", type=int, default=100)
+    args = parser.parse_args()
+
+    print(f"{'games':>8} {'batch (NumPy)':>22} {'SnakeGame loop':>22}")
+    for n in args.sizes:
+        plan = make_plan(args.ticks, n)
+        batch = bench_batch(n, plan)
+        scalar = bench_scalar(n, plan)
+        print(f"{n:>8,} {batch:>14,.0f} ticks/s {scalar:>14,.0f} ticks/s")
+
+
+if __name__ == "__main__":
+    main()
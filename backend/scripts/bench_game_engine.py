@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Measure game engine throughput on one core.
+
+Runs --games concurrent SnakeGame instances in pass-through mode, starting
+from snakes of --length cells and turning at random every few ticks, and
+reports ticks per second. A list-based port of the frontend's moveSnake runs
+the same workload for comparison.
+
+Usage: python scripts/bench_game_engine.py [--games 1000] [--ticks 200] [--length 3 100]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from collections import deque
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from src.game_engine import GRID_SIZE, OPPOSITE, SnakeGame
+from src.models import Direction, GameMode
+
+DELTAS = {Direction.UP: (0, -1), Direction.DOWN: (0, 1), Direction.LEFT: (-1, 0), Direction.RIGHT: (1, 0)}
+
+
+def list_move(snake, direction, food):
+    """The frontend's algorithm: new list per move, linear self-collision scan"""
+    x, y = snake[0]
+    dx, dy = DELTAS[direction]
+    head = ((x + dx) % GRID_SIZE, (y + dy) % GRID_SIZE)
+    ate = head == food
+    body = snake if ate else snake[:-1]
+    if head in body:
+        return snake, False, True
+    return [head] + body, ate, False
+
+
+def serpentine(length: int):
+    """Snake of the given length with its head at (10, 10), coiled below row 10"""
+    cells = [(x, 10) for x in range(10, -1, -1)]
+    for y in range(11, GRID_SIZE):
+        row = range(GRID_SIZE) if y % 2 else range(GRID_SIZE - 1, -1, -1)
+        cells.extend((x, y) for x in row)
+    return cells[:length]
+
+
+def turns(games: int, ticks: int):
+    rng = random.Random(0)
+    directions = list(Direction)
+    return [[rng.choice(directions) if rng.random() < 0.2 else None for _ in range(ticks)] for _ in range(games)]
+
+
+def bench_engine(plan, ticks: int, length: int) -> float:
+    games = [SnakeGame(GameMode.PASS_THROUGH, seed=i) for i in range(len(plan))]
+    body = [y * GRID_SIZE + x for x, y in serpentine(length)]
+    for game in games:
+        game.body = deque(body)
+        game.occupied = bytearray(GRID_SIZE * GRID_SIZE)
+        for cell in body:
+            game.occupied[cell] = 1
+        game.food = None
+    start = time.perf_counter()
+    done = 0
+    for t in range(ticks):
+        for game, moves in zip(games, plan):
+            if game.game_over:
+                continue
+            if moves[t] is not None:
+                game.change_direction(moves[t])
+            game.tick()
+            done += 1
+    return done / (time.perf_counter() - start)
+
+
+def bench_list(plan, ticks: int, length: int) -> float:
+    snakes = [serpentine(length) for _ in plan]
+    directions = [Direction.RIGHT] * len(plan)
+    dead = [False] * len(plan)
+    start = time.perf_counter()
+    done = 0
+    for t in range(ticks):
+        for i, moves in enumerate(plan):
+            if dead[i]:
+                continue
+            turn = moves[t]
+            if turn is not None and OPPOSITE[turn] != directions[i]:
+                directions[i] = turn
+            snakes[i], _, dead[i] = list_move(snakes[i], directions[i], None)
+            done += 1
+    return done / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=1_000)
+    parser.add_argument("--ticks", type=int, default=200)
+    parser.add_argument("--length", type=int, nargs="+", default=[3, 100])
+    args = parser.parse_args()
+
+    plan = turns(args.games, args.ticks)
+    print(f"{args.games} games x {args.ticks} ticks")
+    print(f"{'length':>8} {'engine (deque + grid)':>24} {'list port of moveSnake':>24}")
+    for length in args.length:
+        engine = bench_engine(plan, args.ticks, length)
+        listed = bench_list(plan, args.ticks, length)
+        print(f"{length:>8} {engine:>16,.0f} ticks/s {listed:>16,.0f} ticks/s")
+
+
+if __name__ == "__main__":
+    main()
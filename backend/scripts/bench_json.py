@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Compare list endpoint latency with and without FAST_JSON_RESPONSES.
+
+Fills a throwaway SQLite database with --rows leaderboard entries and the
+active player registry with as many players, then times
+GET /api/leaderboard?unbounded=true and GET /api/games/active through the
+app, first returning models (validated again against response_model) and
+then through the pre-encoded fast path.
+
+Usage: python scripts/bench_json.py [--rows 10000] [--repeat 20]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from src.active_players import active_players
+from src.config import settings
+from src.database import Base, LeaderboardEntryDB, GameModeEnum, get_db
+from src.main import app
+from src.models import GameMode
+
+
+def populate(url: str, rows: int) -> None:
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(LeaderboardEntryDB),
+            [
+                {"id": str(i), "username": f"p{i}", "score": i, "mode": GameModeEnum.WALLS, "date": date(2026, 1, 1)}
+                for i in range(rows)
+            ],
+        )
+    engine.dispose()
+
+
+def time_get(client: TestClient, url: str, repeat: int) -> float:
+    """Best time of ``repeat`` requests, in milliseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = client.get(url)
+        best = min(best, time.perf_counter() - start)
+        response.raise_for_status()
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        populate(f"sqlite:///{path}", args.rows)
+        engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+        Session = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+        async def override_get_db():
+            async with Session() as db:
+                yield db
+
+        app.dependency_overrides[get_db] = override_get_db
+        for i in range(args.rows):
+            active_players.heartbeat(str(i), f"p{i}", i, GameMode.WALLS)
+
+        urls = ["/api/leaderboard?unbounded=true", "/api/games/active"]
+        print(f"{args.rows} rows, best of {args.repeat}")
+        print(f"{'endpoint':<34} {'models':>10} {'fast path':>10} {'speedup':>8}")
+        with TestClient(app) as client:
+            for url in urls:
+                settings.FAST_JSON_RESPONSES = False
+                models = time_get(client, url, args.repeat)
+                settings.FAST_JSON_RESPONSES = True
+                fast = time_get(client, url, args.repeat)
+                print(f"{url:<34} {models:>8.1f}ms {fast:>8.1f}ms {models / fast:>7.1f}x")
+        app.dependency_overrides.clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Measure leaderboard latency while a storm of logins runs against the app.
+
+Drives src.main:app in-process over httpx's ASGI transport with a
+throwaway SQLite database. Leaderboard reads are timed three times: with
+no logins, during a login storm with bcrypt run inline on the event loop
+(how login used to behave), and during a login storm with bcrypt on the
+password hashing pool.
+
+Usage: python scripts/bench_login_storm.py [--logins 40] [--concurrency 8] [--reads 200]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+# Point the app at a throwaway database before it is imported
+_tmp_dir = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir.name, 'bench.db')}"
+
+import httpx
+
+from src import crud
+from src.main import app
+
+CREDENTIALS = {"email": "storm@snake.io", "password": "storm-password"}
+
+
+async def inline_verify(plain_password: str, hashed_password: str) -> bool:
+    return crud.verify_password(plain_password, hashed_password)
+
+
+async def read_leaderboard(client: httpx.AsyncClient, reads: int, stop: asyncio.Event) -> list:
+    latencies = []
+    for _ in range(reads):
+        start = time.perf_counter()
+        response = await client.get("/api/leaderboard", params={"mode": "walls", "unbounded": "true"})
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(0.005)
+    stop.set()
+    return latencies
+
+
+async def login_storm(client: httpx.AsyncClient, logins: int, concurrency: int, stop: asyncio.Event) -> int:
+    done = 0
+
+    async def worker():
+        nonlocal done
+        while not stop.is_set() and done < logins:
+            done += 1
+            response = await client.post("/api/auth/login", json=CREDENTIALS)
+            response.raise_for_status()
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return done
+
+
+async def phase(client: httpx.AsyncClient, reads: int, logins: int, concurrency: int) -> dict:
+    stop = asyncio.Event()
+    start = time.perf_counter()
+    latencies, completed = await asyncio.gather(
+        read_leaderboard(client, reads, stop),
+        login_storm(client, logins, concurrency, stop),
+    )
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "p50": statistics.median(latencies),
+        "p95": latencies[int(len(latencies) * 0.95) - 1],
+        "max": latencies[-1],
+        "logins_per_s": completed / elapsed,
+    }
+
+
+async def main(args):
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            await client.post("/api/auth/signup", json={**CREDENTIALS, "username": "storm"})
+            await client.post(
+                "/api/leaderboard/batch",
+                json=[{"username": f"p{i}", "score": i, "mode": "walls"} for i in range(500)],
+            )
+
+            results = {"idle": await phase(client, args.reads, 0, args.concurrency)}
+            pooled_verify = crud.verify_password_async
+            crud.verify_password_async = inline_verify
+            try:
+                results["storm, bcrypt inline"] = await phase(client, args.reads, args.logins, args.concurrency)
+            finally:
+                crud.verify_password_async = pooled_verify
+            results["storm, bcrypt pool"] = await phase(client, args.reads, args.logins, args.concurrency)
+
+    print(f"bcrypt rounds: {crud.settings.BCRYPT_ROUNDS}, hashing pool: {crud.settings.PASSWORD_HASH_WORKERS} threads")
+    print(f"{'phase':<24} {'p50':>9} {'p95':>9} {'max':>9} {'logins/s':>10}")
+    for name, result in results.items():
+        print(
+            f"{name:<24} {result['p50']:>7.1f}ms {result['p95']:>7.1f}ms "
+            f"{result['max']:>7.1f}ms {result['logins_per_s']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--reads", type=int, default=200)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Measure the per-request overhead of MetricsMiddleware and the query hooks.
+
+Drives a trivial ASGI app directly (no HTTP client or server in the way) with
+and without the middleware, with a fake route in the scope so a series is
+recorded just like for a real request, then times a SELECT 1 on an in-memory
+SQLite engine with and without instrument_engine().
+
+Usage: python scripts/bench_metrics.py [--requests 200000] [--queries 50000]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from sqlalchemy import create_engine, text
+from starlette.routing import Route
+
+from src import metrics
+
+ROUTE = Route("/api/leaderboard/{entry_id}/replay", endpoint=lambda request: None)
+START = {"type": "http.response.start", "status": 200, "headers": []}
+BODY = {"type": "http.response.body", "body": b"ok"}
+
+
+async def endpoint(scope, receive, send):
+    scope["route"] = ROUTE
+    await send(START)
+    await send(BODY)
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message):
+    pass
+
+
+async def time_app(app, requests: int) -> float:
+    scope = {"type": "http", "method": "GET", "path": "/api/leaderboard/1/replay"}
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - start) / requests
+
+
+def time_queries(instrument: bool, queries: int) -> float:
+    engine = create_engine("sqlite://")
+    if instrument:
+        metrics.instrument_engine(engine)
+    statement = text("SELECT 1")
+    with engine.connect() as conn:
+        start = time.perf_counter()
+        for _ in range(queries):
+            conn.execute(statement)
+        elapsed = time.perf_counter() - start
+    engine.dispose()
+    return elapsed / queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=50_000)
+    args = parser.parse_args()
+
+    plain = asyncio.run(time_app(endpoint, args.requests))
+    measured = asyncio.run(time_app(metrics.MetricsMiddleware(endpoint), args.requests))
+    print(f"🌐 Request without middleware: {plain * 1e6:7.2f} µs")
+    print(f"🌐 Request with middleware:    {measured * 1e6:7.2f} µs  (+{(measured - plain) * 1e6:.2f} µs)")
+
+    plain = time_queries(False, args.queries)
+    measured = time_queries(True, args.queries)
+    print(f"🗄️  SELECT 1 without hooks:     {plain * 1e6:7.2f} µs")
+    print(f"🗄️  SELECT 1 with hooks:        {measured * 1e6:7.2f} µs  (+{(measured - plain) * 1e6:.2f} µs)")
+
+
+if __name__ == "__main__":
+    main()
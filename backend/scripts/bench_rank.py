@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark player rank lookups against growing best_scores tables.
+
+For each table size this reports the one-off cost of building the rank
+index (done by a background task in the API) and the mean latency of
+crud.get_player_rank afterwards, next to an indexed SQL COUNT(*) WHERE
+score > ?, which answers rank queries until the index is built.
+
+Usage: python scripts/bench_rank.py [--sizes 1000 10000 100000 1000000] [--queries 2000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from sqlalchemy import create_engine, func, insert
+from sqlalchemy.orm import sessionmaker
+
+from src import crud
+from src.database import Base, BestScoreDB, GameModeEnum
+from src.models import GameMode
+
+
+def build_database(path: str, size: int):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(size)
+    rows = [
+        {
+            "username": f"player{i}",
+            "mode": GameModeEnum.WALLS,
+            "score": int(rng.expovariate(1 / 500)),
+            "entry_id": str(i),
+            "date": date(2026, 1, 1),
+        }
+        for i in range(size)
+    ]
+    with engine.begin() as conn:
+        for start in range(0, size, 50_000):
+            conn.execute(insert(BestScoreDB), rows[start:start + 50_000])
+    return engine
+
+
+def bench_size(size: int, queries: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = build_database(os.path.join(tmp, "bench.db"), size)
+        db = sessionmaker(bind=engine)()
+        rng = random.Random(0)
+        usernames = [f"player{rng.randrange(size)}" for _ in range(queries)]
+        crud.rank_index.clear()
+
+        start = time.perf_counter()
+        crud.rank_index.load(db, GameMode.WALLS)
+        load_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        for username in usernames:
+            crud.get_player_rank(db, username, GameMode.WALLS)
+        index_us = (time.perf_counter() - start) / queries * 1e6
+
+        sql_queries = max(1, queries // 10)
+        start = time.perf_counter()
+        for username in usernames[:sql_queries]:
+            best = crud.get_best_score(db, username, GameMode.WALLS)
+            db.query(func.count()).select_from(BestScoreDB).filter(
+                BestScoreDB.mode == GameModeEnum.WALLS,
+                BestScoreDB.score > best.score,
+            ).scalar()
+        sql_us = (time.perf_counter() - start) / sql_queries * 1e6
+
+        db.close()
+        engine.dispose()
+    return {"size": size, "load_ms": load_ms, "index_us": index_us, "sql_count_us": sql_us}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=2_000)
+    args = parser.parse_args()
+
+    print(f"{'players':>10} {'index load':>12} {'rank (index)':>14} {'rank (SQL COUNT)':>18}")
+    for size in args.sizes:
+        result = bench_size(size, args.queries)
+        print(
+            f"{result['size']:>10,} {result['load_ms']:>10.1f}ms "
+            f"{result['index_us']:>12.1f}µs {result['sql_count_us']:>16.1f}µs"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Measure replay verification throughput.
+
+Records --games bot games, then re-simulates all of them inline on the event
+loop thread and on process pools of each --workers size, as the score
+submission route does, and reports games and ticks verified per second.
+
+Usage: python scripts/bench_verify.py [--games 200] [--max-ticks 2000] [--workers 1 2 4]
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from src.game_engine import SnakeGame
+from src.models import GameMode
+from src.replay import ReplayRecorder
+from src.spectate import _autopilot
+from src.verification import simulate
+
+
+def record(seed: int, max_ticks: int) -> bytes:
+    game = SnakeGame(GameMode.WALLS, seed=seed)
+    recorder = ReplayRecorder(GameMode.WALLS, seed)
+    while not game.game_over and game.ticks < max_ticks:
+        direction = _autopilot(game)
+        if direction != game.direction:
+            recorder.turn(direction)
+            game.change_direction(direction)
+        game.tick()
+        recorder.tick()
+    return recorder.finish()
+
+
+def bench_inline(replays, max_ticks: int):
+    start = time.perf_counter()
+    ticks = sum(simulate(data, max_ticks).ticks for data in replays)
+    return len(replays), ticks, time.perf_counter() - start
+
+
+async def bench_pool(replays, max_ticks: int, workers: int):
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        # Warm the workers up so process start-up isn't measured
+        await asyncio.gather(*(loop.run_in_executor(executor, simulate, replays[0], max_ticks) for _ in range(workers)))
+        start = time.perf_counter()
+        results = await asyncio.gather(*(loop.run_in_executor(executor, simulate, data, max_ticks) for data in replays))
+        elapsed = time.perf_counter() - start
+    return len(results), sum(result.ticks for result in results), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=200)
+    parser.add_argument("--max-ticks", type=int, default=2_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    replays = [record(seed, args.max_ticks) for seed in range(args.games)]
+    print(f"{args.games} replays, {sum(map(len, replays)) / len(replays):.0f} bytes on average, {os.cpu_count()} CPUs")
+    print(f"{'verifier':>12} {'games/s':>12} {'ticks/s':>14}")
+    runs = [("inline", bench_inline(replays, args.max_ticks))]
+    for workers in args.workers:
+        runs.append((f"{workers} workers", asyncio.run(bench_pool(replays, args.max_ticks, workers))))
+    for name, (games, ticks, elapsed) in runs:
+        print(f"{name:>12} {games / elapsed:>12,.0f} {ticks / elapsed:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
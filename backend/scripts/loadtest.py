@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Load test the API with many concurrent virtual users.
+
+Each user loops over a weighted mix of requests with exponential think times
+in between: leaderboard reads per game mode, score submissions, logins,
+signups and /api/games/active polling (revalidated with If-None-Match, like
+a browser). Users start spread over --ramp-up seconds and stop after
+--duration seconds.
+
+By default src.main:app is driven in-process over httpx's ASGI transport with
+a throwaway SQLite database. --uvicorn starts a real uvicorn on localhost
+against a throwaway database instead, and --url targets a server that is
+already running. Latency percentiles and throughput are reported per route;
+--output writes them as JSON, and --baseline compares against such a file
+from an earlier run (for example the previous release).
+
+Usage: python scripts/loadtest.py [--users 500] [--duration 30] [--uvicorn | --url URL] [--output run.json] [--baseline old.json]
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import os
+import random
+import secrets
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Add parent directory to path
+sys.path.insert(0, BACKEND)
+
+# Point the app at a throwaway database before it is imported
+_tmp_dir = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir.name, 'loadtest.db')}"
+
+import httpx
+
+MODES = ("walls", "pass-through")
+PASSWORD = "load-test-password"
+
+# Relative weights of the actions in --mix
+DEFAULT_MIX = "leaderboard=45,active=30,submit=15,login=7,signup=3"
+
+
+def percentile(ordered: list, p: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+class Recorder:
+    """Latencies and status codes per route label"""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.errors = defaultdict(int)
+
+    def record(self, label: str, elapsed: float, status, ok: bool) -> None:
+        self.latencies[label].append(elapsed * 1000)
+        self.statuses[label][str(status)] += 1
+        if not ok:
+            self.errors[label] += 1
+
+    def summary(self, elapsed: float) -> dict:
+        routes = {label: self._summarize(self.latencies[label], self.errors[label], elapsed) for label in sorted(self.latencies)}
+        for label, summary in routes.items():
+            summary["statuses"] = dict(sorted(self.statuses[label].items()))
+        everything = [latency for latencies in self.latencies.values() for latency in latencies]
+        return {"routes": routes, "total": self._summarize(everything, sum(self.errors.values()), elapsed)}
+
+    @staticmethod
+    def _summarize(latencies: list, errors: int, elapsed: float) -> dict:
+        ordered = sorted(latencies)
+        return {
+            "requests": len(ordered),
+            "errors": errors,
+            "throughput_rps": round(len(ordered) / elapsed, 2),
+            "latency_ms": {
+                "p50": round(percentile(ordered, 50), 3),
+                "p95": round(percentile(ordered, 95), 3),
+                "p99": round(percentile(ordered, 99), 3),
+                "mean": round(sum(ordered) / len(ordered), 3),
+                "max": round(ordered[-1], 3),
+            } if ordered else None,
+        }
+
+
+class VirtualUser:
+    def __init__(self, client: httpx.AsyncClient, recorder: Recorder, accounts: list, signups: itertools.count, rng: random.Random):
+        self.client = client
+        self.recorder = recorder
+        self.accounts = accounts
+        self.signups = signups
+        self.rng = rng
+        self.etags = {}
+
+    async def request(self, label: str, method: str, url: str, expected=(200,), **kwargs) -> None:
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError as exc:
+            self.recorder.record(label, time.perf_counter() - start, type(exc).__name__, False)
+            return
+        self.recorder.record(label, time.perf_counter() - start, response.status_code, response.status_code in expected)
+        if "etag" in response.headers:
+            self.etags[url] = response.headers["etag"]
+
+    async def leaderboard(self) -> None:
+        mode = self.rng.choice(MODES)
+        await self.request(f"GET /api/leaderboard ({mode})", "GET", "/api/leaderboard", params={"mode": mode})
+
+    async def active(self) -> None:
+        url = "/api/games/active"
+        headers = {"If-None-Match": self.etags[url]} if url in self.etags else {}
+        await self.request("GET /api/games/active", "GET", url, expected=(200, 304), headers=headers)
+
+    async def submit(self) -> None:
+        score = {"username": self.rng.choice(self.accounts)["username"], "score": self.rng.randint(0, 500), "mode": self.rng.choice(MODES)}
+        await self.request("POST /api/leaderboard", "POST", "/api/leaderboard", expected=(201,), json=score)
+
+    async def login(self) -> None:
+        account = self.rng.choice(self.accounts)
+        await self.request("POST /api/auth/login", "POST", "/api/auth/login", json={"email": account["email"], "password": PASSWORD})
+
+    async def signup(self) -> None:
+        n = next(self.signups)
+        account = {"email": f"load-{os.getpid()}-{n}@snake.io", "username": f"load-{n}", "password": PASSWORD}
+        await self.request("POST /api/auth/signup", "POST", "/api/auth/signup", expected=(201,), json=account)
+
+    async def run(self, actions: list, weights: list, delay: float, deadline: float, think_time: float) -> None:
+        await asyncio.sleep(delay)
+        while time.perf_counter() < deadline:
+            await getattr(self, self.rng.choices(actions, weights)[0])()
+            await asyncio.sleep(self.rng.expovariate(1 / think_time) if think_time > 0 else 0)
+
+
+def parse_mix(text: str) -> dict:
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in ("leaderboard", "active", "submit", "login", "signup"):
+            raise argparse.ArgumentTypeError(f"unknown action {name.strip()!r}")
+        mix[name.strip()] = float(weight)
+    return mix
+
+
+async def seed(client: httpx.AsyncClient, accounts: int, scores: int) -> list:
+    """Create the accounts users log in as, and an initial leaderboard"""
+    created = []
+    for i in range(accounts):
+        account = {"email": f"seed-{os.getpid()}-{i}@snake.io", "username": f"seed-{os.getpid()}-{i}", "password": PASSWORD}
+        (await client.post("/api/auth/signup", json=account)).raise_for_status()
+        created.append(account)
+    for start in range(0, scores, 500):
+        batch = [
+            {"username": f"p{i}", "score": i % 1000, "mode": MODES[i % 2]}
+            for i in range(start, min(scores, start + 500))
+        ]
+        (await client.post("/api/leaderboard/batch", json=batch)).raise_for_status()
+    return created
+
+
+async def drive(client: httpx.AsyncClient, args) -> dict:
+    accounts = await seed(client, args.accounts, args.scores)
+    recorder = Recorder()
+    actions, weights = zip(*args.mix.items())
+    signups = itertools.count()
+    start = time.perf_counter()
+    deadline = start + args.duration
+    users = [
+        VirtualUser(client, recorder, accounts, signups, random.Random(args.seed + i))
+        for i in range(args.users)
+    ]
+    await asyncio.gather(*(
+        user.run(list(actions), list(weights), args.ramp_up * i / args.users, deadline, args.think_time)
+        for i, user in enumerate(users)
+    ))
+    return recorder.summary(time.perf_counter() - start)
+
+
+async def run_in_process(args) -> dict:
+    # A single process, so a per-process signing key will do
+    os.environ.setdefault("DEV_MODE", "true")
+    from src.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=args.timeout) as client:
+            return await drive(client, args)
+
+
+async def run_against(url: str, args) -> dict:
+    limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+    async with httpx.AsyncClient(base_url=url, timeout=args.timeout, limits=limits) as client:
+        return await drive(client, args)
+
+
+def start_uvicorn(workers: int):
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    # Create the schema up front so the workers don't race to do it
+    subprocess.run([sys.executable, "-c", "import asyncio; from src.database import init_db; asyncio.run(init_db())"], cwd=BACKEND, check=True)
+    # Workers must share the key that signs access tokens
+    env = {**os.environ, "SECRET_KEY": os.environ.get("SECRET_KEY") or secrets.token_urlsafe(32)}
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.main:app", "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        cwd=BACKEND,
+        env=env,
+    )
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(200):
+        try:
+            httpx.get(f"{url}/api/games/active").raise_for_status()
+            return server, url
+        except httpx.HTTPError:
+            time.sleep(0.05)
+    server.terminate()
+    sys.exit("❌ uvicorn did not start")
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(result: dict, baseline: dict = None) -> None:
+    print(f"{'route':<36} {'requests':>9} {'errors':>7} {'req/s':>8} {'p50':>9} {'p95':>9} {'p99':>9}")
+    rows = list(result["routes"].items()) + [("total", result["total"])]
+    for label, summary in rows:
+        latency = summary["latency_ms"] or {"p50": 0, "p95": 0, "p99": 0}
+        print(
+            f"{label:<36} {summary['requests']:>9} {summary['errors']:>7} {summary['throughput_rps']:>8.1f} "
+            f"{latency['p50']:>7.1f}ms {latency['p95']:>7.1f}ms {latency['p99']:>7.1f}ms"
+        )
+    if baseline is None:
+        return
+
+    print(f"\nChange against {baseline.get('revision') or 'baseline'}:")
+    print(f"{'route':<36} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8}")
+    old_rows = {**baseline["routes"], "total": baseline["total"]}
+    for label, summary in rows:
+        old = old_rows.get(label)
+        if old is None or not old["latency_ms"] or not summary["latency_ms"]:
+            continue
+        changes = [summary["throughput_rps"] / old["throughput_rps"] - 1 if old["throughput_rps"] else 0]
+        changes += [summary["latency_ms"][p] / old["latency_ms"][p] - 1 for p in ("p50", "p95", "p99")]
+        print(f"{label:<36} " + " ".join(f"{change:>+7.0%}" for change in changes))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--duration", type=float, default=30, help="seconds")
+    parser.add_argument("--ramp-up", type=float, default=5, help="seconds over which users start")
+    parser.add_argument("--think-time", type=float, default=1.0, help="mean seconds between a user's requests")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX))
+    parser.add_argument("--accounts", type=int, default=20, help="accounts created up front for logins")
+    parser.add_argument("--scores", type=int, default=5000, help="scores submitted up front")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--uvicorn", action="store_true", help="start uvicorn on localhost")
+    target.add_argument("--url", help="base URL of a running server")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers with --uvicorn")
+    parser.add_argument("--output", help="write the results as JSON")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    started_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    if args.uvicorn:
+        server, url = start_uvicorn(args.workers)
+        try:
+            result = asyncio.run(run_against(url, args))
+        finally:
+            server.terminate()
+            server.wait()
+        target_name = f"uvicorn ({args.workers} workers)"
+    elif args.url:
+        result = asyncio.run(run_against(args.url, args))
+        target_name = args.url
+    else:
+        result = asyncio.run(run_in_process(args))
+        target_name = "asgi"
+
+    result = {
+        "revision": git_revision(),
+        "started_at": started_at,
+        "target": target_name,
+        "users": args.users,
+        "duration_s": args.duration,
+        "ramp_up_s": args.ramp_up,
+        "think_time_s": args.think_time,
+        "mix": args.mix,
+        **result,
+    }
+    print(f"🚦 {args.users} users for {args.duration:g}s against {target_name}")
+    print_report(result, baseline)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"💾 Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Write .br and .gz variants next to the compressible files of the built frontend.
+
+src/static_files.py serves them to clients that accept the encoding. Files
+smaller than --min-size, or that don't shrink by at least 10%, are left alone.
+Brotli needs the optional dependency (uv sync --extra static); without it only
+gzip variants are written.
+
+Usage: python scripts/precompress_static.py [static] [--min-size 1024]
+"""
+
+import argparse
+import gzip
+import os
+import sys
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE = (".html", ".js", ".mjs", ".css", ".svg", ".json", ".map", ".txt", ".xml", ".ico", ".webmanifest")
+
+
+def compress(data: bytes):
+    yield ".gz", gzip.compress(data, compresslevel=9, mtime=0)
+    if brotli is not None:
+        yield ".br", brotli.compress(data, quality=11)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory", nargs="?", default="static")
+    parser.add_argument("--min-size", type=int, default=1024)
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.directory):
+        sys.exit(f"❌ {args.directory} is not a directory")
+    if brotli is None:
+        print("⚠️  brotli is not installed, writing gzip variants only")
+
+    original = written = 0
+    for root, _, names in os.walk(args.directory):
+        for name in names:
+            if not name.endswith(COMPRESSIBLE):
+                continue
+            path = os.path.join(root, name)
+            with open(path, "rb") as f:
+                data = f.read()
+            if len(data) < args.min_size:
+                continue
+            for suffix, compressed in compress(data):
+                if len(compressed) > len(data) * 0.9:
+                    continue
+                with open(path + suffix, "wb") as f:
+                    f.write(compressed)
+                original += len(data)
+                written += len(compressed)
+                print(f"📦 {os.path.relpath(path, args.directory)}{suffix}: {len(data):,} -> {len(compressed):,} bytes")
+    print(f"✅ Wrote {written:,} compressed bytes for {original:,} bytes of originals")
+
+
+if __name__ == "__main__":
+    main()
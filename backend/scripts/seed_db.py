@@ -1,17 +1,42 @@
 #!/usr/bin/env python3
 """
 Seed the database with demo data
+
+With --scale, generate a large synthetic dataset for capacity testing instead:
+--users accounts sharing one precomputed password hash, --scores leaderboard
+entries with heavy-tailed per-player activity and log-normal skill, and
+--active active players. Rows are written with bulk Core inserts (COPY on
+PostgreSQL); best_scores and the daily and weekly rollups are rebuilt from
+the leaderboard in one statement each.
+Meant for a freshly migrated database.
+
+Usage: python scripts/seed_db.py [--scale [--users 1000000] [--scores 5000000] [--active 10000]]
 """
 
+import argparse
+import csv
+import io
+import math
+import random
 import sys
 import os
-from datetime import date, datetime
+import time
+import uuid
+from datetime import date, datetime, timedelta
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from src.database import SessionLocal, UserDB, LeaderboardEntryDB, ActivePlayerDB, GameModeEnum
-from src.crud import hash_password
+from sqlalchemy import Date, bindparam, func, insert, select, text
+
+from src.database import engine, SessionLocal, UserDB, LeaderboardEntryDB, BestScoreDB, ActivePlayerDB, GameModeEnum
+from src.crud import hash_password, upsert_best_score, window_start
+from src.models import LeaderboardWindow
+from src.game_engine import POINTS_PER_FOOD
+
+# Every --scale account logs in with this password
+SCALE_PASSWORD = "scale123"
+SCALE_PREFIX = "scale"
 
 
 def seed_database():
@@ -77,11 +102,13 @@ def seed_database():
                 date=entry_date
             )
             db.add(entry)
+            upsert_best_score(db, entry)
             print(f"  ✅ Created entry: {username} - {score} points ({mode.value})")
         
         db.commit()
         
-        # Create active players
+        # Create active players (only read back at startup with ACTIVE_PLAYERS_PERSIST=true,
+        # and dropped after ACTIVE_PLAYER_TTL seconds unless they send heartbeats)
         active_players_data = [
             ("p1", "PixelViper", 340, GameModeEnum.WALLS),
             ("p2", "NeonByte", 180, GameModeEnum.PASS_THROUGH),
@@ -122,5 +149,181 @@ def seed_database():
         db.close()
 
 
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def generate_users(count: int, hashed_password: str):
+    for i in range(count):
+        username = f"{SCALE_PREFIX}{i:07d}"
+        yield {"id": username, "username": username, "email": f"{username}@scale.snake.io", "hashed_password": hashed_password}
+
+
+def generate_scores(count: int, users: int, days: int, rng: random.Random):
+    """Leaderboard rows with realistic score and activity distributions.
+
+    A few players play most games (user i is picked with probability falling
+    off as a power law), each player has a log-normal skill (median 8 food),
+    games scatter log-normally around it, and dates skew towards today.
+    """
+    skills = [rng.lognormvariate(math.log(8), 0.6) for _ in range(users)]
+    today = date.today()
+    modes = (GameModeEnum.WALLS, GameModeEnum.PASS_THROUGH)
+    for _ in range(count):
+        player = int(users * rng.random() ** 3)
+        food = int(skills[player] * rng.lognormvariate(0, 0.5))
+        yield {
+            "id": _uuid(rng),
+            "username": f"{SCALE_PREFIX}{player:07d}",
+            "score": food * POINTS_PER_FOOD,
+            "mode": modes[rng.random() < 0.4],
+            "date": today - timedelta(days=int(days * rng.random() ** 2)),
+        }
+
+
+def generate_active_players(count: int, users: int, rng: random.Random):
+    now = datetime.now()
+    for _ in range(count):
+        yield {
+            "id": _uuid(rng),
+            "username": f"{SCALE_PREFIX}{rng.randrange(users):07d}",
+            "score": int(rng.expovariate(1 / 5)) * POINTS_PER_FOOD,
+            "mode": rng.choice((GameModeEnum.WALLS, GameModeEnum.PASS_THROUGH)),
+            "startedAt": now - timedelta(seconds=rng.uniform(0, 600)),
+        }
+
+
+def _batches(rows, size: int):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _copy(conn, table, batch) -> None:
+    """COPY one batch into a PostgreSQL table through psycopg2"""
+    columns = list(batch[0])
+    # Write values the way the ORM binds them (enums by name)
+    processors = [table.c[name].type.bind_processor(conn.dialect) for name in columns]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in batch:
+        writer.writerow([
+            process(row[name]) if process else row[name]
+            for name, process in zip(columns, processors)
+        ])
+    buffer.seek(0)
+    cursor = conn.connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+    finally:
+        cursor.close()
+
+
+def bulk_load(conn, table, rows, total: int, batch_size: int) -> None:
+    # Building secondary indexes once at the end beats updating them per row
+    for index in table.indexes:
+        index.drop(conn)
+    use_copy = conn.dialect.name == "postgresql" and conn.dialect.driver == "psycopg2"
+    start = time.perf_counter()
+    done = 0
+    for batch in _batches(rows, batch_size):
+        if use_copy:
+            _copy(conn, table, batch)
+        else:
+            conn.execute(insert(table), batch)
+        done += len(batch)
+        elapsed = time.perf_counter() - start
+        print(f"\r  {table.name}: {done:,}/{total:,} rows ({done / elapsed:,.0f} rows/s)", end="", flush=True)
+    for index in table.indexes:
+        index.create(conn)
+    print(f"\n  ✅ {table.name}: {done:,} rows in {time.perf_counter() - start:.1f}s{' (COPY)' if use_copy else ''}")
+
+
+# The highest entry per (username, mode), earliest first on ties like crud.upsert_best_scores
+REBUILD_BEST_SCORES = """
+INSERT INTO best_scores (username, mode, score, entry_id, date)
+SELECT username, mode, score, id, date FROM (
+    SELECT id, username, mode, score, date,
+           ROW_NUMBER() OVER (PARTITION BY username, mode ORDER BY score DESC, date, id) AS position
+    FROM leaderboard
+) ranked
+WHERE position = 1
+"""
+
+
+# Entries of the current day or week
+REBUILD_LEADERBOARD_WINDOW = """
+INSERT INTO leaderboard_windows (period, period_start, id, username, score, mode, date)
+SELECT :period, :start, id, username, score, mode, date FROM leaderboard WHERE date >= :start
+"""
+
+
+def seed_scale(users: int, scores: int, active: int, days: int, batch_size: int, seed: int):
+    """Bulk load a large synthetic dataset"""
+    rng = random.Random(seed)
+    print(f"🌱 Seeding {users:,} users, {scores:,} scores and {active:,} active players...")
+
+    with engine.begin() as conn:
+        existing = conn.execute(
+            select(func.count()).select_from(UserDB).where(UserDB.username.like(f"{SCALE_PREFIX}%"))
+        ).scalar()
+        if existing:
+            sys.exit(f"❌ The database already holds {existing:,} scale users; reset it first (make db-reset)")
+
+        if conn.dialect.name == "sqlite":
+            # A crash only loses seed data, so don't wait for fsyncs
+            conn.exec_driver_sql("PRAGMA synchronous=OFF")
+            conn.exec_driver_sql("PRAGMA cache_size=-262144")
+
+        # One bcrypt hash for every account
+        hashed_password = hash_password(SCALE_PASSWORD)
+        bulk_load(conn, UserDB.__table__, generate_users(users, hashed_password), users, batch_size)
+        bulk_load(conn, LeaderboardEntryDB.__table__, generate_scores(scores, users, days, rng), scores, batch_size)
+        bulk_load(conn, ActivePlayerDB.__table__, generate_active_players(active, users, rng), active, batch_size)
+
+        start = time.perf_counter()
+        conn.execute(text("DELETE FROM best_scores"))
+        for index in BestScoreDB.__table__.indexes:
+            index.drop(conn)
+        conn.execute(text(REBUILD_BEST_SCORES))
+        for index in BestScoreDB.__table__.indexes:
+            index.create(conn)
+        print(f"  ✅ best_scores rebuilt in {time.perf_counter() - start:.1f}s")
+
+        start = time.perf_counter()
+        conn.execute(text("DELETE FROM leaderboard_windows"))
+        for window in (LeaderboardWindow.DAY, LeaderboardWindow.WEEK):
+            conn.execute(
+                text(REBUILD_LEADERBOARD_WINDOW).bindparams(bindparam("start", type_=Date)),
+                {"period": window.value, "start": window_start(window, date.today())},
+            )
+        print(f"  ✅ leaderboard_windows rebuilt in {time.perf_counter() - start:.1f}s")
+
+    if engine.dialect.name == "postgresql":
+        with engine.connect() as conn:
+            conn.execute(text("ANALYZE"))
+
+    print("\n✨ Database seeded successfully!")
+    print(f"\n📋 Every {SCALE_PREFIX} account logs in with password {SCALE_PASSWORD!r}, e.g. {SCALE_PREFIX}0000000@scale.snake.io")
+
+
 if __name__ == "__main__":
-    seed_database()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", action="store_true", help="generate a large synthetic dataset")
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--scores", type=int, default=5_000_000)
+    parser.add_argument("--active", type=int, default=10_000)
+    parser.add_argument("--days", type=int, default=365, help="spread scores over this many days")
+    parser.add_argument("--batch-size", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.scale:
+        seed_scale(args.users, args.scores, args.active, args.days, args.batch_size, args.seed)
+    else:
+        seed_database()
@@ -0,0 +1,207 @@
+import asyncio
+import bisect
+import time
+from collections import OrderedDict
+from datetime import datetime, UTC
+from typing import Callable, Dict, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from .config import settings
+from .database import AsyncSessionLocal
+from .models import ActivePlayer, GameMode
+from .shared_state import Message, SharedState, shared_state
+from . import crud
+
+ACTIVE_PLAYERS_CHANNEL = "active_players"
+# Changes with the players, for the ETag of GET /api/games/active
+ACTIVE_PLAYERS_VERSION_KEY = "etag:active_players"
+
+class ActivePlayerRegistry:
+    """Players currently in a game, kept in memory and expired by heartbeat TTL.
+
+    Clients heartbeat their running score; a player that hasn't been heard from
+    for ``ttl`` seconds is removed by the sweeper task started from the app
+    lifespan. Players are held in an OrderedDict in heartbeat order, so a sweep
+    only looks at the entries that actually expired, next to a score-ordered
+    index for listing. Heartbeats and removals are published on
+    ``shared_state`` so that every worker holds the same players. With
+    ``persist`` enabled the registry is loaded from the active_players table
+    on startup and written back on every sweep.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        sweep_interval: float,
+        persist: bool,
+        session_factory: Callable[[], AsyncSession],
+        shared_state: Optional[SharedState] = None,
+    ):
+        self.ttl = ttl
+        self.sweep_interval = sweep_interval
+        self.persist = persist
+        self.session_factory = session_factory
+        self.shared_state = shared_state
+        if shared_state is not None:
+            shared_state.add_listener(ACTIVE_PLAYERS_CHANNEL, self._on_message)
+        self._players: "OrderedDict[str, ActivePlayer]" = OrderedDict()
+        self._last_seen: Dict[str, float] = {}
+        # (-score, id) for every player, kept sorted
+        self._by_score: List[Tuple[int, str]] = []
+        self._task: Optional[asyncio.Task] = None
+        self.expired = 0
+        # Bumped on every change to the players, when there is no shared_state
+        self._version = 0
+
+    def __len__(self) -> int:
+        return len(self._players)
+
+    async def version(self) -> int:
+        """Changes with the players, and is the same in every worker sharing state"""
+        if self.shared_state is None:
+            return self._version
+        return await self.shared_state.version(ACTIVE_PLAYERS_VERSION_KEY)
+
+    async def changed(self) -> None:
+        """Bump the shared version after changing the players"""
+        if self.shared_state is not None:
+            await self.shared_state.bump(ACTIVE_PLAYERS_VERSION_KEY)
+
+    def get(self, player_id: str) -> Optional[ActivePlayer]:
+        return self._players.get(player_id)
+
+    def list(self, limit: Optional[int] = None) -> List[ActivePlayer]:
+        """Active players by score, highest first"""
+        keys = self._by_score if limit is None else self._by_score[:limit]
+        return [self._players[player_id] for _, player_id in keys]
+
+    def heartbeat(self, player_id: str, username: str, score: int, mode: GameMode, now: Optional[float] = None) -> ActivePlayer:
+        """Register a player or refresh one, updating its score"""
+        player = self._players.get(player_id)
+        if player is not None and player.mode == mode:
+            player = player.model_copy(update={"username": username, "score": score})
+        else:
+            # New player, or a new game in another mode
+            player = ActivePlayer(id=player_id, username=username, score=score, mode=mode, startedAt=datetime.now(UTC))
+        self._store(player, now)
+        if self.shared_state is not None:
+            self.shared_state.publish(ACTIVE_PLAYERS_CHANNEL, {"op": "heartbeat", "player": player.model_dump(mode="json")})
+        return player
+
+    def _store(self, player: ActivePlayer, now: Optional[float] = None) -> None:
+        previous = self._players.get(player.id)
+        if previous is not None:
+            self._unindex(previous)
+        self._players[player.id] = player
+        self._players.move_to_end(player.id)
+        self._last_seen[player.id] = time.monotonic() if now is None else now
+        bisect.insort(self._by_score, (-player.score, player.id))
+        self._version += 1
+
+    def remove(self, player_id: str) -> bool:
+        if not self._remove(player_id):
+            return False
+        if self.shared_state is not None:
+            self.shared_state.publish(ACTIVE_PLAYERS_CHANNEL, {"op": "remove", "id": player_id})
+        return True
+
+    def _on_message(self, message: Message) -> None:
+        """Apply a heartbeat or removal made by another worker"""
+        if message.local:
+            return
+        if message.data["op"] == "heartbeat":
+            self._store(ActivePlayer.model_validate(message.data["player"]))
+        else:
+            self._remove(message.data["id"])
+
+    def _remove(self, player_id: str) -> bool:
+        player = self._players.pop(player_id, None)
+        if player is None:
+            return False
+        del self._last_seen[player_id]
+        self._unindex(player)
+        self._version += 1
+        return True
+
+    def _unindex(self, player: ActivePlayer) -> None:
+        index = bisect.bisect_left(self._by_score, (-player.score, player.id))
+        del self._by_score[index]
+
+    def sweep(self, now: Optional[float] = None) -> List[str]:
+        """Remove players whose last heartbeat is older than the TTL"""
+        deadline = (time.monotonic() if now is None else now) - self.ttl
+        expired = []
+        for player_id in self._players:
+            if self._last_seen[player_id] > deadline:
+                break
+            expired.append(player_id)
+        # Every worker sees the same heartbeats, so each expires players itself
+        for player_id in expired:
+            self._remove(player_id)
+        self.expired += len(expired)
+        return expired
+
+    def clear(self) -> None:
+        self._players.clear()
+        self._last_seen.clear()
+        self._by_score.clear()
+        self._version += 1
+
+    async def load(self) -> None:
+        """Restore persisted players; they expire unless they heartbeat again"""
+        async with self.session_factory() as db:
+            rows = await crud.get_active_players_async(db)
+        now = time.monotonic()
+        for row in rows:
+            if row.id in self._players:
+                continue
+            player = ActivePlayer(
+                id=row.id, username=row.username, score=row.score,
+                mode=GameMode(row.mode.value), startedAt=row.startedAt,
+            )
+            self._players[row.id] = player
+            self._last_seen[row.id] = now
+            bisect.insort(self._by_score, (-player.score, player.id))
+        self._version += 1
+
+    async def save(self) -> None:
+        async with self.session_factory() as db:
+            await crud.replace_active_players_async(db, list(self._players.values()))
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            if self.sweep():
+                await self.changed()
+            if self.persist:
+                try:
+                    await self.save()
+                except Exception as e:
+                    print(f"❌ Failed to persist active players: {e}")
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        if self.persist:
+            await self.load()
+            await self.changed()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        if self.persist:
+            await self.save()
+
+active_players = ActivePlayerRegistry(
+    ttl=settings.ACTIVE_PLAYER_TTL,
+    sweep_interval=settings.ACTIVE_PLAYER_SWEEP_INTERVAL,
+    persist=settings.ACTIVE_PLAYERS_PERSIST,
+    session_factory=AsyncSessionLocal,
+    shared_state=shared_state,
+)
@@ -0,0 +1,186 @@
+from typing import Optional, Sequence
+import numpy as np
+from .game_engine import GRID_SIZE, INITIAL_SNAKE, POINTS_PER_FOOD
+from .models import Direction, GameMode, GameState, Position
+
+# Direction codes used in the direction arrays; NO_TURN keeps the current one
+UP, DOWN, LEFT, RIGHT = 0, 1, 2, 3
+NO_TURN = -1
+DIRECTION_CODES = {Direction.UP: UP, Direction.DOWN: DOWN, Direction.LEFT: LEFT, Direction.RIGHT: RIGHT}
+DIRECTIONS = [Direction.UP, Direction.DOWN, Direction.LEFT, Direction.RIGHT]
+
+_DX = np.array([0, 0, -1, 1], dtype=np.int32)
+_DY = np.array([-1, 1, 0, 0], dtype=np.int32)
+_OPPOSITE = np.array([DOWN, UP, RIGHT, LEFT], dtype=np.int8)
+
+_MASK32 = np.uint64(0xFFFFFFFF)
+
+def _mulberry32(state: np.ndarray) -> np.ndarray:
+    """Advance the mulberry32 states in place and return one output per game.
+
+    Bit-for-bit the same as ``game_engine.Rng``: products of two 32-bit values
+    fit in uint64, and every step is masked back to 32 bits.
+    """
+    state += np.uint64(0x6D2B79F5)
+    state &= _MASK32
+    t = state.copy()
+    t = ((t ^ (t >> np.uint64(15))) * (t | np.uint64(1))) & _MASK32
+    t ^= (t + ((t ^ (t >> np.uint64(7))) * (t | np.uint64(61)))) & _MASK32
+    return (t ^ (t >> np.uint64(14))) & _MASK32
+
+def _mulberry32_at(state: np.ndarray, games: np.ndarray) -> np.ndarray:
+    """Draw one number for each of ``games`` and write their states back"""
+    subset = state[games]
+    out = _mulberry32(subset)
+    state[games] = subset
+    return out
+
+class BatchSimulator:
+    """N snake games held as NumPy arrays and advanced by one vectorized tick.
+
+    Each game follows exactly the rules and food sequence of ``SnakeGame`` with
+    the same mode and seed, so results can be cross-checked against the scalar
+    engine. Bodies are ring buffers of cell indices (``y * grid_size + x``)
+    next to a per-game occupancy grid.
+
+    Needs NumPy, installed with the optional ``sim`` extra.
+    """
+
+    def __init__(
+        self,
+        n: int,
+        modes: Optional[Sequence[GameMode]] = None,
+        seeds: Optional[Sequence[int]] = None,
+        grid_size: int = GRID_SIZE,
+    ):
+        self.n = n
+        self.grid_size = grid_size
+        self.cells = cells = grid_size * grid_size
+
+        if modes is None:
+            self.walls = np.ones(n, dtype=bool)
+        else:
+            self.walls = np.array([GameMode(m) == GameMode.WALLS for m in modes], dtype=bool)
+        seeds = np.arange(n) if seeds is None else np.asarray(seeds)
+        self.rng_state = seeds.astype(np.uint64) & _MASK32
+
+        # Ring buffer: the head is at head_idx, the tail length - 1 slots behind it
+        self.body = np.zeros((n, cells), dtype=np.int16)
+        self.occupied = np.zeros((n, cells), dtype=bool)
+        initial = [y * grid_size + x for x, y in INITIAL_SNAKE]
+        for i, cell in enumerate(reversed(initial)):
+            self.body[:, i] = cell
+            self.occupied[:, cell] = True
+        self.head_idx = np.full(n, len(initial) - 1, dtype=np.int32)
+        self.length = np.full(n, len(initial), dtype=np.int32)
+        self.head_x = np.full(n, INITIAL_SNAKE[0][0], dtype=np.int32)
+        self.head_y = np.full(n, INITIAL_SNAKE[0][1], dtype=np.int32)
+        self.direction = np.full(n, RIGHT, dtype=np.int8)
+        self.score = np.zeros(n, dtype=np.int32)
+        self.alive = np.ones(n, dtype=bool)
+        self.ticks = np.zeros(n, dtype=np.int32)
+        self.food = np.full(n, -1, dtype=np.int32)
+        self._place_food(np.arange(n))
+
+    def _place_food(self, games: np.ndarray) -> None:
+        """Pick food cells for the given games, mirroring SnakeGame._place_food"""
+        cells = self.cells
+        free = cells - self.length[games]
+        full = free <= 0
+        if full.any():
+            self.food[games[full]] = -1
+            self.alive[games[full]] = False
+            games, free = games[~full], free[~full]
+
+        crowded = free * 4 < cells
+        if crowded.any():
+            picked = games[crowded]
+            nth = (_mulberry32_at(self.rng_state, picked) % free[crowded].astype(np.uint64)).astype(np.int64)
+            running = np.cumsum(~self.occupied[picked], axis=1)
+            self.food[picked] = np.argmax(running > nth[:, None], axis=1)
+            games = games[~crowded]
+
+        # Rejection sampling, redrawing only for games that hit their own body
+        pending = games
+        while pending.size:
+            cell = (_mulberry32_at(self.rng_state, pending) % np.uint64(cells)).astype(np.int64)
+            hit = self.occupied[pending, cell]
+            accepted = pending[~hit]
+            self.food[accepted] = cell[~hit]
+            pending = pending[hit]
+
+    def tick(self, directions: Optional[np.ndarray] = None) -> None:
+        """Advance every live game one step.
+
+        ``directions`` holds one direction code per game (NO_TURN to keep going);
+        reversals are ignored like ``SnakeGame.change_direction``.
+        """
+        size = self.grid_size
+        if directions is not None:
+            directions = np.asarray(directions, dtype=np.int8)
+            turn = self.alive & (directions >= 0) & (_OPPOSITE[np.maximum(directions, 0)] != self.direction)
+            self.direction = np.where(turn, directions, self.direction).astype(np.int8)
+
+        live = np.flatnonzero(self.alive)
+        if not live.size:
+            return
+        direction = self.direction[live]
+        x = self.head_x[live] + _DX[direction]
+        y = self.head_y[live] + _DY[direction]
+        walls = self.walls[live]
+        outside = walls & ((x < 0) | (x >= size) | (y < 0) | (y >= size))
+        x %= size
+        y %= size
+        cell = y * size + x
+
+        food = self.food[live]
+        ate = cell == food
+        tail_idx = (self.head_idx[live] - self.length[live] + 1) % self.cells
+        tail = self.body[live, tail_idx]
+        collided = self.occupied[live, cell] & (ate | (cell != tail))
+        dead = outside | collided
+
+        self.ticks[live] += 1
+        self.alive[live[dead]] = False
+        moving = ~dead
+        games, cell, ate, tail = live[moving], cell[moving], ate[moving], tail[moving]
+
+        # Clear the vacated tail before marking the new head, which may be that cell
+        shrinking = ~ate
+        self.occupied[games[shrinking], tail[shrinking]] = False
+        self.occupied[games, cell] = True
+        head_idx = (self.head_idx[games] + 1) % self.cells
+        self.head_idx[games] = head_idx
+        self.body[games, head_idx] = cell
+        self.head_x[games] = x[moving]
+        self.head_y[games] = y[moving]
+
+        eaters = games[ate]
+        if eaters.size:
+            self.length[eaters] += 1
+            self.score[eaters] += POINTS_PER_FOOD
+            self._place_food(eaters)
+
+    def run(self, ticks: int, directions: Optional[np.ndarray] = None) -> None:
+        """Run ``ticks`` steps; ``directions`` is an optional (ticks, n) array of codes"""
+        for t in range(ticks):
+            if not self.alive.any():
+                break
+            self.tick(None if directions is None else directions[t])
+
+    def snake(self, i: int) -> list:
+        """Body cells of game ``i``, head first"""
+        idx = (self.head_idx[i] - np.arange(self.length[i])) % self.cells
+        return self.body[i, idx].tolist()
+
+    def state(self, i: int) -> GameState:
+        size = self.grid_size
+        snake = self.snake(i)
+        food = int(self.food[i]) if self.food[i] >= 0 else snake[0]
+        return GameState(
+            snake=[Position(x=cell % size, y=cell // size) for cell in snake],
+            food=Position(x=food % size, y=food // size),
+            direction=DIRECTIONS[self.direction[i]],
+            score=int(self.score[i]),
+            gameOver=not self.alive[i],
+        )
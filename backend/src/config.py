@@ -4,6 +4,12 @@ from dotenv import load_dotenv
 # Load environment variables from .env file
 load_dotenv()
 
+# Async drivers substituted into DATABASE_URL for the API engine
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
 class Settings:
     """Application settings loaded from environment variables"""
     
@@ -12,11 +18,142 @@ class Settings:
         "DATABASE_URL",
         "sqlite:///./snake_social.db"
     )
+    # Async driver URL used by the API; derived from DATABASE_URL when unset
+    ASYNC_DATABASE_URL: str = os.getenv("ASYNC_DATABASE_URL", "")
+
+    # Schema handling at startup: "create_all" creates missing tables (checking
+    # every table against the database), "check" only verifies that the
+    # database is at the Alembic revision the models expect (run migrations
+    # when deploying)
+    DATABASE_STARTUP: str = os.getenv("DATABASE_STARTUP", "create_all")
+
+    # Print import time per package and time to first request (src/startup.py)
+    STARTUP_REPORT: bool = os.getenv("STARTUP_REPORT", "false").lower() in ("1", "true", "yes")
+
+    # Connection pool (server databases such as PostgreSQL)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "20"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+    # SQLite pragmas applied to every new connection
+    SQLITE_JOURNAL_MODE: str = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+
+    # Password hashing: bcrypt cost factor and size of the dedicated hashing pool
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+    # Signed access tokens issued at login and signup (src/tokens.py). Give
+    # every worker the same SECRET_KEY; workers refuse to start without one
+    # unless DEV_MODE is set, where each process signs with a random key and
+    # tokens don't survive restarts.
+    SECRET_KEY: str = os.getenv("SECRET_KEY", "")
+    DEV_MODE: bool = os.getenv("DEV_MODE", "false").lower() in ("1", "true", "yes")
+    ACCESS_TOKEN_TTL: int = int(os.getenv("ACCESS_TOKEN_TTL", "86400"))
+    # Decoded tokens kept in memory, so repeat requests skip signature checks
+    TOKEN_CACHE_SIZE: int = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+
+    # Leaderboard pagination
+    LEADERBOARD_PAGE_SIZE: int = int(os.getenv("LEADERBOARD_PAGE_SIZE", "100"))
+    LEADERBOARD_MAX_PAGE_SIZE: int = int(os.getenv("LEADERBOARD_MAX_PAGE_SIZE", "1000"))
+
+    # Request timing, database query and pool metrics, exposed on GET /metrics
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+
+    # Serialize list endpoints straight to JSON bytes, skipping FastAPI's
+    # response_model re-validation (see src/responses.py)
+    FAST_JSON_RESPONSES: bool = os.getenv("FAST_JSON_RESPONSES", "false").lower() in ("1", "true", "yes")
+
+    # Leaderboard page cache (number of cached pages, seconds before a page expires)
+    LEADERBOARD_CACHE_SIZE: int = int(os.getenv("LEADERBOARD_CACHE_SIZE", "64"))
+    LEADERBOARD_CACHE_TTL: float = float(os.getenv("LEADERBOARD_CACHE_TTL", "30"))
+
+    # Maximum number of scores accepted by POST /api/leaderboard/batch
+    SCORE_BATCH_MAX_SIZE: int = int(os.getenv("SCORE_BATCH_MAX_SIZE", "1000"))
+
+    # Largest replay accepted, in bytes, and longest game it may describe
+    REPLAY_MAX_BYTES: int = int(os.getenv("REPLAY_MAX_BYTES", "65536"))
+    REPLAY_MAX_TICKS: int = int(os.getenv("REPLAY_MAX_TICKS", "200000"))
+
+    # Score verification: "off" stores replays as given, "optional" re-simulates
+    # submissions that include a replay, "required" rejects those without one
+    SCORE_VERIFICATION: str = os.getenv("SCORE_VERIFICATION", "optional")
+    REPLAY_VERIFY_WORKERS: int = int(os.getenv("REPLAY_VERIFY_WORKERS", str(os.cpu_count() or 1)))
+
+    # State shared between workers: "local" keeps it in process (one worker),
+    # "sqlite" shares it through a SQLite file between workers on one host
+    SHARED_STATE_BACKEND: str = os.getenv("SHARED_STATE_BACKEND", "local")
+    SHARED_STATE_PATH: str = os.getenv("SHARED_STATE_PATH", "./shared_state.db")
+    SHARED_STATE_POLL_INTERVAL: float = float(os.getenv("SHARED_STATE_POLL_INTERVAL", "0.05"))
+    SHARED_STATE_MESSAGE_TTL: float = float(os.getenv("SHARED_STATE_MESSAGE_TTL", "60"))
+
+    # Score ingestion: "sync" commits each submission in the request,
+    # "queue" enqueues it and commits in batches from a background task
+    SCORE_INGEST_MODE: str = os.getenv("SCORE_INGEST_MODE", "sync")
+    SCORE_INGEST_BATCH_SIZE: int = int(os.getenv("SCORE_INGEST_BATCH_SIZE", "500"))
+    SCORE_INGEST_FLUSH_MS: float = float(os.getenv("SCORE_INGEST_FLUSH_MS", "50"))
+    SCORE_INGEST_MAX_QUEUE: int = int(os.getenv("SCORE_INGEST_MAX_QUEUE", "10000"))
+    SCORE_INGEST_ENQUEUE_TIMEOUT: float = float(os.getenv("SCORE_INGEST_ENQUEUE_TIMEOUT", "1.0"))
+    # A batch whose commit fails is retried this many times, waiting
+    # SCORE_INGEST_RETRY_BACKOFF_MS (doubling each time) in between; after
+    # that its scores are appended to the dead-letter file as JSON lines
+    SCORE_INGEST_MAX_RETRIES: int = int(os.getenv("SCORE_INGEST_MAX_RETRIES", "5"))
+    SCORE_INGEST_RETRY_BACKOFF_MS: float = float(os.getenv("SCORE_INGEST_RETRY_BACKOFF_MS", "100"))
+    SCORE_INGEST_DEAD_LETTER_PATH: str = os.getenv("SCORE_INGEST_DEAD_LETTER_PATH", "./ingest_dead_letter.jsonl")
+
+    # Active players: seconds without a heartbeat before a player is dropped,
+    # how often expired players are swept, and whether the registry is
+    # loaded from and saved to the active_players table
+    ACTIVE_PLAYER_TTL: float = float(os.getenv("ACTIVE_PLAYER_TTL", "30"))
+    ACTIVE_PLAYER_SWEEP_INTERVAL: float = float(os.getenv("ACTIVE_PLAYER_SWEEP_INTERVAL", "5"))
+    ACTIVE_PLAYERS_PERSIST: bool = os.getenv("ACTIVE_PLAYERS_PERSIST", "false").lower() in ("1", "true", "yes")
+
+    # Live spectating: tick interval, ticks between keyframes, and per-spectator
+    # message backlog before a slow spectator is resynchronized with a keyframe
+    SPECTATE_TICK_MS: float = float(os.getenv("SPECTATE_TICK_MS", "120"))
+    SPECTATE_KEYFRAME_TICKS: int = int(os.getenv("SPECTATE_KEYFRAME_TICKS", "50"))
+    SPECTATE_QUEUE_SIZE: int = int(os.getenv("SPECTATE_QUEUE_SIZE", "64"))
     
+    @property
+    def async_database_url(self) -> str:
+        if self.ASYNC_DATABASE_URL:
+            return self.ASYNC_DATABASE_URL
+        scheme, separator, rest = self.DATABASE_URL.partition("://")
+        backend = scheme.split("+")[0]
+        return f"{ASYNC_DRIVERS.get(backend, scheme)}{separator}{rest}"
+
+    @property
+    def is_sqlite(self) -> bool:
+        return self.DATABASE_URL.startswith("sqlite")
+
+    # Pool sizing only applies to server databases; SQLite keeps SQLAlchemy's defaults
+    @property
+    def engine_options(self) -> dict:
+        if self.is_sqlite:
+            return {}
+        return {
+            "pool_size": self.DB_POOL_SIZE,
+            "max_overflow": self.DB_MAX_OVERFLOW,
+            "pool_timeout": self.DB_POOL_TIMEOUT,
+            "pool_recycle": self.DB_POOL_RECYCLE,
+            "pool_pre_ping": self.DB_POOL_PRE_PING,
+        }
+
+    @property
+    def sqlite_pragmas(self) -> dict:
+        return {
+            "journal_mode": self.SQLITE_JOURNAL_MODE,
+            "synchronous": self.SQLITE_SYNCHRONOUS,
+            "busy_timeout": self.SQLITE_BUSY_TIMEOUT_MS,
+        }
+
     # Adjust for SQLite to use check_same_thread=False
     @property
     def connect_args(self) -> dict:
-        if self.DATABASE_URL.startswith("sqlite"):
+        if self.is_sqlite:
             return {"check_same_thread": False}
         return {}
 
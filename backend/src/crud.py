@@ -1,20 +1,54 @@
+from sqlalchemy import and_, func, insert, or_, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
 from sqlalchemy.orm import Session
-from typing import Optional, List
-import bcrypt
-from .database import UserDB, LeaderboardEntryDB, ActivePlayerDB, GameModeEnum
-from .models import User, LeaderboardEntry, ActivePlayer, GameMode
+from typing import Optional, List, Dict, Tuple
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from array import array
+from datetime import date, datetime, timedelta, UTC
+import asyncio
+import bisect
+import threading
+import time
+from .config import settings
+from .database import UserDB, LeaderboardEntryDB, LeaderboardWindowDB, BestScoreDB, ReplayDB, RevokedTokenDB, ActivePlayerDB, GameModeEnum
+from .models import LeaderboardEntry, LeaderboardWindow, ActivePlayer, GameMode, PlayerRank
+from .replay import ReplayReader
+from .shared_state import Message, shared_state
+from . import etag
 
 # Password hashing
+# bcrypt releases the GIL, so a small dedicated pool hashes in parallel
+# without blocking the event loop or starving the default executor
+_password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash",
+)
+
+# bcrypt is imported on first use: most workers serve reads, and boot faster without it
 def hash_password(password: str) -> str:
     """Hash a password for storing"""
-    salt = bcrypt.gensalt()
+    import bcrypt
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
     return hashed.decode('utf-8')
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
+    import bcrypt
     return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
 
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the password hashing pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the password hashing pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, verify_password, plain_password, hashed_password)
+
 # User CRUD operations
 def get_user_by_email(db: Session, email: str) -> Optional[UserDB]:
     """Get user by email address"""
@@ -24,9 +58,8 @@ def get_user_by_id(db: Session, user_id: str) -> Optional[UserDB]:
     """Get user by ID"""
     return db.query(UserDB).filter(UserDB.id == user_id).first()
 
-def create_user(db: Session, user_id: str, email: str, username: str, password: str) -> UserDB:
-    """Create a new user with hashed password"""
-    hashed_password = hash_password(password)
+def create_user(db: Session, user_id: str, email: str, username: str, hashed_password: str) -> UserDB:
+    """Create a new user from an already hashed password (see hash_password_async)"""
     db_user = UserDB(
         id=user_id,
         email=email,
@@ -38,18 +71,330 @@ def create_user(db: Session, user_id: str, email: str, username: str, password:
     db.refresh(db_user)
     return db_user
 
+# Revoked access tokens
+def add_revoked_token(db: Session, jti: str, expires_at: int) -> None:
+    """Record a revoked token until it expires, pruning tokens that already have"""
+    db.query(RevokedTokenDB).filter(RevokedTokenDB.expires_at <= int(time.time())).delete()
+    db.merge(RevokedTokenDB(jti=jti, expires_at=expires_at))
+    db.commit()
+
+def get_revoked_tokens(db: Session) -> List[Tuple[str, int]]:
+    """(jti, expires_at) of the revoked tokens that have not expired yet"""
+    return [
+        (row.jti, row.expires_at)
+        for row in db.query(RevokedTokenDB.jti, RevokedTokenDB.expires_at)
+        .filter(RevokedTokenDB.expires_at > int(time.time()))
+    ]
+
+# Leaderboard cache
+def _rank_key(entry: LeaderboardEntry) -> Tuple[int, str]:
+    """Sort key matching the leaderboard order (score DESC, id ASC)"""
+    return (-entry.score, entry.id)
+
+class LeaderboardCache:
+    """In-process cache of top-N leaderboard pages, keyed by (mode, limit).
+
+    ``add_score`` pushes new entries into every cached page they qualify for,
+    so reads stay consistent with writes made by this process. Pages also
+    expire after ``ttl`` seconds to pick up writes made elsewhere, and the
+    least recently used page is evicted once ``max_size`` pages are held.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._pages: "OrderedDict[Tuple[Optional[GameMode], int], Tuple[float, List[LeaderboardEntry]]]" = OrderedDict()
+        # Bumped on every write so a page read before the write can't be stored after it
+        self._generations: Dict[Optional[GameMode], int] = {}
+        self._lock = threading.Lock()
+
+    def generation(self, mode: Optional[GameMode]) -> int:
+        return self._generations.get(mode, 0)
+
+    def get(self, mode: Optional[GameMode], limit: int) -> Optional[List[LeaderboardEntry]]:
+        """Return a cached page, or None on a miss"""
+        key = (mode, limit)
+        with self._lock:
+            cached = self._pages.get(key)
+            if cached is None or time.monotonic() - cached[0] > self.ttl:
+                self._pages.pop(key, None)
+                self.misses += 1
+                return None
+            self._pages.move_to_end(key)
+            self.hits += 1
+            return list(cached[1])
+
+    def put(self, mode: Optional[GameMode], limit: int, entries: List[LeaderboardEntry], generation: int) -> None:
+        """Store a page loaded while the cache was at ``generation``"""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            if self.generation(mode) != generation:
+                return
+            self._pages[(mode, limit)] = (time.monotonic(), list(entries))
+            self._pages.move_to_end((mode, limit))
+            while len(self._pages) > self.max_size:
+                self._pages.popitem(last=False)
+
+    def add(self, entry: LeaderboardEntry) -> None:
+        """Insert a newly stored entry into every cached page it qualifies for"""
+        with self._lock:
+            for mode in (entry.mode, None):
+                self._generations[mode] = self.generation(mode) + 1
+            key = _rank_key(entry)
+            now = time.monotonic()
+            for (mode, limit), (stored_at, page) in list(self._pages.items()):
+                if mode is not None and mode != entry.mode:
+                    continue
+                if now - stored_at > self.ttl:
+                    del self._pages[(mode, limit)]
+                    continue
+                # Most new scores rank below a full page
+                if len(page) >= limit and key > _rank_key(page[-1]):
+                    continue
+                position = bisect.bisect_left(page, key, key=_rank_key)
+                if position < limit:
+                    page.insert(position, entry)
+                    del page[limit:]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pages.clear()
+            self._generations.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        return {"size": len(self._pages), "hits": self.hits, "misses": self.misses}
+
+leaderboard_cache = LeaderboardCache(
+    max_size=settings.LEADERBOARD_CACHE_SIZE,
+    ttl=settings.LEADERBOARD_CACHE_TTL,
+)
+
+# Player ranking
+class RankIndex:
+    """Per-mode sorted array of best scores answering rank queries by bisection.
+
+    A mode's array is built from ``best_scores`` by a background task started
+    by its first rank query; until it is ready, ranks come from indexed SQL
+    COUNTs. Once built, ``update`` keeps it current with this worker's writes
+    and, through the shared_state scores channel, the other workers', so it
+    is never reloaded. A rank query is then O(log n). Scores are held in a
+    compact ``array`` of 64-bit ints.
+
+    Writes seen while a build runs are reconciled before the array is used:
+    the build reads in one snapshot, looks up the snapshot's best score of
+    every player written to meanwhile, and swaps it for the player's newest
+    best. A write is thus counted once whether or not the snapshot saw it.
+    """
+
+    # Rows fetched per round trip while building; the event loop runs in between
+    LOAD_CHUNK_SIZE = 10_000
+    # Players looked up per query when reconciling writes made during a build
+    RECONCILE_CHUNK_SIZE = 500
+
+    def __init__(self):
+        self._scores: Dict[GameMode, array] = {}
+        self._loading: Dict[GameMode, asyncio.Task] = {}
+        # Newest best score per player written to while the mode is building
+        self._pending: Dict[GameMode, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def is_loaded(self, mode: GameMode) -> bool:
+        return mode in self._scores
+
+    def rank(self, db: Session, mode: GameMode, score: int) -> Tuple[int, int]:
+        """Return (rank, total players) for a best score; ties share a rank"""
+        with self._lock:
+            scores = self._scores.get(mode)
+            if scores is not None:
+                greater = len(scores) - bisect.bisect_right(scores, score)
+                return greater + 1, len(scores)
+        # Not built yet: range scans of ix_best_scores_mode_score_username
+        in_mode = BestScoreDB.mode == GameModeEnum(mode.value)
+        greater = db.query(func.count()).select_from(BestScoreDB).filter(in_mode, BestScoreDB.score > score).scalar()
+        total = db.query(func.count()).select_from(BestScoreDB).filter(in_mode).scalar()
+        return greater + 1, total
+
+    def _query(self, mode: GameMode):
+        return (
+            select(BestScoreDB.score)
+            .where(BestScoreDB.mode == GameModeEnum(mode.value))
+            .order_by(BestScoreDB.score.asc())
+        )
+
+    def load(self, db: Session, mode: GameMode) -> None:
+        """Build a mode's array in the calling thread (for scripts and benchmarks)"""
+        scores = array("q", db.execute(self._query(mode)).scalars())
+        with self._lock:
+            self._scores[mode] = scores
+
+    def load_in_background(self, bind: AsyncEngine, mode: GameMode) -> None:
+        """Start building a mode's array from ``bind`` unless it is built or being built"""
+        if mode in self._scores or mode in self._loading:
+            return
+        with self._lock:
+            # Before the snapshot is taken, so no later write is missed
+            self._pending[mode] = {}
+        self._loading[mode] = asyncio.get_running_loop().create_task(self._load(bind, mode))
+
+    async def _snapshot_bests(self, conn: AsyncConnection, mode: GameMode, usernames: List[str]) -> Dict[str, Optional[int]]:
+        bests: Dict[str, Optional[int]] = dict.fromkeys(usernames)
+        for start in range(0, len(usernames), self.RECONCILE_CHUNK_SIZE):
+            rows = await conn.execute(
+                select(BestScoreDB.username, BestScoreDB.score).where(
+                    BestScoreDB.mode == GameModeEnum(mode.value),
+                    BestScoreDB.username.in_(usernames[start:start + self.RECONCILE_CHUNK_SIZE]),
+                )
+            )
+            bests.update((username, score) for username, score in rows)
+        return bests
+
+    async def _load(self, bind: AsyncEngine, mode: GameMode) -> None:
+        task = asyncio.current_task()
+        try:
+            async with bind.connect() as conn:
+                if conn.dialect.name == "sqlite":
+                    # pysqlite only opens transactions for writes: one explicit
+                    # read transaction keeps every query below on one snapshot
+                    await conn.exec_driver_sql("BEGIN")
+                else:
+                    await conn.execution_options(isolation_level="REPEATABLE READ")
+                scores = array("q")
+                result = await conn.stream(self._query(mode))
+                async for chunk in result.scalars().partitions(self.LOAD_CHUNK_SIZE):
+                    scores.extend(chunk)
+
+                snapshot: Dict[str, Optional[int]] = {}
+                while True:
+                    with self._lock:
+                        if self._loading.get(mode) is not task:
+                            # Cleared while building
+                            return
+                        pending = self._pending[mode]
+                        missing = [username for username in pending if username not in snapshot]
+                        if not missing:
+                            for username, best in pending.items():
+                                before = snapshot[username]
+                                if before is not None:
+                                    if before >= best:
+                                        continue
+                                    scores.pop(bisect.bisect_left(scores, before))
+                                bisect.insort(scores, best)
+                            self._scores[mode] = scores
+                            del self._pending[mode]
+                            return
+                    snapshot.update(await self._snapshot_bests(conn, mode, missing))
+        except Exception as e:
+            print(f"❌ Rank index build for {mode.value} failed: {e}")
+        finally:
+            with self._lock:
+                if self._loading.get(mode) is task:
+                    # After a failure, the next rank query starts over
+                    del self._loading[mode]
+                    self._pending.pop(mode, None)
+
+    def update(self, mode: GameMode, username: str, previous: Optional[int], score: int) -> None:
+        """Replace a player's previous best (None for a new player) with ``score``"""
+        with self._lock:
+            pending = self._pending.get(mode)
+            if pending is not None:
+                pending[username] = max(score, pending.get(username, score))
+                return
+            scores = self._scores.get(mode)
+            if scores is None:
+                return
+            if previous is not None:
+                position = bisect.bisect_left(scores, previous)
+                if position < len(scores) and scores[position] == previous:
+                    scores.pop(position)
+            bisect.insort(scores, score)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._scores.clear()
+            self._pending.clear()
+            # Builds still running notice they were dropped and discard their result
+            self._loading.clear()
+
+rank_index = RankIndex()
+
 # Leaderboard CRUD operations
-def get_leaderboard(db: Session, mode: Optional[GameMode] = None) -> List[LeaderboardEntryDB]:
-    """Get leaderboard entries, optionally filtered by game mode"""
-    query = db.query(LeaderboardEntryDB)
+def leaderboard_entry_from_db(db_entry: LeaderboardEntryDB) -> LeaderboardEntry:
+    """Convert a leaderboard row to its API model"""
+    return LeaderboardEntry(
+        id=db_entry.id,
+        username=db_entry.username,
+        score=db_entry.score,
+        mode=GameMode(db_entry.mode.value),
+        date=db_entry.date
+    )
+
+def get_leaderboard(
+    db: Session,
+    mode: Optional[GameMode] = None,
+    limit: Optional[int] = None,
+    after_score: Optional[int] = None,
+    after_id: Optional[str] = None,
+) -> List[LeaderboardEntryDB]:
+    """Get leaderboard entries ordered by score, optionally filtered by game mode.
+
+    Entries are ordered by (score DESC, id ASC). Passing the score and id of the
+    last entry of a page as ``after_score``/``after_id`` returns the next page
+    (keyset pagination). ``limit=None`` returns every remaining entry.
+    """
+    return _leaderboard_query(db.query(LeaderboardEntryDB), mode, limit, after_score, after_id).all()
+
+# Columns of a leaderboard row as the API returns it
+_LEADERBOARD_COLUMNS = (
+    LeaderboardEntryDB.id,
+    LeaderboardEntryDB.username,
+    LeaderboardEntryDB.score,
+    LeaderboardEntryDB.mode,
+    LeaderboardEntryDB.date,
+)
+
+def get_leaderboard_rows(
+    db: Session,
+    mode: Optional[GameMode] = None,
+    limit: Optional[int] = None,
+    after_score: Optional[int] = None,
+    after_id: Optional[str] = None,
+) -> List[dict]:
+    """Same as get_leaderboard, as plain dicts of the API columns (no ORM objects)"""
+    query = _leaderboard_query(db.query(*_LEADERBOARD_COLUMNS), mode, limit, after_score, after_id)
+    return [row._asdict() for row in query]
+
+def _leaderboard_query(query, mode, limit, after_score, after_id, model=LeaderboardEntryDB):
     if mode:
         # Convert Pydantic GameMode to SQLAlchemy GameModeEnum
         mode_enum = GameModeEnum(mode.value)
-        query = query.filter(LeaderboardEntryDB.mode == mode_enum)
-    return query.order_by(LeaderboardEntryDB.score.desc()).all()
+        query = query.filter(model.mode == mode_enum)
+    if after_score is not None and after_id is not None:
+        query = query.filter(
+            or_(
+                model.score < after_score,
+                and_(model.score == after_score, model.id > after_id),
+            )
+        )
+    query = query.order_by(model.score.desc(), model.id.asc())
+    if limit is not None:
+        query = query.limit(limit)
+    return query
 
-def add_score(db: Session, entry_id: str, username: str, score: int, mode: GameMode, entry_date) -> LeaderboardEntryDB:
-    """Add a new score to the leaderboard"""
+def add_score(
+    db: Session,
+    entry_id: str,
+    username: str,
+    score: int,
+    mode: GameMode,
+    entry_date,
+    replay: Optional[bytes] = None,
+) -> LeaderboardEntryDB:
+    """Add a new score to the leaderboard, with its replay in the same transaction"""
     mode_enum = GameModeEnum(mode.value)
     db_entry = LeaderboardEntryDB(
         id=entry_id,
@@ -59,10 +404,312 @@ def add_score(db: Session, entry_id: str, username: str, score: int, mode: GameM
         date=entry_date
     )
     db.add(db_entry)
+    if replay is not None:
+        # Flushed after the entry it references
+        db.add(ReplayDB(entry_id=entry_id, ticks=ReplayReader(replay).ticks, data=replay, createdAt=datetime.now(UTC)))
+    previous_best = upsert_best_score(db, db_entry)
+    add_window_rows(db, [dict(id=entry_id, username=username, score=score, mode=mode_enum, date=entry_date)])
     db.commit()
     db.refresh(db_entry)
+    entry = leaderboard_entry_from_db(db_entry)
+    _scores_committed([entry], {(username, mode_enum): previous_best})
     return db_entry
 
+def add_scores(
+    db: Session,
+    entries: List[LeaderboardEntry],
+    replays: Optional[Dict[str, bytes]] = None,
+) -> List[LeaderboardEntry]:
+    """Add many scores to the leaderboard in a single transaction.
+
+    Rows are written with one executemany INSERT and one best-score upsert,
+    so a batch costs a single commit however many entries it holds.
+    ``replays`` maps entry ids to replays stored in the same transaction.
+    """
+    rows = [
+        dict(
+            id=entry.id,
+            username=entry.username,
+            score=entry.score,
+            mode=GameModeEnum(entry.mode.value),
+            date=entry.date,
+        )
+        for entry in entries
+    ]
+    if not rows:
+        return []
+    db.execute(insert(LeaderboardEntryDB), rows)
+    if replays:
+        created_at = datetime.now(UTC)
+        db.execute(insert(ReplayDB), [
+            {"entry_id": entry_id, "ticks": ReplayReader(data).ticks, "data": data, "createdAt": created_at}
+            for entry_id, data in replays.items()
+        ])
+    previous_bests = upsert_best_scores(db, rows)
+    add_window_rows(db, rows)
+    db.commit()
+    _scores_committed(entries, previous_bests)
+    return entries
+
+SCORES_CHANNEL = "scores"
+
+def _scores_committed(
+    entries: List[LeaderboardEntry],
+    previous_bests: Dict[Tuple[str, GameModeEnum], Optional[int]],
+) -> None:
+    """Update this worker's leaderboard cache and rank index, then tell the others"""
+    _apply_scores(entries, previous_bests)
+    shared_state.publish(SCORES_CHANNEL, {
+        "entries": [entry.model_dump(mode="json") for entry in entries],
+        "previous_bests": [[username, mode.value, score] for (username, mode), score in previous_bests.items()],
+    })
+
+def _on_scores_message(message: Message) -> None:
+    if message.local:
+        return
+    _apply_scores(
+        [LeaderboardEntry.model_validate(entry) for entry in message.data["entries"]],
+        {(username, GameModeEnum(mode)): score for username, mode, score in message.data["previous_bests"]},
+    )
+
+shared_state.add_listener(SCORES_CHANNEL, _on_scores_message)
+
+def _apply_scores(
+    entries: List[LeaderboardEntry],
+    previous_bests: Dict[Tuple[str, GameModeEnum], Optional[int]],
+) -> None:
+    """Bring the in-process leaderboard cache and rank index up to date"""
+    for entry in entries:
+        leaderboard_cache.add(entry)
+    for (username, mode_enum), row in _best_score_candidates(
+        dict(username=e.username, mode=GameModeEnum(e.mode.value), score=e.score) for e in entries
+    ).items():
+        previous = previous_bests.get((username, mode_enum))
+        if previous is None or row["score"] > previous:
+            rank_index.update(GameMode(mode_enum.value), username, previous, row["score"])
+
+# Daily and weekly leaderboards
+_ROLLUP_WINDOWS = (LeaderboardWindow.DAY, LeaderboardWindow.WEEK)
+
+# Day the ended periods were last dropped by this process
+_rolled_over_on: Optional[date] = None
+
+def window_start(window: LeaderboardWindow, day: date) -> date:
+    """First day of the window's period containing ``day``; weeks start on Monday"""
+    if window == LeaderboardWindow.WEEK:
+        return day - timedelta(days=day.weekday())
+    return day
+
+def add_window_rows(db: Session, rows: List[dict], today: Optional[date] = None) -> None:
+    """Copy leaderboard rows into the rollups of the current day and week.
+
+    ``rows`` hold leaderboard column values (id, username, score, mode, date);
+    rows dated before a window's current period are left out of it. The first
+    write of a new day also drops the periods that have ended. Runs in the
+    caller's transaction; the caller commits.
+    """
+    today = today or date.today()
+    roll_over_windows(db, today)
+    values = []
+    for window in _ROLLUP_WINDOWS:
+        current = window_start(window, today)
+        for row in rows:
+            if row["date"] >= current:
+                values.append(dict(row, period=window.value, period_start=window_start(window, row["date"])))
+    if values:
+        db.execute(insert(LeaderboardWindowDB), values)
+
+def roll_over_windows(db: Session, today: date) -> None:
+    """Drop rollup rows of periods that ended before ``today`` (once a day per process)"""
+    global _rolled_over_on
+    if _rolled_over_on == today:
+        return
+    for window in _ROLLUP_WINDOWS:
+        db.query(LeaderboardWindowDB).filter(
+            LeaderboardWindowDB.period == window.value,
+            LeaderboardWindowDB.period_start < window_start(window, today),
+        ).delete(synchronize_session=False)
+    _rolled_over_on = today
+
+def get_window_leaderboard_rows(
+    db: Session,
+    window: LeaderboardWindow,
+    mode: Optional[GameMode] = None,
+    limit: Optional[int] = None,
+    after_score: Optional[int] = None,
+    after_id: Optional[str] = None,
+    today: Optional[date] = None,
+) -> List[dict]:
+    """Leaderboard of the current day or week, as plain dicts of the API columns.
+
+    Ordering and keyset pagination are those of get_leaderboard; only the
+    window's own rollup rows are read.
+    """
+    start = window_start(window, today or date.today())
+    query = db.query(
+        LeaderboardWindowDB.id,
+        LeaderboardWindowDB.username,
+        LeaderboardWindowDB.score,
+        LeaderboardWindowDB.mode,
+        LeaderboardWindowDB.date,
+    ).filter(LeaderboardWindowDB.period == window.value, LeaderboardWindowDB.period_start == start)
+    query = _leaderboard_query(query, mode, limit, after_score, after_id, model=LeaderboardWindowDB)
+    return [row._asdict() for row in query]
+
+# Best score per player operations
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+def get_best_score(db: Session, username: str, mode: GameMode) -> Optional[BestScoreDB]:
+    """Get a player's best score for a game mode"""
+    return db.get(BestScoreDB, (username, GameModeEnum(mode.value)))
+
+def _best_score_candidates(rows) -> Dict[Tuple[str, GameModeEnum], dict]:
+    """Highest row per (username, mode); the earliest row wins ties"""
+    candidates: Dict[Tuple[str, GameModeEnum], dict] = {}
+    for row in rows:
+        key = (row["username"], row["mode"])
+        if key not in candidates or row["score"] > candidates[key]["score"]:
+            candidates[key] = row
+    return candidates
+
+def upsert_best_scores(db: Session, rows: List[dict]) -> Dict[Tuple[str, GameModeEnum], Optional[int]]:
+    """Raise players' best scores from leaderboard rows that beat them.
+
+    ``rows`` hold leaderboard column values (id, username, score, mode, date).
+    Runs in the caller's transaction; the caller commits. Returns each
+    affected player's previous best score, or None for a first entry.
+    """
+    candidates = _best_score_candidates(rows)
+    if not candidates:
+        return {}
+    previous_bests = {
+        (username, mode): score
+        for username, mode, score in db.query(
+            BestScoreDB.username, BestScoreDB.mode, BestScoreDB.score
+        ).filter(tuple_(BestScoreDB.username, BestScoreDB.mode).in_(list(candidates)))
+    }
+    values = [
+        dict(
+            username=row["username"],
+            mode=row["mode"],
+            score=row["score"],
+            entry_id=row["id"],
+            date=row["date"],
+        )
+        for row in candidates.values()
+    ]
+
+    dialect_insert = _UPSERT_INSERTS.get(db.get_bind().dialect.name)
+    if dialect_insert is None:
+        # Generic fallback for dialects without ON CONFLICT support
+        for key, value in zip(candidates, values):
+            if key not in previous_bests:
+                db.add(BestScoreDB(**value))
+            elif value["score"] > previous_bests[key]:
+                best = db.get(BestScoreDB, key)
+                best.score = value["score"]
+                best.entry_id = value["entry_id"]
+                best.date = value["date"]
+    else:
+        upsert = dialect_insert(BestScoreDB)
+        db.execute(
+            upsert.on_conflict_do_update(
+                index_elements=[BestScoreDB.username, BestScoreDB.mode],
+                set_={
+                    "score": upsert.excluded.score,
+                    "entry_id": upsert.excluded.entry_id,
+                    "date": upsert.excluded.date,
+                },
+                where=upsert.excluded.score > BestScoreDB.score,
+            ),
+            values,
+        )
+    return {key: previous_bests.get(key) for key in candidates}
+
+def upsert_best_score(db: Session, db_entry: LeaderboardEntryDB) -> Optional[int]:
+    """Raise the player's best score for the entry's mode if the entry beats it.
+
+    Runs in the caller's transaction; the caller commits. Returns the
+    player's previous best score, or None if this is their first entry.
+    """
+    row = dict(
+        id=db_entry.id,
+        username=db_entry.username,
+        score=db_entry.score,
+        mode=db_entry.mode,
+        date=db_entry.date,
+    )
+    return upsert_best_scores(db, [row])[(db_entry.username, db_entry.mode)]
+
+def get_player_rank(db: Session, username: str, mode: GameMode) -> Optional[PlayerRank]:
+    """Rank a player's best score among all players of a game mode.
+
+    ``percentile`` is the share of players whose best score is at or below
+    this player's. Returns None if the player has no score in the mode.
+    """
+    best = get_best_score(db, username, mode)
+    if best is None:
+        return None
+    rank, total = rank_index.rank(db, mode, best.score)
+    return PlayerRank(
+        username=username,
+        mode=mode,
+        score=best.score,
+        rank=rank,
+        total=total,
+        percentile=round(100 * (total - rank + 1) / total, 2),
+    )
+
+def get_best_scores(
+    db: Session,
+    mode: Optional[GameMode] = None,
+    limit: Optional[int] = None,
+    after_score: Optional[int] = None,
+    after_username: Optional[str] = None,
+) -> List[BestScoreDB]:
+    """Get each player's best score ordered by (score DESC, username ASC).
+
+    Supports the same keyset pagination as ``get_leaderboard``, keyed on the
+    last row's score and username.
+    """
+    query = db.query(BestScoreDB)
+    if mode:
+        query = query.filter(BestScoreDB.mode == GameModeEnum(mode.value))
+    if after_score is not None and after_username is not None:
+        query = query.filter(
+            or_(
+                BestScoreDB.score < after_score,
+                and_(BestScoreDB.score == after_score, BestScoreDB.username > after_username),
+            )
+        )
+    query = query.order_by(BestScoreDB.score.desc(), BestScoreDB.username.asc())
+    if limit is not None:
+        query = query.limit(limit)
+    return query.all()
+
+def leaderboard_entry_from_best(best: BestScoreDB) -> LeaderboardEntry:
+    """Convert a best score row to its API model (id is the originating entry)"""
+    return LeaderboardEntry(
+        id=best.entry_id,
+        username=best.username,
+        score=best.score,
+        mode=GameMode(best.mode.value),
+        date=best.date
+    )
+
+# Replays
+def get_leaderboard_entry(db: Session, entry_id: str) -> Optional[LeaderboardEntryDB]:
+    return db.get(LeaderboardEntryDB, entry_id)
+
+def get_replay(db: Session, entry_id: str) -> Optional[ReplayDB]:
+    return db.get(ReplayDB, entry_id)
+
+def add_replay(db: Session, entry_id: str, ticks: int, data: bytes) -> ReplayDB:
+    db_replay = ReplayDB(entry_id=entry_id, ticks=ticks, data=data, createdAt=datetime.now(UTC))
+    db.add(db_replay)
+    db.commit()
+    return db_replay
+
 # Active Players CRUD operations
 def get_active_players(db: Session) -> List[ActivePlayerDB]:
     """Get all active players"""
@@ -95,3 +742,135 @@ def delete_active_player(db: Session, player_id: str) -> bool:
         db.commit()
         return True
     return False
+
+def replace_active_players(db: Session, players: List[ActivePlayer]) -> None:
+    """Overwrite the active_players table with a snapshot of the in-memory registry"""
+    db.query(ActivePlayerDB).delete()
+    if players:
+        db.execute(insert(ActivePlayerDB), [
+            {
+                "id": p.id,
+                "username": p.username,
+                "score": p.score,
+                "mode": GameModeEnum(p.mode.value),
+                "startedAt": p.startedAt,
+            }
+            for p in players
+        ])
+    db.commit()
+
+# Async API
+# Each coroutine runs the sync implementation above on the AsyncSession's
+# connection via run_sync, so the event loop is free while queries are in
+# flight and the query logic lives in one place.
+async def get_user_by_email_async(db: AsyncSession, email: str) -> Optional[UserDB]:
+    return await db.run_sync(get_user_by_email, email)
+
+async def get_user_by_id_async(db: AsyncSession, user_id: str) -> Optional[UserDB]:
+    return await db.run_sync(get_user_by_id, user_id)
+
+async def create_user_async(db: AsyncSession, user_id: str, email: str, username: str, hashed_password: str) -> UserDB:
+    return await db.run_sync(create_user, user_id, email, username, hashed_password)
+
+async def add_revoked_token_async(db: AsyncSession, jti: str, expires_at: int) -> None:
+    await db.run_sync(add_revoked_token, jti, expires_at)
+
+async def get_revoked_tokens_async(db: AsyncSession) -> List[Tuple[str, int]]:
+    return await db.run_sync(get_revoked_tokens)
+
+async def get_leaderboard_async(
+    db: AsyncSession,
+    mode: Optional[GameMode] = None,
+    limit: Optional[int] = None,
+    after_score: Optional[int] = None,
+    after_id: Optional[str] = None,
+) -> List[LeaderboardEntryDB]:
+    return await db.run_sync(get_leaderboard, mode, limit, after_score, after_id)
+
+async def get_leaderboard_rows_async(
+    db: AsyncSession,
+    mode: Optional[GameMode] = None,
+    limit: Optional[int] = None,
+    after_score: Optional[int] = None,
+    after_id: Optional[str] = None,
+) -> List[dict]:
+    return await db.run_sync(get_leaderboard_rows, mode, limit, after_score, after_id)
+
+async def get_window_leaderboard_rows_async(
+    db: AsyncSession,
+    window: LeaderboardWindow,
+    mode: Optional[GameMode] = None,
+    limit: Optional[int] = None,
+    after_score: Optional[int] = None,
+    after_id: Optional[str] = None,
+) -> List[dict]:
+    return await db.run_sync(get_window_leaderboard_rows, window, mode, limit, after_score, after_id)
+
+async def add_score_async(
+    db: AsyncSession,
+    entry_id: str,
+    username: str,
+    score: int,
+    mode: GameMode,
+    entry_date,
+    replay: Optional[bytes] = None,
+) -> LeaderboardEntryDB:
+    db_entry = await db.run_sync(add_score, entry_id, username, score, mode, entry_date, replay)
+    await etag.bump_leaderboard([mode])
+    return db_entry
+
+async def add_scores_async(
+    db: AsyncSession,
+    entries: List[LeaderboardEntry],
+    replays: Optional[Dict[str, bytes]] = None,
+) -> List[LeaderboardEntry]:
+    stored = await db.run_sync(add_scores, entries, replays)
+    await etag.bump_leaderboard(entry.mode for entry in stored)
+    return stored
+
+async def get_best_score_async(db: AsyncSession, username: str, mode: GameMode) -> Optional[BestScoreDB]:
+    return await db.run_sync(get_best_score, username, mode)
+
+async def upsert_best_scores_async(db: AsyncSession, rows: List[dict]) -> Dict[Tuple[str, GameModeEnum], Optional[int]]:
+    return await db.run_sync(upsert_best_scores, rows)
+
+async def upsert_best_score_async(db: AsyncSession, db_entry: LeaderboardEntryDB) -> Optional[int]:
+    return await db.run_sync(upsert_best_score, db_entry)
+
+async def get_player_rank_async(db: AsyncSession, username: str, mode: GameMode) -> Optional[PlayerRank]:
+    # The first query per mode builds the rank index off the request path
+    rank_index.load_in_background(db.bind, mode)
+    return await db.run_sync(get_player_rank, username, mode)
+
+async def get_best_scores_async(
+    db: AsyncSession,
+    mode: Optional[GameMode] = None,
+    limit: Optional[int] = None,
+    after_score: Optional[int] = None,
+    after_username: Optional[str] = None,
+) -> List[BestScoreDB]:
+    return await db.run_sync(get_best_scores, mode, limit, after_score, after_username)
+
+async def get_leaderboard_entry_async(db: AsyncSession, entry_id: str) -> Optional[LeaderboardEntryDB]:
+    return await db.run_sync(get_leaderboard_entry, entry_id)
+
+async def get_replay_async(db: AsyncSession, entry_id: str) -> Optional[ReplayDB]:
+    return await db.run_sync(get_replay, entry_id)
+
+async def add_replay_async(db: AsyncSession, entry_id: str, ticks: int, data: bytes) -> ReplayDB:
+    return await db.run_sync(add_replay, entry_id, ticks, data)
+
+async def get_active_players_async(db: AsyncSession) -> List[ActivePlayerDB]:
+    return await db.run_sync(get_active_players)
+
+async def get_active_player_async(db: AsyncSession, player_id: str) -> Optional[ActivePlayerDB]:
+    return await db.run_sync(get_active_player, player_id)
+
+async def create_active_player_async(db: AsyncSession, player_id: str, username: str, score: int, mode: GameMode, started_at) -> ActivePlayerDB:
+    return await db.run_sync(create_active_player, player_id, username, score, mode, started_at)
+
+async def delete_active_player_async(db: AsyncSession, player_id: str) -> bool:
+    return await db.run_sync(delete_active_player, player_id)
+
+async def replace_active_players_async(db: AsyncSession, players: List[ActivePlayer]) -> None:
+    await db.run_sync(replace_active_players, players)
@@ -1,19 +1,48 @@
-from sqlalchemy import create_engine, Column, String, Integer, Date, DateTime, Enum as SQLEnum
+from sqlalchemy import create_engine, event, text, Column, String, Integer, Date, DateTime, ForeignKey, Index, LargeBinary, Enum as SQLEnum
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session, declarative_base
 from datetime import date, datetime
+from typing import Optional
 from .config import settings
 import enum
 
+def configure_sqlite(sync_engine, pragmas: dict = None) -> None:
+    """Run the configured PRAGMAs on every new connection of a SQLite engine"""
+    pragmas = settings.sqlite_pragmas if pragmas is None else pragmas
+
+    @event.listens_for(sync_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
 # Create database engine
 engine = create_engine(
     settings.DATABASE_URL,
     connect_args=settings.connect_args,
-    echo=False  # Set to True for SQL logging during development
+    echo=False,  # Set to True for SQL logging during development
+    **settings.engine_options
 )
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine and session factory used by the API. The sync ones above
+# remain for Alembic and scripts such as scripts/seed_db.py.
+async_engine = create_async_engine(
+    settings.async_database_url,
+    connect_args=settings.connect_args,
+    echo=False,
+    **settings.engine_options
+)
+
+if settings.is_sqlite:
+    configure_sqlite(engine)
+    configure_sqlite(async_engine.sync_engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 # Base class for SQLAlchemy models
 Base = declarative_base()
 
@@ -40,6 +69,63 @@ class LeaderboardEntryDB(Base):
     mode = Column(SQLEnum(GameModeEnum), nullable=False)
     date = Column(Date, nullable=False)
 
+    __table_args__ = (
+        # Top-N per mode and keyset pagination are index range scans
+        Index("ix_leaderboard_mode_score_id", mode, score.desc(), id),
+        Index("ix_leaderboard_score_id", score.desc(), id),
+    )
+
+class BestScoreDB(Base):
+    """Best score per (username, mode), maintained by crud.add_score"""
+    __tablename__ = "best_scores"
+
+    username = Column(String, primary_key=True)
+    mode = Column(SQLEnum(GameModeEnum), primary_key=True)
+    score = Column(Integer, nullable=False)
+    entry_id = Column(String, nullable=False)
+    date = Column(Date, nullable=False)
+
+    __table_args__ = (
+        Index("ix_best_scores_mode_score_username", mode, score.desc(), username),
+    )
+
+class LeaderboardWindowDB(Base):
+    """Entries of the current day and week, maintained by crud.add_score"""
+    __tablename__ = "leaderboard_windows"
+
+    # "day" or "week", and the first day of the period the entry counts towards
+    period = Column(String, primary_key=True)
+    period_start = Column(Date, nullable=False)
+    # Id of the leaderboard entry
+    id = Column(String, primary_key=True)
+    username = Column(String, nullable=False)
+    score = Column(Integer, nullable=False)
+    mode = Column(SQLEnum(GameModeEnum), nullable=False)
+    date = Column(Date, nullable=False)
+
+    __table_args__ = (
+        # A window's top-N, per mode or overall, is a range scan within its period
+        Index("ix_leaderboard_windows_period_mode_score_id", period, period_start, mode, score.desc(), id),
+        Index("ix_leaderboard_windows_period_score_id", period, period_start, score.desc(), id),
+    )
+
+class ReplayDB(Base):
+    """Binary replay (see src/replay.py) of a leaderboard entry"""
+    __tablename__ = "replays"
+
+    entry_id = Column(String, ForeignKey("leaderboard.id", ondelete="CASCADE"), primary_key=True)
+    ticks = Column(Integer, nullable=False)
+    data = Column(LargeBinary, nullable=False)
+    createdAt = Column(DateTime, nullable=False)
+
+class RevokedTokenDB(Base):
+    """Access token revoked before its expiry, kept until then (see src/tokens.py)"""
+    __tablename__ = "revoked_tokens"
+
+    jti = Column(String, primary_key=True)
+    # Unix time the token expires at; the row is pruned after that
+    expires_at = Column(Integer, nullable=False, index=True)
+
 class ActivePlayerDB(Base):
     __tablename__ = "active_players"
     
@@ -50,17 +136,35 @@ class ActivePlayerDB(Base):
     startedAt = Column(DateTime, nullable=False)
 
 # Dependency to get database session
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 # Initialize database (create tables)
-def init_db():
+async def init_db():
     """Create all tables in the database"""
-    Base.metadata.create_all(bind=engine)
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+# Alembic revision the models correspond to (checked against alembic/versions by the tests)
+SCHEMA_REVISION = "006"
+
+class SchemaError(Exception):
+    """The database is not migrated to SCHEMA_REVISION"""
+
+async def check_schema_revision(engine: Optional[AsyncEngine] = None) -> None:
+    """Verify the database's Alembic revision with a single query instead of create_all"""
+    engine = engine or async_engine
+    async with engine.connect() as conn:
+        try:
+            revision = (await conn.execute(text("SELECT version_num FROM alembic_version"))).scalar()
+        except DBAPIError:
+            revision = None
+    if revision != SCHEMA_REVISION:
+        raise SchemaError(
+            f"Database is at revision {revision or 'none'}, expected {SCHEMA_REVISION}: "
+            "run the migrations (make migrate) or set DATABASE_STARTUP=create_all"
+        )
 
 # Drop all tables (useful for testing)
 def drop_db():
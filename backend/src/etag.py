@@ -0,0 +1,53 @@
+import uuid
+from typing import Iterable, Optional
+from fastapi import Request, Response
+from .models import GameMode
+from .shared_state import shared_state
+
+# Versions behind the ETags live in shared_state, so every worker issues the
+# same tag for the same content. The epoch is created once per store: a store
+# that starts over (a restarted single worker, a new shared-state file)
+# restarts its versions too, and must not answer 304 to the old tags.
+EPOCH_KEY = "etag:epoch"
+
+# Clients may store responses but must revalidate them on every use
+CACHE_CONTROL = "no-cache"
+
+async def epoch() -> str:
+    current = await shared_state.get(EPOCH_KEY)
+    if current is None:
+        current = await shared_state.setdefault(EPOCH_KEY, uuid.uuid4().hex[:12])
+    return current.value
+
+async def make_etag(*versions) -> str:
+    """Strong ETag for the content at the given versions"""
+    return '"' + "-".join([await epoch(), *(str(version) for version in versions)]) + '"'
+
+def _leaderboard_key(mode: GameMode) -> str:
+    return f"etag:leaderboard:{mode.value}"
+
+async def leaderboard_versions(mode: Optional[GameMode]) -> list:
+    """Versions of the scores in ``mode``, or in every mode"""
+    return [await shared_state.version(_leaderboard_key(m)) for m in ([mode] if mode else GameMode)]
+
+async def bump_leaderboard(modes: Iterable[GameMode]) -> None:
+    """Record that scores were stored in ``modes``, changing their tags in every worker"""
+    for mode in set(modes):
+        await shared_state.bump(_leaderboard_key(mode))
+
+def matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match accepts ``etag`` (weak comparison, RFC 9110)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+def set_headers(response: Response, etag: str) -> Response:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return response
+
+def not_modified(etag: str) -> Response:
+    return set_headers(Response(status_code=304), etag)
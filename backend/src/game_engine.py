@@ -0,0 +1,167 @@
+from collections import deque
+from typing import Iterable, List, Optional
+from .models import Direction, GameMode, GameState, Position
+
+# Same constants as frontend/src/hooks/useSnakeGame.ts
+GRID_SIZE = 20
+POINTS_PER_FOOD = 10
+INITIAL_SNAKE = ((10, 10), (9, 10), (8, 10))
+INITIAL_DIRECTION = Direction.RIGHT
+
+# tick() results
+MOVED = 0
+ATE = 1
+DIED = 2
+
+DELTAS = {
+    Direction.UP: (0, -1),
+    Direction.DOWN: (0, 1),
+    Direction.LEFT: (-1, 0),
+    Direction.RIGHT: (1, 0),
+}
+
+OPPOSITE = {
+    Direction.UP: Direction.DOWN,
+    Direction.DOWN: Direction.UP,
+    Direction.LEFT: Direction.RIGHT,
+    Direction.RIGHT: Direction.LEFT,
+}
+
+class Rng:
+    """Seeded mulberry32 generator.
+
+    Uses only 32-bit integer arithmetic so a client can reproduce the exact
+    food sequence of a seed (``Math.imul`` in JavaScript).
+    """
+
+    __slots__ = ("state",)
+
+    def __init__(self, seed: int):
+        self.state = seed & 0xFFFFFFFF
+
+    def next_uint32(self) -> int:
+        self.state = (self.state + 0x6D2B79F5) & 0xFFFFFFFF
+        t = self.state
+        t = ((t ^ (t >> 15)) * (t | 1)) & 0xFFFFFFFF
+        t ^= (t + ((t ^ (t >> 7)) * (t | 61))) & 0xFFFFFFFF
+        return (t ^ (t >> 14)) & 0xFFFFFFFF
+
+    def randrange(self, n: int) -> int:
+        return self.next_uint32() % n
+
+class SnakeGame:
+    """One snake game with the same rules as the frontend's ``moveSnake``.
+
+    Cells are stored as ``y * grid_size + x``. The body is a deque with the head
+    on the left, mirrored by a bytearray occupancy grid, so a move and its
+    collision check are O(1) regardless of snake length.
+    """
+
+    __slots__ = (
+        "mode", "grid_size", "body", "occupied", "direction",
+        "food", "score", "game_over", "ticks", "rng",
+    )
+
+    def __init__(self, mode: GameMode = GameMode.WALLS, seed: int = 0, grid_size: int = GRID_SIZE):
+        self.mode = mode
+        self.grid_size = grid_size
+        self.body = deque(y * grid_size + x for x, y in INITIAL_SNAKE)
+        self.occupied = bytearray(grid_size * grid_size)
+        for cell in self.body:
+            self.occupied[cell] = 1
+        self.direction = INITIAL_DIRECTION
+        self.score = 0
+        self.game_over = False
+        self.ticks = 0
+        self.rng = Rng(seed)
+        self.food = self._place_food()
+
+    def _place_food(self) -> Optional[int]:
+        cells = self.grid_size * self.grid_size
+        free = cells - len(self.body)
+        if free <= 0:
+            return None
+        # Rejection sampling like the frontend while the board is mostly empty;
+        # on a crowded board pick among the free cells directly
+        if free * 4 >= cells:
+            while True:
+                cell = self.rng.randrange(cells)
+                if not self.occupied[cell]:
+                    return cell
+        nth = self.rng.randrange(free)
+        for cell in range(cells):
+            if not self.occupied[cell]:
+                if nth == 0:
+                    return cell
+                nth -= 1
+        return None
+
+    def change_direction(self, direction: Direction) -> None:
+        """Turn the snake; reversing onto itself is ignored"""
+        if OPPOSITE[direction] != self.direction:
+            self.direction = direction
+
+    def tick(self) -> int:
+        """Advance one step and return MOVED, ATE or DIED"""
+        if self.game_over:
+            return DIED
+        self.ticks += 1
+        size = self.grid_size
+        head = self.body[0]
+        dx, dy = DELTAS[self.direction]
+        x = head % size + dx
+        y = head // size + dy
+
+        if self.mode == GameMode.WALLS:
+            if x < 0 or x >= size or y < 0 or y >= size:
+                self.game_over = True
+                return DIED
+        else:
+            x %= size
+            y %= size
+
+        cell = y * size + x
+        ate = cell == self.food
+        # The tail moves out of the way this tick unless the snake grows
+        if self.occupied[cell] and (ate or cell != self.body[-1]):
+            self.game_over = True
+            return DIED
+
+        if not ate:
+            self.occupied[self.body.pop()] = 0
+        self.occupied[cell] = 1
+        self.body.appendleft(cell)
+
+        if ate:
+            self.score += POINTS_PER_FOOD
+            self.food = self._place_food()
+            if self.food is None:
+                # Board is full
+                self.game_over = True
+            return ATE
+        return MOVED
+
+    def run(self, directions: Iterable[Optional[Direction]]) -> int:
+        """Apply one direction (or None to keep going) per tick; returns the final score"""
+        for direction in directions:
+            if self.game_over:
+                break
+            if direction is not None:
+                self.change_direction(direction)
+            self.tick()
+        return self.score
+
+    def positions(self) -> List[Position]:
+        size = self.grid_size
+        return [Position(x=cell % size, y=cell // size) for cell in self.body]
+
+    def state(self) -> GameState:
+        size = self.grid_size
+        food = self.food if self.food is not None else self.body[0]
+        return GameState(
+            snake=self.positions(),
+            food=Position(x=food % size, y=food // size),
+            direction=self.direction,
+            score=self.score,
+            gameOver=self.game_over,
+        )
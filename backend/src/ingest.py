@@ -0,0 +1,171 @@
+import asyncio
+import time
+from typing import Callable, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from .config import settings
+from .database import AsyncSessionLocal
+from .models import LeaderboardEntry
+from . import crud
+
+# Queue marker telling the flusher to write its current batch right away
+_DRAIN = object()
+
+class QueueFull(Exception):
+    """Raised when a score can't be enqueued before the enqueue timeout"""
+
+class ScoreIngestQueue:
+    """Write-behind buffer for score submissions with group commit.
+
+    Routes enqueue validated entries; a background task started from the app
+    lifespan writes them with ``crud.add_scores_async`` once ``batch_size`` entries
+    are waiting or ``flush_interval_ms`` has passed since the first one, so a
+    burst of submissions shares one transaction (and one fsync). The queue is
+    bounded: when it is full, ``submit`` waits up to ``enqueue_timeout``
+    seconds and then raises ``QueueFull``. ``stop`` drains what is left.
+
+    Queued scores were already acknowledged, so a batch whose commit fails is
+    retried ``max_retries`` times with exponential backoff (holding back the
+    batches behind it). If it still fails, its entries are appended to
+    ``dead_letter_path`` as JSON lines, to be resubmitted once the cause is
+    fixed, and counted in ``failed_entries``.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        batch_size: int,
+        flush_interval_ms: float,
+        max_queue: int,
+        enqueue_timeout: float,
+        max_retries: int = 5,
+        retry_backoff_ms: float = 100,
+        dead_letter_path: Optional[str] = None,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval_ms = flush_interval_ms
+        self.max_queue = max_queue
+        self.enqueue_timeout = enqueue_timeout
+        self.max_retries = max_retries
+        self.retry_backoff_ms = retry_backoff_ms
+        self.dead_letter_path = dead_letter_path
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self.flushed_batches = 0
+        self.flushed_entries = 0
+        self.retried_batches = 0
+        self.failed_entries = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop accepting scores and flush everything already queued"""
+        if not self.running:
+            return
+        task, self._task = self._task, None
+        # Wakes the flusher so the last partial batch doesn't wait out the interval
+        await self._queue.put(_DRAIN)
+        await self._queue.join()
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def submit(self, entry: LeaderboardEntry) -> None:
+        try:
+            await asyncio.wait_for(self._queue.put(entry), timeout=self.enqueue_timeout)
+        except asyncio.TimeoutError:
+            raise QueueFull(f"Score queue is full ({self.max_queue} pending)")
+
+    async def _run(self) -> None:
+        while True:
+            items = [await self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval_ms / 1000
+            while len(items) < self.batch_size and items[-1] is not _DRAIN:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    items.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+            batch = [item for item in items if item is not _DRAIN]
+            try:
+                if batch:
+                    await self._flush(batch)
+            finally:
+                for _ in items:
+                    self._queue.task_done()
+
+    async def _flush(self, batch: List[LeaderboardEntry]) -> None:
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self.retried_batches += 1
+                await asyncio.sleep(self.retry_backoff_ms * 2 ** (attempt - 1) / 1000)
+            start = time.perf_counter()
+            try:
+                async with self.session_factory() as db:
+                    await crud.add_scores_async(db, batch)
+                break
+            except Exception as e:
+                print(f"❌ Failed to flush {len(batch)} queued scores (attempt {attempt + 1}): {e}")
+        else:
+            self.failed_entries += len(batch)
+            await asyncio.to_thread(self._dead_letter, batch)
+            return
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.flushed_batches += 1
+        self.flushed_entries += len(batch)
+        self.last_flush_ms = elapsed_ms
+        self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+        self._total_flush_ms += elapsed_ms
+
+    def _dead_letter(self, batch: List[LeaderboardEntry]) -> None:
+        if self.dead_letter_path is not None:
+            try:
+                with open(self.dead_letter_path, "a") as f:
+                    f.writelines(entry.model_dump_json() + "\n" for entry in batch)
+                print(f"💀 Wrote {len(batch)} unsaved scores to {self.dead_letter_path}")
+                return
+            except OSError as e:
+                print(f"❌ Failed to write the dead-letter file: {e}")
+        # Last resort: the log keeps them
+        for entry in batch:
+            print(f"💀 Unsaved score: {entry.model_dump_json()}")
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "depth": self._queue.qsize() if self._queue is not None else 0,
+            "capacity": self.max_queue,
+            "flushed_batches": self.flushed_batches,
+            "flushed_entries": self.flushed_entries,
+            "retried_batches": self.retried_batches,
+            "failed_entries": self.failed_entries,
+            "last_flush_ms": round(self.last_flush_ms, 3),
+            "max_flush_ms": round(self.max_flush_ms, 3),
+            "avg_flush_ms": round(self._total_flush_ms / self.flushed_batches, 3) if self.flushed_batches else 0.0,
+        }
+
+ingest_queue = ScoreIngestQueue(
+    session_factory=AsyncSessionLocal,
+    batch_size=settings.SCORE_INGEST_BATCH_SIZE,
+    flush_interval_ms=settings.SCORE_INGEST_FLUSH_MS,
+    max_queue=settings.SCORE_INGEST_MAX_QUEUE,
+    enqueue_timeout=settings.SCORE_INGEST_ENQUEUE_TIMEOUT,
+    max_retries=settings.SCORE_INGEST_MAX_RETRIES,
+    retry_backoff_ms=settings.SCORE_INGEST_RETRY_BACKOFF_MS,
+    dead_letter_path=settings.SCORE_INGEST_DEAD_LETTER_PATH,
+)
@@ -1,17 +1,49 @@
-from fastapi import FastAPI
+# First, so the startup report (STARTUP_REPORT) times every import below
+from . import startup
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
-from .routes import auth, leaderboard, game
-from .database import init_db
+from .routes import auth, leaderboard, game, metrics as metrics_routes
+from .config import settings
+from .database import init_db, check_schema_revision, async_engine, AsyncSessionLocal
+from .ingest import ingest_queue
+from .active_players import active_players
+from .spectate import spectate_hub
+from .shared_state import shared_state
+from .static_files import StaticIndex
+from .metrics import MetricsMiddleware, instrument_engine
+from .tokens import check_secret_key, token_cache
+from . import crud
+from . import verification
 from contextlib import asynccontextmanager
 import os
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Initialize database
-    init_db()
+    startup.mark("lifespan_started")
+    check_secret_key()
+    if settings.DATABASE_STARTUP == "check":
+        # Migrated out of band: one query instead of inspecting every table
+        await check_schema_revision()
+    else:
+        await init_db()
+    # Cross-worker cache invalidation and active players
+    await shared_state.start()
+    # After subscribing, so a revocation made meanwhile arrives as a message
+    async with AsyncSessionLocal() as db:
+        token_cache.load_revoked(await crud.get_revoked_tokens_async(db))
+    if settings.SCORE_INGEST_MODE == "queue":
+        await ingest_queue.start()
+    # Sweeps players that stop sending heartbeats
+    await active_players.start()
+    startup.mark("ready")
     yield
+    # Flush queued scores before shutting down
+    await ingest_queue.stop()
+    await spectate_hub.close()
+    await active_players.stop()
+    verification.shutdown()
+    await shared_state.stop()
+    await async_engine.dispose()
 
 app = FastAPI(
     title="Snake Social API",
@@ -34,26 +66,35 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Outermost, so request timings include every other middleware
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    instrument_engine(async_engine.sync_engine)
+
+if settings.STARTUP_REPORT:
+    app.add_middleware(startup.StartupReportMiddleware)
+
 # Include Routers
 app.include_router(auth.router, prefix="/api/auth", tags=["Auth"])
 app.include_router(leaderboard.router, prefix="/api/leaderboard", tags=["Leaderboard"])
 app.include_router(game.router, prefix="/api/games", tags=["Game"])
+if settings.METRICS_ENABLED:
+    app.include_router(metrics_routes.router)
 
-# Serve static files from the 'static' directory
+# Serve the built frontend from the 'static' directory
 # We check if the directory exists to avoid errors during development if 'static' is missing
 static_dir = os.path.join(os.getcwd(), "static")
 if os.path.exists(static_dir):
-    app.mount("/assets", StaticFiles(directory=os.path.join(static_dir, "assets")), name="assets")
+    # Indexed once here: requests never stat the filesystem
+    static_index = StaticIndex(static_dir)
 
     @app.get("/{rest_of_path:path}")
-    async def serve_frontend(rest_of_path: str):
-        # Serve the file if it exists in the static directory
-        file_path = os.path.join(static_dir, rest_of_path)
-        if os.path.isfile(file_path):
-            return FileResponse(file_path)
-        # Otherwise, fall back to index.html for SPA routing
-        return FileResponse(os.path.join(static_dir, "index.html"))
+    async def serve_frontend(rest_of_path: str, request: Request):
+        # Known files (preferring .br/.gz variants), else index.html for SPA routing
+        return static_index.response(request, rest_of_path)
 else:
     @app.get("/")
     def read_root():
         return {"message": "Welcome to Snake Social API"}
+
+startup.mark("imported")
@@ -0,0 +1,222 @@
+import bisect
+import contextvars
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Histogram upper bounds, in seconds (Prometheus' defaults)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Finer bounds for database time and pool waits
+DB_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+Labels = Tuple[str, ...]
+
+class Histogram:
+    """Cumulative-bucket histogram per label set, rendered in Prometheus text format"""
+
+    def __init__(self, name: str, help: str, label_names: Sequence[str], buckets: Sequence[float]):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        # labels -> [count per bucket (the last one is +Inf), sum]
+        self._series: Dict[Labels, List] = {}
+
+    def observe(self, labels: Labels, value: float) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def count(self, labels: Labels) -> int:
+        series = self._series.get(labels)
+        return sum(series[0]) if series else 0
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total) in sorted(self._series.items()):
+            base = _label_text(self.label_names, labels)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{self.name}_bucket{{{base}{"," if base else ""}le="{le}"}} {cumulative}')
+            suffix = f"{{{base}}}" if base else ""
+            lines.append(f"{self.name}_sum{suffix} {total}")
+            lines.append(f"{self.name}_count{suffix} {cumulative}")
+        return lines
+
+    def clear(self) -> None:
+        self._series.clear()
+
+class Counter:
+    def __init__(self, name: str, help: str, label_names: Sequence[str]):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(label_names)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, labels: Labels, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, labels: Labels) -> float:
+        return self._values.get(labels, 0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self._values.items()):
+            base = _label_text(self.label_names, labels)
+            lines.append(f"{self.name}{{{base}}} {value}" if base else f"{self.name} {value}")
+        return lines
+
+    def clear(self) -> None:
+        self._values.clear()
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _label_text(names: Labels, values: Labels) -> str:
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+
+def gauge(name: str, help: str, value: float) -> List[str]:
+    return [f"# HELP {name} {help}", f"# TYPE {name} gauge", f"{name} {value}"]
+
+class RequestStats:
+    """Database work done while serving one request"""
+    __slots__ = ("queries", "db_time")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+
+_request_stats: contextvars.ContextVar[Optional[RequestStats]] = contextvars.ContextVar("request_stats", default=None)
+
+request_duration = Histogram(
+    "snake_http_request_duration_seconds", "Time to serve HTTP requests.",
+    ("method", "route", "status"), LATENCY_BUCKETS,
+)
+request_db_time = Histogram(
+    "snake_http_request_db_seconds", "Time spent in database queries per HTTP request.",
+    ("route",), DB_BUCKETS,
+)
+db_queries = Counter("snake_db_queries_total", "Database queries executed, by route.", ("route",))
+db_query_time = Counter("snake_db_query_seconds_total", "Time spent executing database queries.", ())
+pool_wait = Histogram(
+    "snake_db_pool_wait_seconds", "Time waited to check a connection out of the pool.",
+    (), DB_BUCKETS,
+)
+
+def _route_template(scope) -> str:
+    # FastAPI keeps the router-relative route in scope["route"] and records
+    # the prefixed template of the matched route alongside it
+    context = scope.get("fastapi", {}).get("effective_route_context")
+    if context is not None:
+        return context.path
+    route = scope.get("route")
+    return route.path if route is not None else "unmatched"
+
+class MetricsMiddleware:
+    """Pure ASGI middleware timing HTTP requests per route template and status.
+
+    Routes are labelled with their path template (``/api/leaderboard/{entry_id}/replay``),
+    never the raw path, so the number of series stays bounded. WebSocket and
+    lifespan traffic passes straight through.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            _request_stats.reset(token)
+            path = _route_template(scope)
+            request_duration.observe((scope["method"], path, str(status)), elapsed)
+            if stats.queries:
+                request_db_time.observe((path,), stats.db_time)
+                db_queries.inc((path,), stats.queries)
+
+# The start time is kept on the statement's execution context rather than the
+# connection: a failed statement never reaches after_cursor_execute, and its
+# context is simply discarded
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._metrics_query_start = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, "_metrics_query_start", None)
+    if start is None:
+        return
+    elapsed = time.perf_counter() - start
+    db_query_time.inc((), elapsed)
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_time += elapsed
+    else:
+        db_queries.inc(("background",))
+
+def _time_pool_checkout(engine: Engine) -> None:
+    # The pool has no "checkout requested" event, so time its connect() call
+    pool = engine.pool
+    connect = pool.connect
+
+    def timed_connect():
+        start = time.perf_counter()
+        try:
+            return connect()
+        finally:
+            pool_wait.observe((), time.perf_counter() - start)
+
+    pool.connect = timed_connect
+
+def instrument_engine(engine: Engine) -> None:
+    """Record query counts and times and pool waits of a (sync) engine"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    _time_pool_checkout(engine)
+    # dispose() replaces the pool, so wrap the new one too
+    event.listen(engine, "engine_disposed", _time_pool_checkout)
+
+def pool_gauges(engine: Engine) -> List[str]:
+    """Current pool occupancy, read at scrape time"""
+    pool = engine.pool
+    lines = []
+    for metric, method, help in (
+        ("size", "size", "Configured pool size."),
+        ("checked_out", "checkedout", "Connections currently checked out."),
+        ("overflow", "overflow", "Connections open beyond the pool size."),
+    ):
+        if hasattr(pool, method):
+            lines += gauge(f"snake_db_pool_{metric}", help, getattr(pool, method)())
+    return lines
+
+def render(extra: Sequence[str] = ()) -> str:
+    lines: List[str] = []
+    for metric in (request_duration, request_db_time, db_queries, db_query_time, pool_wait):
+        lines += metric.render()
+    lines += extra
+    return "\n".join(lines) + "\n"
+
+def clear() -> None:
+    for metric in (request_duration, request_db_time, db_queries, db_query_time, pool_wait):
+        metric.clear()
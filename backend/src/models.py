@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from typing import List, Optional
 from datetime import date, datetime
 from enum import Enum
@@ -7,6 +7,11 @@ class GameMode(str, Enum):
     PASS_THROUGH = "pass-through"
     WALLS = "walls"
 
+class LeaderboardWindow(str, Enum):
+    DAY = "day"
+    WEEK = "week"
+    ALL = "all"
+
 class Direction(str, Enum):
     UP = "UP"
     DOWN = "DOWN"
@@ -22,6 +27,12 @@ class User(BaseModel):
     username: str
     email: EmailStr
 
+class AuthenticatedUser(User):
+    """Returned by login and signup: the user and a bearer token for later calls"""
+    access_token: str
+    token_type: str = "bearer"
+    expires_in: int
+
 class UserCreate(BaseModel):
     email: EmailStr
     password: str
@@ -38,6 +49,46 @@ class LeaderboardEntry(BaseModel):
     mode: GameMode
     date: date
 
+class SubmittedScore(LeaderboardEntry):
+    rank: Optional[int] = None
+    percentile: Optional[float] = None
+    verified: bool = False
+
+class BatchItemError(BaseModel):
+    index: int
+    detail: str
+
+class BatchSubmitResult(BaseModel):
+    created: List[LeaderboardEntry]
+    errors: List[BatchItemError]
+
+class ReplayInfo(BaseModel):
+    entry_id: str
+    mode: GameMode
+    seed: int
+    ticks: int
+    size: int
+
+class IngestStats(BaseModel):
+    running: bool
+    depth: int
+    capacity: int
+    flushed_batches: int
+    flushed_entries: int
+    retried_batches: int
+    failed_entries: int
+    last_flush_ms: float
+    max_flush_ms: float
+    avg_flush_ms: float
+
+class PlayerRank(BaseModel):
+    username: str
+    mode: GameMode
+    score: int
+    rank: int
+    total: int
+    percentile: float
+
 class App(BaseModel):
     pass
 
@@ -45,6 +96,8 @@ class ScoreSubmit(BaseModel):
     score: int
     mode: GameMode
     username: str
+    # Base64 replay (src/replay.py format) the score can be verified against
+    replay: Optional[str] = None
 
 class ActivePlayer(BaseModel):
     id: str
@@ -53,6 +106,12 @@ class ActivePlayer(BaseModel):
     mode: GameMode
     startedAt: datetime
 
+class ActivePlayerHeartbeat(BaseModel):
+    id: str
+    username: str
+    score: int = Field(ge=0)
+    mode: GameMode
+
 class GameState(BaseModel):
     snake: List[Position]
     food: Position
@@ -0,0 +1,129 @@
+import struct
+from typing import Iterator, List, Optional, Tuple
+from .game_engine import SnakeGame
+from .models import Direction, GameMode
+
+# Replay format, version 1:
+#
+#   magic    4 bytes  b"SNKR"
+#   version  1 byte
+#   mode     1 byte   index into MODES
+#   seed     4 bytes  uint32 little-endian, the SnakeGame food seed
+#   ticks    varint   total number of ticks played
+#   events   varint*  one per direction change: (tick_delta << 2) | direction
+#
+# tick_delta counts ticks since the previous event (the first one since tick
+# 0); the change applies before that tick is played. Varints are unsigned
+# LEB128, so a turn within 31 ticks of the previous one takes a single byte.
+MAGIC = b"SNKR"
+VERSION = 1
+MODES = (GameMode.WALLS, GameMode.PASS_THROUGH)
+DIRECTIONS = (Direction.UP, Direction.DOWN, Direction.LEFT, Direction.RIGHT)
+_DIRECTION_CODES = {direction: code for code, direction in enumerate(DIRECTIONS)}
+_HEADER = struct.Struct("<4sBBI")
+
+class ReplayError(ValueError):
+    """Raised for data that isn't a valid replay"""
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def _read_varint(data: bytes, offset: int) -> Tuple[int, int]:
+    value = shift = 0
+    while True:
+        if offset >= len(data):
+            raise ReplayError("Truncated varint")
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, offset
+        shift += 7
+        if shift > 63:
+            raise ReplayError("Varint too long")
+
+class ReplayRecorder:
+    """Records a game as its seed plus the direction changes made on each tick"""
+
+    def __init__(self, mode: GameMode, seed: int):
+        self.mode = mode
+        self.seed = seed & 0xFFFFFFFF
+        self.ticks = 0
+        self._events = bytearray()
+        self._last_event_tick = 0
+
+    def turn(self, direction: Direction) -> None:
+        """Record a direction change applied before the next tick"""
+        delta = self.ticks - self._last_event_tick
+        _write_varint(self._events, (delta << 2) | _DIRECTION_CODES[direction])
+        self._last_event_tick = self.ticks
+
+    def tick(self) -> None:
+        self.ticks += 1
+
+    def finish(self) -> bytes:
+        out = bytearray(_HEADER.pack(MAGIC, VERSION, MODES.index(self.mode), self.seed))
+        _write_varint(out, self.ticks)
+        out += self._events
+        return bytes(out)
+
+class ReplayReader:
+    """Decodes a replay lazily; only the header is parsed up front"""
+
+    def __init__(self, data: bytes):
+        if len(data) < _HEADER.size:
+            raise ReplayError("Replay is too short")
+        magic, version, mode, seed = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ReplayError("Not a replay")
+        if version != VERSION:
+            raise ReplayError(f"Unsupported replay version {version}")
+        if mode >= len(MODES):
+            raise ReplayError(f"Unknown game mode {mode}")
+        self.data = data
+        self.mode = MODES[mode]
+        self.seed = seed
+        self.ticks, self._events_offset = _read_varint(data, _HEADER.size)
+
+    def events(self) -> Iterator[Tuple[int, Direction]]:
+        """(tick, direction) for each recorded direction change"""
+        data, offset, tick = self.data, self._events_offset, 0
+        while offset < len(data):
+            value, offset = _read_varint(data, offset)
+            tick += value >> 2
+            if tick > self.ticks:
+                raise ReplayError("Event after the last tick")
+            yield tick, DIRECTIONS[value & 3]
+
+    def turns(self) -> Iterator[List[Direction]]:
+        """The direction changes to apply before each tick, one list per tick"""
+        events = self.events()
+        pending = next(events, None)
+        for tick in range(self.ticks):
+            turns = []
+            while pending is not None and pending[0] == tick:
+                turns.append(pending[1])
+                pending = next(events, None)
+            yield turns
+
+    def validate(self) -> None:
+        """Decode every event, raising ReplayError if any is malformed"""
+        for _ in self.events():
+            pass
+
+def play_replay(data: bytes, max_ticks: Optional[int] = None) -> SnakeGame:
+    """Re-run a replay through the game engine and return the finished game"""
+    reader = ReplayReader(data)
+    if max_ticks is not None and reader.ticks > max_ticks:
+        raise ReplayError(f"Replay has {reader.ticks} ticks, more than {max_ticks}")
+    game = SnakeGame(reader.mode, seed=reader.seed)
+    for turns in reader.turns():
+        if game.game_over:
+            break
+        for direction in turns:
+            game.change_direction(direction)
+        game.tick()
+    return game
@@ -0,0 +1,28 @@
+from datetime import date
+from typing import Any, List, TypedDict
+from fastapi import Response
+from pydantic import TypeAdapter
+from .models import ActivePlayer, LeaderboardEntry
+
+# Fast JSON path for list endpoints (FAST_JSON_RESPONSES).
+#
+# Returning models from a route makes FastAPI validate them again against the
+# response_model before serializing, so a large list pays for validation
+# twice. These adapters serialize straight to bytes with pydantic-core instead;
+# routes keep their response_model, which then only documents the schema.
+
+class LeaderboardRow(TypedDict):
+    """A leaderboard entry as selected from the database (see crud.get_leaderboard_rows)"""
+    id: str
+    username: str
+    score: int
+    mode: str
+    date: date
+
+leaderboard_rows = TypeAdapter(List[LeaderboardRow])
+leaderboard_entries = TypeAdapter(List[LeaderboardEntry])
+active_player_list = TypeAdapter(List[ActivePlayer])
+
+def json_response(adapter: TypeAdapter, data: Any, status_code: int = 200) -> Response:
+    """Serialize already valid ``data`` with ``adapter`` into a pre-encoded response"""
+    return Response(content=adapter.dump_json(data), status_code=status_code, media_type="application/json")
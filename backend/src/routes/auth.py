@@ -1,29 +1,39 @@
 from fastapi import APIRouter, HTTPException, status, Depends
-from sqlalchemy.orm import Session
-from ..models import User, UserLogin, UserCreate
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from ..config import settings
+from ..models import AuthenticatedUser, User, UserLogin, UserCreate
 from ..database import get_db
+from ..tokens import TokenError, bearer_token, create_access_token, current_user, token_cache
 from .. import crud
 import uuid
 
 router = APIRouter()
 
-@router.post("/login", response_model=User)
-async def login(credentials: UserLogin, db: Session = Depends(get_db)):
-    db_user = crud.get_user_by_email(db, credentials.email)
-    if not db_user or not crud.verify_password(credentials.password, db_user.hashed_password):
+def _authenticated(user: User) -> AuthenticatedUser:
+    return AuthenticatedUser(
+        **user.model_dump(),
+        access_token=create_access_token(user),
+        expires_in=settings.ACCESS_TOKEN_TTL,
+    )
+
+@router.post("/login", response_model=AuthenticatedUser)
+async def login(credentials: UserLogin, db: AsyncSession = Depends(get_db)):
+    db_user = await crud.get_user_by_email_async(db, credentials.email)
+    if not db_user or not await crud.verify_password_async(credentials.password, db_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials",
         )
-    return User(
+    return _authenticated(User(
         id=db_user.id,
         username=db_user.username,
         email=db_user.email
-    )
+    ))
 
-@router.post("/signup", response_model=User, status_code=status.HTTP_201_CREATED)
-async def signup(user_in: UserCreate, db: Session = Depends(get_db)):
-    if crud.get_user_by_email(db, user_in.email):
+@router.post("/signup", response_model=AuthenticatedUser, status_code=status.HTTP_201_CREATED)
+async def signup(user_in: UserCreate, db: AsyncSession = Depends(get_db)):
+    if await crud.get_user_by_email_async(db, user_in.email):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered",
@@ -32,20 +42,35 @@ async def signup(user_in: UserCreate, db: Session = Depends(get_db)):
     # Generate UUID for new user
     new_id = str(uuid.uuid4())
     
-    db_user = crud.create_user(
+    db_user = await crud.create_user_async(
         db=db,
         user_id=new_id,
         email=user_in.email,
         username=user_in.username,
-        password=user_in.password
+        hashed_password=await crud.hash_password_async(user_in.password)
     )
     
-    return User(
+    return _authenticated(User(
         id=db_user.id,
         username=db_user.username,
         email=db_user.email
-    )
+    ))
+
+@router.get("/me", response_model=User)
+async def me(user: User = Depends(current_user)):
+    """The user the bearer token belongs to"""
+    return user
 
 @router.post("/logout")
-async def logout():
+async def logout(token: Optional[str] = Depends(bearer_token), db: AsyncSession = Depends(get_db)):
+    """Revoke the bearer token, if the request carries a valid one"""
+    if token is not None:
+        try:
+            claims = token_cache.decode(token)
+        except TokenError:
+            claims = None
+        if claims is not None:
+            # Stored for workers that start later, then applied to the running ones
+            await crud.add_revoked_token_async(db, claims.jti, claims.expires_at)
+            token_cache.revoke(claims)
     return {"message": "Successfully logged out"}
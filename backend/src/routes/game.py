@@ -1,31 +1,53 @@
-from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
-from typing import List
-from ..models import ActivePlayer, GameState, Position, Direction, GameMode
-from ..database import get_db
-from .. import crud
-import random
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, WebSocket, status
+from typing import List, Optional
+from ..models import ActivePlayer, ActivePlayerHeartbeat, GameState, Position, Direction, User
+from ..active_players import active_players
+from ..config import settings
+from ..etag import make_etag, matches as etag_matches, not_modified, set_headers as set_etag_headers
+from ..responses import active_player_list, json_response
+from ..spectate import spectate_hub
+from ..tokens import current_user
+import asyncio
 
 router = APIRouter()
 
 @router.get("/active", response_model=List[ActivePlayer])
-async def get_active_players_route(db: Session = Depends(get_db)):
-    # Simulate dynamic scores
-    db_players = crud.get_active_players(db)
-    return [
-        ActivePlayer(
-            id=p.id,
-            username=p.username,
-            score=p.score + random.randint(0, 50),
-            mode=GameMode(p.mode.value),
-            startedAt=p.startedAt
-        )
-        for p in db_players
-    ]
+async def get_active_players_route(request: Request, response: Response, limit: Optional[int] = Query(None, ge=1)):
+    etag = await make_etag(await active_players.version())
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    players = active_players.list(limit)
+    if settings.FAST_JSON_RESPONSES:
+        return set_etag_headers(json_response(active_player_list, players), etag)
+    set_etag_headers(response, etag)
+    return players
+
+def _check_owner(player: Optional[ActivePlayer], user: User) -> None:
+    """Only the user playing a game may report on it or end it"""
+    if player is not None and player.username != user.username:
+        raise HTTPException(status_code=403, detail="Not your game")
+
+@router.post("/heartbeat", response_model=ActivePlayer)
+async def heartbeat(beat: ActivePlayerHeartbeat, user: User = Depends(current_user)):
+    """Mark the signed-in user as in a game and report their running score"""
+    if beat.username != user.username:
+        raise HTTPException(status_code=403, detail="Heartbeats are for your own games")
+    _check_owner(active_players.get(beat.id), user)
+    player = active_players.heartbeat(beat.id, user.username, beat.score, beat.mode)
+    await active_players.changed()
+    return player
+
+@router.delete("/{player_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def end_game(player_id: str, user: User = Depends(current_user)):
+    _check_owner(active_players.get(player_id), user)
+    if not active_players.remove(player_id):
+        raise HTTPException(status_code=404, detail="Player or game not found")
+    await active_players.changed()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 @router.get("/{player_id}", response_model=GameState)
-async def get_player_game_state(player_id: str, db: Session = Depends(get_db)):
-    player = crud.get_active_player(db, player_id)
+async def get_player_game_state(player_id: str):
+    player = active_players.get(player_id)
     if not player:
         raise HTTPException(status_code=404, detail="Player or game not found")
     
@@ -37,3 +59,27 @@ async def get_player_game_state(player_id: str, db: Session = Depends(get_db)):
         score=player.score,  # Use the player's base score
         gameOver=False
     )
+
+@router.websocket("/{player_id}/ws")
+async def spectate_game(websocket: WebSocket, player_id: str):
+    """Stream a player's game: a keyframe on connect, then one delta per tick"""
+    player = active_players.get(player_id)
+    if not player:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Player or game not found")
+        return
+
+    await websocket.accept()
+    queue = spectate_hub.join(player_id, player.mode, player.score)
+
+    async def forward():
+        while True:
+            await websocket.send_text(await queue.get())
+
+    sender = asyncio.create_task(forward())
+    try:
+        # Spectators don't send anything; this only waits for the disconnect
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+    finally:
+        sender.cancel()
+        await spectate_hub.leave(player_id, queue)
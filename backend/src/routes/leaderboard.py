@@ -1,53 +1,281 @@
-from fastapi import APIRouter, Query, Depends
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import APIRouter, Body, HTTPException, Query, Depends, Request, Response
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import date
-from ..models import LeaderboardEntry, ScoreSubmit, GameMode
+from ..models import (
+    LeaderboardEntry, LeaderboardWindow, ScoreSubmit, SubmittedScore, PlayerRank, GameMode,
+    BatchItemError, BatchSubmitResult, IngestStats, ReplayInfo,
+)
+from ..config import settings
 from ..database import get_db
+from ..etag import leaderboard_versions, make_etag, matches as etag_matches, not_modified, set_headers as set_etag_headers
+from ..ingest import ingest_queue, QueueFull
+from ..responses import json_response, leaderboard_entries, leaderboard_rows
+from ..replay import ReplayError, ReplayReader
+from ..verification import VerificationError, verify_submission
 from .. import crud
+import asyncio
 import uuid
 
 router = APIRouter()
 
 @router.get("", response_model=List[LeaderboardEntry])
 async def get_leaderboard_entries(
+    request: Request,
+    response: Response,
     mode: Optional[GameMode] = None,
-    db: Session = Depends(get_db)
+    limit: int = Query(settings.LEADERBOARD_PAGE_SIZE, ge=1, le=settings.LEADERBOARD_MAX_PAGE_SIZE),
+    after_score: Optional[int] = Query(None, description="Score of the last entry of the previous page"),
+    after_id: Optional[str] = Query(None, description="Id of the last entry of the previous page"),
+    unbounded: bool = Query(False, description="Return every entry instead of a single page"),
+    window: LeaderboardWindow = Query(LeaderboardWindow.ALL, description="Only scores of the current day or week"),
+    db: AsyncSession = Depends(get_db)
 ):
-    db_entries = crud.get_leaderboard(db, mode)
-    return [
-        LeaderboardEntry(
-            id=entry.id,
-            username=entry.username,
-            score=entry.score,
-            mode=GameMode(entry.mode.value),
-            date=entry.date
-        )
-        for entry in db_entries
-    ]
-
-@router.post("", response_model=LeaderboardEntry, status_code=201)
-async def submit_score(score_in: ScoreSubmit, db: Session = Depends(get_db)):
-    print(f"📥 Received score submission: {score_in.model_dump()}")
+    if (after_score is None) != (after_id is None):
+        raise HTTPException(
+            status_code=400,
+            detail="after_score and after_id must be provided together",
+        )
+    # Changes with every score stored in this mode, by any worker
+    versions = await leaderboard_versions(mode)
+    if window != LeaderboardWindow.ALL:
+        # A new period starts empty
+        versions.append(f"{window.value}{crud.window_start(window, date.today()).toordinal()}")
+    etag = await make_etag(*versions)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag_headers(response, etag)
+
+    fast = settings.FAST_JSON_RESPONSES
+    if window != LeaderboardWindow.ALL:
+        # Served from the window's rollup, bypassing the all-time page cache
+        rows = await crud.get_window_leaderboard_rows_async(
+            db,
+            window,
+            mode,
+            limit=None if unbounded else limit,
+            after_score=after_score,
+            after_id=after_id,
+        )
+        if fast:
+            return set_etag_headers(json_response(leaderboard_rows, rows), etag)
+        return [LeaderboardEntry.model_validate(row) for row in rows]
+
+    # Only the first page of a bounded listing is cached
+    cacheable = after_score is None and not unbounded
+    if cacheable:
+        cached = crud.leaderboard_cache.get(mode, limit)
+        if cached is not None:
+            return set_etag_headers(json_response(leaderboard_entries, cached), etag) if fast else cached
+        generation = crud.leaderboard_cache.generation(mode)
+    elif fast:
+        rows = await crud.get_leaderboard_rows_async(
+            db,
+            mode,
+            limit=None if unbounded else limit,
+            after_score=after_score,
+            after_id=after_id,
+        )
+        return set_etag_headers(json_response(leaderboard_rows, rows), etag)
+
+    db_entries = await crud.get_leaderboard_async(
+        db,
+        mode,
+        limit=None if unbounded else limit,
+        after_score=after_score,
+        after_id=after_id,
+    )
+    entries = [crud.leaderboard_entry_from_db(entry) for entry in db_entries]
+    if cacheable:
+        crud.leaderboard_cache.put(mode, limit, entries, generation)
+    return set_etag_headers(json_response(leaderboard_entries, entries), etag) if fast else entries
+
+@router.get("/best", response_model=List[LeaderboardEntry])
+async def get_best_scores(
+    mode: Optional[GameMode] = None,
+    limit: int = Query(settings.LEADERBOARD_PAGE_SIZE, ge=1, le=settings.LEADERBOARD_MAX_PAGE_SIZE),
+    after_score: Optional[int] = Query(None, description="Score of the last entry of the previous page"),
+    after_username: Optional[str] = Query(None, description="Username of the last entry of the previous page"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Rank players by their best score, one entry per player and mode"""
+    if (after_score is None) != (after_username is None):
+        raise HTTPException(
+            status_code=400,
+            detail="after_score and after_username must be provided together",
+        )
+    best_scores = await crud.get_best_scores_async(
+        db,
+        mode,
+        limit=limit,
+        after_score=after_score,
+        after_username=after_username,
+    )
+    return [crud.leaderboard_entry_from_best(best) for best in best_scores]
+
+@router.get("/rank", response_model=PlayerRank)
+async def get_player_rank(
+    username: str,
+    mode: GameMode,
+    db: AsyncSession = Depends(get_db)
+):
+    """Rank of a player's best score within a game mode"""
+    player_rank = await crud.get_player_rank_async(db, username, mode)
+    if player_rank is None:
+        raise HTTPException(status_code=404, detail="No score for this player and mode")
+    return player_rank
+
+@router.post("", response_model=SubmittedScore, status_code=201)
+async def submit_score(score_in: ScoreSubmit, response: Response, db: AsyncSession = Depends(get_db)):
+    print(f"📥 Received score submission: {score_in.model_dump(exclude={'replay'})}")
+    try:
+        replay = await verify_submission(score_in)
+    except VerificationError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    verified = replay is not None and settings.SCORE_VERIFICATION != "off"
+
     entry_id = str(uuid.uuid4())
+    # Scores with a replay are stored in the request so the replay can go with them
+    if settings.SCORE_INGEST_MODE == "queue" and ingest_queue.running and replay is None:
+        entry = LeaderboardEntry(
+            id=entry_id,
+            username=score_in.username,
+            score=score_in.score,
+            mode=score_in.mode,
+            date=date.today()
+        )
+        try:
+            await ingest_queue.submit(entry)
+        except QueueFull as e:
+            raise HTTPException(status_code=503, detail=str(e))
+        # Accepted for a later group commit, so there is no rank yet
+        response.status_code = 202
+        return SubmittedScore(**entry.model_dump())
+
     try:
-        db_entry = crud.add_score(
+        db_entry = await crud.add_score_async(
             db=db,
             entry_id=entry_id,
             username=score_in.username,
             score=score_in.score,
             mode=score_in.mode,
-            entry_date=date.today()
+            entry_date=date.today(),
+            replay=replay,
         )
         print(f"✅ Score saved successfully: {db_entry.id}")
-        return LeaderboardEntry(
-            id=db_entry.id,
-            username=db_entry.username,
-            score=db_entry.score,
-            mode=GameMode(db_entry.mode.value),
-            date=db_entry.date
+        player_rank = await crud.get_player_rank_async(db, db_entry.username, score_in.mode)
+        return SubmittedScore(
+            **crud.leaderboard_entry_from_db(db_entry).model_dump(),
+            rank=player_rank.rank if player_rank else None,
+            percentile=player_rank.percentile if player_rank else None,
+            verified=verified,
         )
     except Exception as e:
         print(f"❌ Failed to save score: {e}")
-        from fastapi import HTTPException
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/ingest", response_model=IngestStats)
+async def get_ingest_stats():
+    """Depth and flush latency of the write-behind score queue"""
+    return ingest_queue.stats()
+
+@router.post("/batch", response_model=BatchSubmitResult)
+async def submit_scores_batch(items: List[Any] = Body(...), db: AsyncSession = Depends(get_db)):
+    """Submit many scores in one transaction.
+
+    Each item is validated as a ``ScoreSubmit`` on its own; invalid items are
+    reported in ``errors`` by index and the valid ones are still stored.
+    Replays in the batch are verified concurrently on the verification pool.
+    """
+    if len(items) > settings.SCORE_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {settings.SCORE_BATCH_MAX_SIZE} scores per batch",
+        )
+
+    submissions: List[Tuple[int, ScoreSubmit]] = []
+    errors: List[BatchItemError] = []
+    for index, item in enumerate(items):
+        try:
+            submissions.append((index, ScoreSubmit.model_validate(item)))
+        except ValidationError as e:
+            detail = "; ".join(
+                f"{'.'.join(str(part) for part in error['loc']) or 'item'}: {error['msg']}"
+                for error in e.errors()
+            )
+            errors.append(BatchItemError(index=index, detail=detail))
+
+    results = await asyncio.gather(
+        *(verify_submission(score_in) for _, score_in in submissions),
+        return_exceptions=True,
+    )
+    entries: List[LeaderboardEntry] = []
+    replays: Dict[str, bytes] = {}
+    today = date.today()
+    for (index, score_in), replay in zip(submissions, results):
+        if isinstance(replay, VerificationError):
+            errors.append(BatchItemError(index=index, detail=replay.detail))
+            continue
+        if isinstance(replay, BaseException):
+            raise replay
+        entry = LeaderboardEntry(
+            id=str(uuid.uuid4()),
+            username=score_in.username,
+            score=score_in.score,
+            mode=score_in.mode,
+            date=today,
+        )
+        entries.append(entry)
+        if replay is not None:
+            replays[entry.id] = replay
+    errors.sort(key=lambda error: error.index)
+
+    try:
+        created = await crud.add_scores_async(db, entries, replays)
+    except Exception as e:
+        print(f"❌ Failed to save score batch: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    return BatchSubmitResult(created=created, errors=errors)
+
+def _replay_info(entry_id: str, data: bytes) -> ReplayInfo:
+    reader = ReplayReader(data)
+    return ReplayInfo(entry_id=entry_id, mode=reader.mode, seed=reader.seed, ticks=reader.ticks, size=len(data))
+
+@router.put("/{entry_id}/replay", response_model=ReplayInfo, status_code=201)
+async def upload_replay(entry_id: str, request: Request, db: AsyncSession = Depends(get_db)):
+    """Store the binary replay (application/octet-stream) of a leaderboard entry"""
+    data = await request.body()
+    if len(data) > settings.REPLAY_MAX_BYTES:
+        raise HTTPException(status_code=413, detail=f"Replays are limited to {settings.REPLAY_MAX_BYTES} bytes")
+    try:
+        reader = ReplayReader(data)
+        reader.validate()
+    except ReplayError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid replay: {e}")
+
+    entry = await crud.get_leaderboard_entry_async(db, entry_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Leaderboard entry not found")
+    if reader.mode.value != entry.mode.value:
+        raise HTTPException(status_code=400, detail="Replay mode does not match the entry")
+    if await crud.get_replay_async(db, entry_id) is not None:
+        raise HTTPException(status_code=409, detail="This entry already has a replay")
+
+    await crud.add_replay_async(db, entry_id, reader.ticks, data)
+    return _replay_info(entry_id, data)
+
+@router.get("/{entry_id}/replay", response_class=Response)
+async def download_replay(entry_id: str, db: AsyncSession = Depends(get_db)):
+    replay = await crud.get_replay_async(db, entry_id)
+    if replay is None:
+        raise HTTPException(status_code=404, detail="Replay not found")
+    return Response(content=replay.data, media_type="application/octet-stream")
+
+@router.get("/{entry_id}/replay/info", response_model=ReplayInfo)
+async def get_replay_info(entry_id: str, db: AsyncSession = Depends(get_db)):
+    replay = await crud.get_replay_async(db, entry_id)
+    if replay is None:
+        raise HTTPException(status_code=404, detail="Replay not found")
+    return _replay_info(entry_id, replay.data)
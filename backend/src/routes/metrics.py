@@ -0,0 +1,23 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from .. import crud, metrics
+from ..active_players import active_players
+from ..database import async_engine
+from ..ingest import ingest_queue
+from ..spectate import spectate_hub
+
+router = APIRouter()
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics():
+    """Prometheus text exposition of request, database and in-process metrics"""
+    cache = crud.leaderboard_cache.stats()
+    extra = [
+        *metrics.pool_gauges(async_engine.sync_engine),
+        *metrics.gauge("snake_leaderboard_cache_hits", "Leaderboard page cache hits.", cache["hits"]),
+        *metrics.gauge("snake_leaderboard_cache_misses", "Leaderboard page cache misses.", cache["misses"]),
+        *metrics.gauge("snake_active_players", "Players currently in a game.", len(active_players)),
+        *metrics.gauge("snake_ingest_queue_depth", "Scores waiting in the ingest queue.", ingest_queue.stats()["depth"]),
+        *metrics.gauge("snake_spectate_channels", "Games currently being spectated.", len(spectate_hub.channels)),
+    ]
+    return PlainTextResponse(metrics.render(extra), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,320 @@
+import asyncio
+import json
+import time
+import uuid
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Set
+from sqlalchemy import Column, Float, Integer, MetaData, String, Table, Text, create_engine, delete, func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.schema import CreateTable
+from .config import settings
+from .database import configure_sqlite
+
+class Versioned(NamedTuple):
+    value: Any
+    version: int
+
+class Message(NamedTuple):
+    channel: str
+    data: Any
+    # True when published by this process, False when it came from another worker
+    local: bool
+
+Listener = Callable[[Message], None]
+
+class SharedState:
+    """Key/value store with versions plus publish/subscribe, shared by the app's workers.
+
+    This base class keeps everything in process, which is all a single worker
+    needs. Values and messages must be JSON serializable so that backends can
+    carry them between processes. Every ``set`` or ``bump`` of a key increases
+    its version, which makes versions usable as change counters.
+
+    ``publish`` never blocks: the message is handed to this process's
+    listeners and subscribers straight away, and a cross-process backend
+    forwards it to the other workers in the background. Call it from the
+    event loop thread.
+    """
+
+    def __init__(self, queue_size: int = 256):
+        self.origin = uuid.uuid4().hex
+        self.queue_size = queue_size
+        self.published = 0
+        self.received = 0
+        self.dropped = 0
+        self._values: Dict[str, Versioned] = {}
+        self._listeners: Dict[str, List[Listener]] = {}
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+
+    async def get(self, key: str) -> Optional[Versioned]:
+        return self._values.get(key)
+
+    async def set(self, key: str, value: Any) -> int:
+        """Store a value and return its new version"""
+        current = self._values.get(key)
+        version = (current.version if current else 0) + 1
+        self._values[key] = Versioned(value, version)
+        return version
+
+    async def bump(self, key: str) -> int:
+        """Increase a key's version without changing its value"""
+        current = self._values.get(key)
+        return await self.set(key, current.value if current else None)
+
+    async def setdefault(self, key: str, value: Any) -> Versioned:
+        """Store ``value`` unless the key is already set; return what is stored"""
+        current = self._values.get(key)
+        if current is None:
+            current = self._values[key] = Versioned(value, 1)
+        return current
+
+    async def version(self, key: str) -> int:
+        """Current version of a key, 0 if it was never set"""
+        current = await self.get(key)
+        return current.version if current else 0
+
+    async def delete(self, key: str) -> bool:
+        return self._values.pop(key, None) is not None
+
+    def add_listener(self, channel: str, listener: Listener) -> None:
+        """Call ``listener`` with every message on ``channel``, local or remote"""
+        self._listeners.setdefault(channel, []).append(listener)
+
+    def remove_listener(self, channel: str, listener: Listener) -> None:
+        listeners = self._listeners.get(channel, [])
+        if listener in listeners:
+            listeners.remove(listener)
+
+    def subscribe(self, channel: str) -> asyncio.Queue:
+        """Queue receiving every message on ``channel`` until unsubscribed"""
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(channel, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, channel: str, queue: asyncio.Queue) -> None:
+        self._subscribers.get(channel, set()).discard(queue)
+
+    def publish(self, channel: str, data: Any) -> None:
+        self.published += 1
+        self._deliver(Message(channel, data, local=True))
+
+    def _deliver(self, message: Message) -> None:
+        for listener in list(self._listeners.get(message.channel, ())):
+            try:
+                listener(message)
+            except Exception as e:
+                print(f"❌ Shared state listener failed on {message.channel}: {e}")
+        for queue in self._subscribers.get(message.channel, ()):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                self.dropped += 1
+
+    def clear(self) -> None:
+        """Forget stored values (listeners and subscribers stay)"""
+        self._values.clear()
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    def stats(self) -> dict:
+        return {
+            "backend": "local",
+            "published": self.published,
+            "received": self.received,
+            "dropped": self.dropped,
+        }
+
+# Tables of the SQLite backend. They only hold transient state, so they live
+# in their own database file instead of the Alembic-managed schema.
+_metadata = MetaData()
+
+shared_values = Table(
+    "shared_values", _metadata,
+    Column("key", String, primary_key=True),
+    Column("value", Text),
+    Column("version", Integer, nullable=False),
+)
+
+shared_messages = Table(
+    "shared_messages", _metadata,
+    Column("id", Integer, primary_key=True),
+    Column("channel", String, nullable=False),
+    Column("origin", String, nullable=False),
+    Column("data", Text, nullable=False),
+    Column("created_at", Float, nullable=False),
+)
+
+class SqliteSharedState(SharedState):
+    """Shared state kept in a SQLite file that every worker on the host opens.
+
+    Values are rows read and upserted on demand. Published messages are
+    appended to a log table in batches by a background task, which also reads
+    the rows other workers appended since its last poll. SQLite serializes
+    writers, so ids grow in commit order and ``id > last seen`` never skips a
+    message. Rows older than ``message_ttl`` seconds are pruned.
+    """
+
+    def __init__(self, path: str, poll_interval: float, message_ttl: float, queue_size: int = 256):
+        super().__init__(queue_size)
+        self.path = path
+        self.poll_interval = poll_interval
+        self.message_ttl = message_ttl
+        self.engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+        configure_sqlite(self.engine)
+        self._outbox: List[dict] = []
+        self._last_id = 0
+        self._last_prune = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def _get(self, key: str) -> Optional[Versioned]:
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                select(shared_values.c.value, shared_values.c.version).where(shared_values.c.key == key)
+            ).first()
+        if row is None:
+            return None
+        return Versioned(json.loads(row.value), row.version)
+
+    def _upsert(self, key: str, value: Any, keep_value: bool) -> int:
+        encoded = json.dumps(value)
+        upsert = sqlite_insert(shared_values).values(key=key, value=encoded, version=1)
+        updates = {"version": shared_values.c.version + 1}
+        if not keep_value:
+            updates["value"] = upsert.excluded.value
+        with self.engine.begin() as conn:
+            return conn.execute(
+                upsert.on_conflict_do_update(index_elements=[shared_values.c.key], set_=updates)
+                .returning(shared_values.c.version)
+            ).scalar_one()
+
+    def _setdefault(self, key: str, value: Any) -> Versioned:
+        # First writer wins when several workers race to create the key
+        with self.engine.begin() as conn:
+            conn.execute(
+                sqlite_insert(shared_values)
+                .values(key=key, value=json.dumps(value), version=1)
+                .on_conflict_do_nothing(index_elements=[shared_values.c.key])
+            )
+        return self._get(key)
+
+    def _delete(self, key: str) -> bool:
+        with self.engine.begin() as conn:
+            return conn.execute(delete(shared_values).where(shared_values.c.key == key)).rowcount > 0
+
+    async def get(self, key: str) -> Optional[Versioned]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: Any) -> int:
+        return await asyncio.to_thread(self._upsert, key, value, False)
+
+    async def bump(self, key: str) -> int:
+        return await asyncio.to_thread(self._upsert, key, None, True)
+
+    async def setdefault(self, key: str, value: Any) -> Versioned:
+        return await asyncio.to_thread(self._setdefault, key, value)
+
+    async def delete(self, key: str) -> bool:
+        return await asyncio.to_thread(self._delete, key)
+
+    def publish(self, channel: str, data: Any) -> None:
+        super().publish(channel, data)
+        if self._task is None:
+            # Not started (e.g. a script using crud): nothing to forward to
+            return
+        self._outbox.append({
+            "channel": channel,
+            "origin": self.origin,
+            "data": json.dumps(data),
+            "created_at": time.time(),
+        })
+
+    def clear(self) -> None:
+        super().clear()
+        with self.engine.begin() as conn:
+            conn.execute(delete(shared_values))
+
+    def _exchange(self, outgoing: List[dict]) -> List[tuple]:
+        """Append our messages and return everything appended since the last poll"""
+        with self.engine.begin() as conn:
+            if outgoing:
+                conn.execute(shared_messages.insert(), outgoing)
+            rows = conn.execute(
+                select(shared_messages.c.id, shared_messages.c.channel, shared_messages.c.origin, shared_messages.c.data)
+                .where(shared_messages.c.id > self._last_id)
+                .order_by(shared_messages.c.id)
+            ).all()
+            now = time.time()
+            if now - self._last_prune > self.message_ttl:
+                conn.execute(delete(shared_messages).where(shared_messages.c.created_at < now - self.message_ttl))
+                self._last_prune = now
+        return rows
+
+    async def poll(self) -> int:
+        """Send queued messages and deliver the ones other workers published"""
+        outgoing, self._outbox = self._outbox, []
+        try:
+            rows = await asyncio.to_thread(self._exchange, outgoing)
+        except Exception:
+            self._outbox[:0] = outgoing
+            raise
+        delivered = 0
+        for row in rows:
+            self._last_id = row.id
+            if row.origin == self.origin:
+                continue
+            self.received += 1
+            delivered += 1
+            self._deliver(Message(row.channel, json.loads(row.data), local=False))
+        return delivered
+
+    def _setup(self) -> None:
+        # IF NOT EXISTS: every worker runs this at the same time on startup
+        with self.engine.begin() as conn:
+            for table in _metadata.sorted_tables:
+                conn.execute(CreateTable(table, if_not_exists=True))
+        with self.engine.connect() as conn:
+            self._last_id = conn.execute(select(func.max(shared_messages.c.id))).scalar() or 0
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self.poll()
+            except Exception as e:
+                print(f"❌ Shared state poll failed: {e}")
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        await asyncio.to_thread(self._setup)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        if self._outbox:
+            await asyncio.to_thread(self._exchange, self._outbox)
+            self._outbox = []
+
+    def stats(self) -> dict:
+        return {**super().stats(), "backend": "sqlite", "pending": len(self._outbox)}
+
+def create_shared_state() -> SharedState:
+    if settings.SHARED_STATE_BACKEND == "sqlite":
+        return SqliteSharedState(
+            settings.SHARED_STATE_PATH,
+            poll_interval=settings.SHARED_STATE_POLL_INTERVAL,
+            message_ttl=settings.SHARED_STATE_MESSAGE_TTL,
+        )
+    return SharedState()
+
+shared_state = create_shared_state()
@@ -0,0 +1,206 @@
+import asyncio
+import json
+import random
+from typing import Dict, Optional, Set
+from .config import settings
+from .game_engine import ATE, DELTAS, DIED, OPPOSITE, SnakeGame
+from .models import Direction, GameMode
+
+def _dumps(message: dict) -> str:
+    return json.dumps(message, separators=(",", ":"))
+
+def _autopilot(game: SnakeGame) -> Direction:
+    """Steer toward the food, avoiding walls and the body (same idea as the old client-side AI)"""
+    size = game.grid_size
+    head = game.body[0]
+    hx, hy = head % size, head // size
+    fx, fy = (game.food % size, game.food // size) if game.food is not None else (hx, hy)
+    preferred = []
+    if fx > hx:
+        preferred.append(Direction.RIGHT)
+    if fx < hx:
+        preferred.append(Direction.LEFT)
+    if fy > hy:
+        preferred.append(Direction.DOWN)
+    if fy < hy:
+        preferred.append(Direction.UP)
+    for direction in preferred + [game.direction] + list(Direction):
+        if direction == OPPOSITE[game.direction]:
+            continue
+        dx, dy = DELTAS[direction]
+        x, y = hx + dx, hy + dy
+        if game.mode == GameMode.WALLS:
+            if x < 0 or x >= size or y < 0 or y >= size:
+                continue
+        else:
+            x, y = x % size, y % size
+        if not game.occupied[y * size + x]:
+            return direction
+    return game.direction
+
+class SpectatorChannel:
+    """One simulated game, played by the autopilot, fanned out to all of its spectators.
+
+    The player's own moves never reach the server, so spectators watch a
+    preview in the player's mode starting from their score, not their game.
+
+    Every tick is serialized once into a small delta message (new head, whether
+    the tail moved, food and score when they change) and the same string is
+    queued for each spectator. A full keyframe goes out every
+    ``keyframe_ticks`` ticks, when a game restarts, and to a spectator that
+    joins or falls so far behind that its queue overflows.
+    """
+
+    def __init__(
+        self,
+        player_id: str,
+        mode: GameMode,
+        base_score: int,
+        tick_ms: float,
+        keyframe_ticks: int,
+        queue_size: int,
+    ):
+        self.player_id = player_id
+        self.mode = mode
+        self.base_score = base_score
+        self.tick_ms = tick_ms
+        self.keyframe_ticks = keyframe_ticks
+        self.queue_size = queue_size
+        self.subscribers: Set[asyncio.Queue] = set()
+        self.messages_sent = 0
+        self.resyncs = 0
+        self._task: Optional[asyncio.Task] = None
+        self._keyframe: Optional[str] = None
+        self.new_game()
+
+    def new_game(self) -> None:
+        self.game = SnakeGame(self.mode, seed=random.getrandbits(32))
+        self._keyframe = None
+
+    def _cell(self, cell: int) -> list:
+        size = self.game.grid_size
+        return [cell % size, cell // size]
+
+    def keyframe(self) -> str:
+        """Full state of the current tick, built at most once per tick"""
+        if self._keyframe is None:
+            game = self.game
+            self._keyframe = _dumps({
+                "type": "keyframe",
+                "tick": game.ticks,
+                "snake": [self._cell(cell) for cell in game.body],
+                "food": self._cell(game.food if game.food is not None else game.body[0]),
+                "direction": game.direction.value,
+                "score": self.base_score + game.score,
+                "gameOver": game.game_over,
+            })
+        return self._keyframe
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        queue.put_nowait(self.keyframe())
+        self.subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self.subscribers.discard(queue)
+
+    def broadcast(self, message: str) -> None:
+        for queue in self.subscribers:
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # Too slow to keep up: drop its backlog and resynchronize
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(self.keyframe())
+                self.resyncs += 1
+            self.messages_sent += 1
+
+    def step(self) -> None:
+        """Advance the game one tick and broadcast the change"""
+        game = self.game
+        if game.game_over:
+            self.new_game()
+            self.broadcast(self.keyframe())
+            return
+        game.change_direction(_autopilot(game))
+        food, score = game.food, game.score
+        result = game.tick()
+        self._keyframe = None
+        if result == DIED:
+            delta = {"type": "delta", "tick": game.ticks, "gameOver": True}
+        else:
+            delta = {
+                "type": "delta",
+                "tick": game.ticks,
+                "head": self._cell(game.body[0]),
+                "tail": result != ATE,
+                "direction": game.direction.value,
+            }
+            if game.food != food and game.food is not None:
+                delta["food"] = self._cell(game.food)
+            if game.score != score:
+                delta["score"] = self.base_score + game.score
+            if game.game_over:
+                delta["gameOver"] = True
+        self.broadcast(_dumps(delta))
+        if game.ticks % self.keyframe_ticks == 0:
+            self.broadcast(self.keyframe())
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.tick_ms / 1000)
+            self.step()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+class SpectateHub:
+    """Live channels by player id; a channel runs only while someone watches it"""
+
+    def __init__(self, tick_ms: float, keyframe_ticks: int, queue_size: int):
+        self.tick_ms = tick_ms
+        self.keyframe_ticks = keyframe_ticks
+        self.queue_size = queue_size
+        self.channels: Dict[str, SpectatorChannel] = {}
+
+    def join(self, player_id: str, mode: GameMode, base_score: int) -> asyncio.Queue:
+        channel = self.channels.get(player_id)
+        if channel is None:
+            channel = SpectatorChannel(
+                player_id, mode, base_score, self.tick_ms, self.keyframe_ticks, self.queue_size
+            )
+            self.channels[player_id] = channel
+            channel.start()
+        return channel.subscribe()
+
+    async def leave(self, player_id: str, queue: asyncio.Queue) -> None:
+        channel = self.channels.get(player_id)
+        if channel is None:
+            return
+        channel.unsubscribe(queue)
+        if not channel.subscribers:
+            del self.channels[player_id]
+            await channel.stop()
+
+    async def close(self) -> None:
+        channels, self.channels = list(self.channels.values()), {}
+        for channel in channels:
+            await channel.stop()
+
+spectate_hub = SpectateHub(
+    tick_ms=settings.SPECTATE_TICK_MS,
+    keyframe_ticks=settings.SPECTATE_KEYFRAME_TICKS,
+    queue_size=settings.SPECTATE_QUEUE_SIZE,
+)
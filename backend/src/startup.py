@@ -0,0 +1,147 @@
+import os
+import sys
+import time
+from typing import Dict, List, Optional
+from .config import settings
+
+# src.main imports this module first, so this is roughly when the app's imports start
+IMPORTS_STARTED = time.perf_counter()
+
+# Phase name -> perf_counter() when it was reached
+_marks: Dict[str, float] = {"imports_started": IMPORTS_STARTED}
+
+class _TimedLoader:
+    """Loader wrapper recording the time spent executing one module"""
+
+    def __init__(self, loader, name: str, timer: "ImportTimer"):
+        self._loader = loader
+        self._name = name
+        self._timer = timer
+
+    def __getattr__(self, attr):
+        return getattr(self._loader, attr)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        stack = self._timer.stack
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            self._timer.self_times[self._name] = elapsed - children
+
+class ImportTimer:
+    """Meta path finder timing every module imported while it is installed.
+
+    Records each module's self time (excluding the modules it imports), the
+    same figure ``python -X importtime`` reports in its first column.
+    """
+
+    def __init__(self):
+        self.self_times: Dict[str, float] = {}
+        self.stack: List[float] = []
+
+    def find_spec(self, name, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimedLoader(spec.loader, name, self)
+                return spec
+        return None
+
+    def install(self) -> None:
+        sys.meta_path.insert(0, self)
+
+    def uninstall(self) -> None:
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def by_package(self) -> Dict[str, float]:
+        """Self times summed per top-level package, slowest first"""
+        totals: Dict[str, float] = {}
+        for name, seconds in self.self_times.items():
+            package = name.partition(".")[0]
+            totals[package] = totals.get(package, 0.0) + seconds
+        return dict(sorted(totals.items(), key=lambda item: -item[1]))
+
+import_timer: Optional[ImportTimer] = None
+if settings.STARTUP_REPORT:
+    import_timer = ImportTimer()
+    import_timer.install()
+
+def _process_age() -> Optional[float]:
+    """Seconds since this process started (Linux only), covering interpreter and server boot"""
+    try:
+        with open("/proc/self/stat") as f:
+            # The command name may contain spaces; fields resume after its closing paren
+            started_ticks = int(f.read().rpartition(")")[2].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+    except (OSError, ValueError, IndexError):
+        return None
+    return uptime - started_ticks / os.sysconf("SC_CLK_TCK")
+
+# Seconds between process start and the first app import
+_PROCESS_AGE = _process_age()
+
+def mark(phase: str) -> None:
+    """Record that startup reached ``phase`` (the first time only)"""
+    _marks.setdefault(phase, time.perf_counter())
+
+def report() -> dict:
+    """Startup phases in seconds since imports started, and import times per package"""
+    phases = {phase: round(at - IMPORTS_STARTED, 4) for phase, at in _marks.items()}
+    return {
+        "before_imports": None if _PROCESS_AGE is None else round(_PROCESS_AGE, 4),
+        "phases": phases,
+        "imports_by_package": {
+            package: round(seconds, 4)
+            for package, seconds in (import_timer.by_package() if import_timer else {}).items()
+        },
+    }
+
+def print_report(top: int = 12) -> None:
+    data = report()
+    phases = data["phases"]
+    print("🚀 Startup report")
+    if data["before_imports"] is not None:
+        print(f"  {'process start -> app imports':<32} {data['before_imports'] * 1000:8.1f} ms")
+    labels = (
+        ("imported", "app imported"),
+        ("lifespan_started", "lifespan started"),
+        ("ready", "ready (lifespan done)"),
+        ("first_request", "first request served"),
+    )
+    for phase, label in labels:
+        if phase in phases:
+            print(f"  {label:<32} {phases[phase] * 1000:8.1f} ms")
+    if data["imports_by_package"]:
+        print("  Import time by package (self time):")
+        for package, seconds in list(data["imports_by_package"].items())[:top]:
+            print(f"    {package:<30} {seconds * 1000:8.1f} ms")
+
+class StartupReportMiddleware:
+    """Marks the first HTTP request, then prints the startup report once"""
+
+    def __init__(self, app):
+        self.app = app
+        self.reported = False
+
+    async def __call__(self, scope, receive, send):
+        await self.app(scope, receive, send)
+        if not self.reported and scope["type"] == "http":
+            self.reported = True
+            mark("first_request")
+            if import_timer is not None:
+                import_timer.uninstall()
+            print_report()
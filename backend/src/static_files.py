@@ -0,0 +1,105 @@
+import mimetypes
+import os
+from typing import Dict, NamedTuple, Optional
+from fastapi import Request, Response
+from fastapi.responses import FileResponse
+from . import etag
+
+# Pre-built variants, in order of preference (see scripts/precompress_static.py)
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+# Vite fingerprints everything under assets/, so those files never change
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+class StaticVariant(NamedTuple):
+    path: str
+    stat: os.stat_result
+    etag: str
+
+class StaticFile(NamedTuple):
+    media_type: str
+    cache_control: str
+    # Keyed by content coding, "identity" for the file itself
+    variants: Dict[str, StaticVariant]
+
+def _variant(path: str) -> StaticVariant:
+    stat = os.stat(path)
+    return StaticVariant(path, stat, f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"')
+
+def accepted_encodings(header: Optional[str]) -> set:
+    """Codings accepted by an Accept-Encoding header (q=0 excluded)"""
+    accepted = set()
+    for part in (header or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        if coding:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+class StaticIndex:
+    """The built frontend, indexed once at startup.
+
+    Requests are answered from the index without touching the filesystem
+    (FileResponse is handed the stat result taken at startup), picking a
+    pre-compressed ``.br`` or ``.gz`` sibling when the client accepts it.
+    Unknown paths fall back to index.html for client-side routing, except
+    under assets/ where a missing file is a 404.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.files: Dict[str, StaticFile] = {}
+        for root, _, names in os.walk(directory):
+            for name in names:
+                path = os.path.join(root, name)
+                if any(name.endswith(suffix) for _, suffix in ENCODINGS) and os.path.exists(path.rsplit(".", 1)[0]):
+                    continue
+                relative = os.path.relpath(path, directory).replace(os.sep, "/")
+                variants = {"identity": _variant(path)}
+                for coding, suffix in ENCODINGS:
+                    if os.path.isfile(path + suffix):
+                        variants[coding] = _variant(path + suffix)
+                self.files[relative] = StaticFile(
+                    media_type=mimetypes.guess_type(name)[0] or "application/octet-stream",
+                    cache_control=IMMUTABLE if relative.startswith("assets/") else REVALIDATE,
+                    variants=variants,
+                )
+        self.index = self.files.get("index.html")
+
+    def lookup(self, path: str) -> Optional[StaticFile]:
+        static_file = self.files.get(path)
+        if static_file is None and not path.startswith("assets/"):
+            static_file = self.index
+        return static_file
+
+    def response(self, request: Request, path: str) -> Response:
+        static_file = self.lookup(path)
+        if static_file is None:
+            return Response(status_code=404)
+
+        coding = "identity"
+        if len(static_file.variants) > 1:
+            accepted = accepted_encodings(request.headers.get("accept-encoding"))
+            coding = next((c for c, _ in ENCODINGS if c in static_file.variants and c in accepted), "identity")
+        variant = static_file.variants[coding]
+
+        headers = {"Cache-Control": static_file.cache_control, "ETag": variant.etag}
+        if len(static_file.variants) > 1:
+            headers["Vary"] = "Accept-Encoding"
+        if coding != "identity":
+            headers["Content-Encoding"] = coding
+        if etag.matches(request, variant.etag):
+            return Response(status_code=304, headers=headers)
+        return FileResponse(
+            variant.path,
+            stat_result=variant.stat,
+            media_type=static_file.media_type,
+            headers=headers,
+        )
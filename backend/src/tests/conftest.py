@@ -1,21 +1,34 @@
+import os
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+# Tests sign tokens with a per-process key
+os.environ.setdefault("DEV_MODE", "true")
 
 from ..main import app
-from ..database import Base, get_db
+from ..database import Base, configure_sqlite, get_db
+from .. import crud, metrics
+from ..active_players import active_players
+from ..shared_state import shared_state
+from ..tokens import token_cache
 
 @pytest.fixture(scope="function")
-def db_engine():
-    """Create a fresh in-memory database engine for each test"""
-    from sqlalchemy.pool import StaticPool
-    
+def db_path(tmp_path):
+    """Fresh SQLite database file shared by the sync and async engines of a test"""
+    return tmp_path / "test.db"
+
+@pytest.fixture(scope="function")
+def db_engine(db_path):
+    """Create a fresh database engine for each test"""
     engine = create_engine(
-        "sqlite:///:memory:",
+        f"sqlite:///{db_path}",
         connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
     )
+    configure_sqlite(engine)
     # Ensure models are imported/registered
     from ..database import UserDB, LeaderboardEntryDB, ActivePlayerDB
     
@@ -35,15 +48,25 @@ def db_session(db_engine):
         db.close()
 
 @pytest.fixture(scope="function")
-def client(db_session):
+def client(db_session, db_path):
     """Create test client with overridden database dependency"""
-    def override_get_db():
-        try:
-            yield db_session
-        finally:
-            pass
+    # NullPool: TestClient runs the app on its own event loop, so connections
+    # must not outlive a request
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", poolclass=NullPool)
+    configure_sqlite(async_engine.sync_engine)
+    AsyncTestingSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_db():
+        async with AsyncTestingSessionLocal() as db:
+            yield db
     
     app.dependency_overrides[get_db] = override_get_db
+    crud.leaderboard_cache.clear()
+    crud.rank_index.clear()
+    active_players.clear()
+    shared_state.clear()
+    metrics.clear()
+    token_cache.clear()
     with TestClient(app) as c:
         yield c
     app.dependency_overrides.clear()
@@ -0,0 +1,174 @@
+import secrets
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from .config import settings
+from .models import User
+from .shared_state import Message, SharedState, shared_state
+
+ALGORITHM = "HS256"
+REVOCATIONS_CHANNEL = "revoked_tokens"
+
+if settings.SECRET_KEY:
+    SECRET_KEY = settings.SECRET_KEY
+else:
+    SECRET_KEY = secrets.token_urlsafe(32)
+    print("⚠️  SECRET_KEY is not set: access tokens are signed with a per-process key "
+          "and only this process accepts them")
+
+class TokenError(Exception):
+    """A missing, malformed, expired or revoked access token"""
+
+class SecretKeyError(Exception):
+    """SECRET_KEY is not set outside development"""
+
+def check_secret_key() -> None:
+    """Refuse to start without a SECRET_KEY, unless DEV_MODE is set"""
+    if settings.SECRET_KEY or settings.DEV_MODE:
+        return
+    raise SecretKeyError(
+        "SECRET_KEY is not set, so this worker would sign access tokens with its own key "
+        "and other workers or restarts would reject them: set the same SECRET_KEY for all "
+        "workers, or DEV_MODE=true for local development"
+    )
+
+class TokenClaims(NamedTuple):
+    user: User
+    # Unique token id, what revocation is keyed by
+    jti: str
+    expires_at: int
+
+def create_access_token(user: User, ttl: Optional[int] = None) -> str:
+    """Sign a token identifying ``user`` for ``ttl`` seconds (ACCESS_TOKEN_TTL by default)"""
+    # Imported on first use, keeping it out of worker boot
+    from jose import jwt
+
+    now = int(time.time())
+    claims = {
+        "sub": user.id,
+        "username": user.username,
+        "email": user.email,
+        "iat": now,
+        "exp": now + (settings.ACCESS_TOKEN_TTL if ttl is None else ttl),
+        "jti": uuid.uuid4().hex,
+    }
+    return jwt.encode(claims, SECRET_KEY, algorithm=ALGORITHM)
+
+class TokenCache:
+    """LRU of decoded access tokens, plus the ids of revoked ones.
+
+    A cached token was verified once: later lookups only compare its expiry
+    and check the revocation list, both in memory. Revocations are stored in
+    the revoked_tokens table (see ``load_revoked``) and shared with running
+    workers through ``shared_state``; all are kept until the token would
+    have expired anyway.
+    """
+
+    def __init__(self, max_size: int, shared_state: Optional[SharedState] = None):
+        self.max_size = max_size
+        self._tokens: "OrderedDict[str, TokenClaims]" = OrderedDict()
+        # jti -> expiry of revoked tokens
+        self._revoked: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        # None keeps revocations to this cache (benchmarks and tests)
+        self.shared_state = shared_state
+        if shared_state is not None:
+            shared_state.add_listener(REVOCATIONS_CHANNEL, self._on_message)
+
+    def decode(self, token: str) -> TokenClaims:
+        """Claims of a valid token; raises TokenError otherwise"""
+        claims = self._tokens.get(token)
+        if claims is None:
+            self.misses += 1
+            claims = self._verify(token)
+            if self.max_size > 0:
+                self._tokens[token] = claims
+                while len(self._tokens) > self.max_size:
+                    self._tokens.popitem(last=False)
+        else:
+            self.hits += 1
+            self._tokens.move_to_end(token)
+        if claims.expires_at <= time.time():
+            self._tokens.pop(token, None)
+            raise TokenError("Token has expired")
+        if claims.jti in self._revoked:
+            raise TokenError("Token has been revoked")
+        return claims
+
+    @staticmethod
+    def _verify(token: str) -> TokenClaims:
+        from jose import JWTError, jwt
+
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+            user = User(id=payload["sub"], username=payload["username"], email=payload["email"])
+            return TokenClaims(user, payload["jti"], int(payload["exp"]))
+        except (JWTError, KeyError, ValueError) as e:
+            raise TokenError(f"Invalid token: {e}")
+
+    def revoke(self, claims: TokenClaims) -> None:
+        """Reject the token from now on, in every running worker.
+
+        Store the revocation (crud.add_revoked_token) first, so workers
+        started later load it.
+        """
+        self._add_revoked(claims.jti, claims.expires_at)
+        if self.shared_state is not None:
+            self.shared_state.publish(REVOCATIONS_CHANNEL, {"jti": claims.jti, "exp": claims.expires_at})
+
+    def load_revoked(self, revoked: Iterable[Tuple[str, int]]) -> None:
+        """Add stored (jti, expires_at) revocations, e.g. when a worker starts"""
+        self._revoked.update(revoked)
+
+    def _add_revoked(self, jti: str, expires_at: int) -> None:
+        now = time.time()
+        # Expired tokens fail on their own, so drop them from the list
+        for revoked, expiry in list(self._revoked.items()):
+            if expiry <= now:
+                del self._revoked[revoked]
+        self._revoked[jti] = expires_at
+
+    def _on_message(self, message: Message) -> None:
+        if not message.local:
+            self._add_revoked(message.data["jti"], message.data["exp"])
+
+    def clear(self) -> None:
+        self._tokens.clear()
+        self._revoked.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        return {"size": len(self._tokens), "revoked": len(self._revoked), "hits": self.hits, "misses": self.misses}
+
+token_cache = TokenCache(max_size=settings.TOKEN_CACHE_SIZE, shared_state=shared_state)
+
+_bearer = HTTPBearer(auto_error=False)
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+async def bearer_token(credentials: Optional[HTTPAuthorizationCredentials] = Depends(_bearer)) -> Optional[str]:
+    """The request's bearer token, unchecked, or None without one"""
+    return credentials.credentials if credentials is not None else None
+
+async def current_claims(token: Optional[str] = Depends(bearer_token)) -> TokenClaims:
+    """Claims of the request's bearer token; 401 without a valid one"""
+    if token is None:
+        raise _unauthorized("Not authenticated")
+    try:
+        return token_cache.decode(token)
+    except TokenError as e:
+        raise _unauthorized(str(e))
+
+async def current_user(claims: TokenClaims = Depends(current_claims)) -> User:
+    """The authenticated user, read from the token without touching the database"""
+    return claims.user
@@ -0,0 +1,94 @@
+import asyncio
+import base64
+import binascii
+from typing import TYPE_CHECKING, NamedTuple, Optional
+from .config import settings
+from .models import GameMode, ScoreSubmit
+from .replay import ReplayError, ReplayReader, play_replay
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+class VerificationError(Exception):
+    """A submission that failed verification; ``detail`` is safe to return to the client"""
+
+    def __init__(self, detail: str, status_code: int = 422):
+        super().__init__(detail)
+        self.detail = detail
+        self.status_code = status_code
+
+class VerifiedGame(NamedTuple):
+    mode: GameMode
+    score: int
+    ticks: int
+
+def simulate(data: bytes, max_ticks: int) -> VerifiedGame:
+    """Re-run a replay and report its outcome (runs in a worker process)"""
+    game = play_replay(data, max_ticks)
+    return VerifiedGame(game.mode, game.score, game.ticks)
+
+# Simulation is pure Python and CPU bound, so it runs in worker processes.
+# Started lazily with "spawn" so the workers don't inherit the app's threads;
+# multiprocessing is only imported then, keeping it out of worker boot.
+_verify_executor: Optional["ProcessPoolExecutor"] = None
+
+def _executor() -> "ProcessPoolExecutor":
+    global _verify_executor
+    if _verify_executor is None:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        _verify_executor = ProcessPoolExecutor(
+            max_workers=settings.REPLAY_VERIFY_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _verify_executor
+
+def shutdown() -> None:
+    global _verify_executor
+    executor, _verify_executor = _verify_executor, None
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+def decode_replay(encoded: str) -> bytes:
+    """Decode a base64 replay and check its header"""
+    try:
+        data = base64.b64decode(encoded, validate=True)
+    except (binascii.Error, ValueError):
+        raise VerificationError("Replay is not valid base64", status_code=400)
+    if len(data) > settings.REPLAY_MAX_BYTES:
+        raise VerificationError(f"Replays are limited to {settings.REPLAY_MAX_BYTES} bytes", status_code=413)
+    try:
+        ReplayReader(data)
+    except ReplayError as e:
+        raise VerificationError(f"Invalid replay: {e}", status_code=400)
+    return data
+
+async def verify_replay_async(data: bytes) -> VerifiedGame:
+    """Simulate a replay on the verification pool"""
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(_executor(), simulate, data, settings.REPLAY_MAX_TICKS)
+    except ReplayError as e:
+        raise VerificationError(f"Invalid replay: {e}", status_code=400)
+
+async def verify_submission(score_in: ScoreSubmit) -> Optional[bytes]:
+    """Check a score against its replay according to SCORE_VERIFICATION.
+
+    Returns the decoded replay, or None when the submission has none. Raises
+    VerificationError when the replay is missing but required, malformed, or
+    doesn't produce the submitted mode and score.
+    """
+    if score_in.replay is None:
+        if settings.SCORE_VERIFICATION == "required":
+            raise VerificationError("A replay is required to submit a score")
+        return None
+    data = decode_replay(score_in.replay)
+    if settings.SCORE_VERIFICATION == "off":
+        return data
+
+    result = await verify_replay_async(data)
+    if result.mode != score_in.mode:
+        raise VerificationError("Replay mode does not match the submitted mode")
+    if result.score != score_in.score:
+        raise VerificationError(f"Submitted score {score_in.score} does not match the replay ({result.score})")
+    return data
@@ -1,54 +1,88 @@
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool
 
 import sys
 import os
 
 # Add backend directory to pythonpath so we can import src modules as a package
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+# Tests sign tokens with a per-process key
+os.environ.setdefault("DEV_MODE", "true")
 
-from src.database import Base, get_db
+from src.database import Base, configure_sqlite, get_db
+from src import crud, metrics
+from src.active_players import active_players
+from src.shared_state import shared_state
+from src.models import User
+from src.tokens import create_access_token, token_cache
 from src.main import app
 
-# Use in-memory SQLite database for tests
-SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
-
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
-)
-
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+@pytest.fixture(scope="function")
+def database_path(tmp_path):
+    """
+    SQLite database file for one test, shared by the sync and async engines.
+    """
+    return tmp_path / "test.db"
 
 @pytest.fixture(scope="function")
-def session():
+def session(database_path):
     """
     Create a fresh database for each test function.
     """
+    engine = create_engine(
+        f"sqlite:///{database_path}",
+        connect_args={"check_same_thread": False},
+    )
+    configure_sqlite(engine)
     Base.metadata.create_all(bind=engine)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
     db = TestingSessionLocal()
     try:
         yield db
     finally:
         db.close()
         Base.metadata.drop_all(bind=engine)
+        engine.dispose()
+
+@pytest.fixture(scope="function")
+def session_factory(session, database_path):
+    """
+    Async session factory bound to the test database, for code that opens its own sessions.
+
+    Uses NullPool so no connection outlives the event loop that opened it.
+    """
+    engine = create_async_engine(f"sqlite+aiosqlite:///{database_path}", poolclass=NullPool)
+    configure_sqlite(engine.sync_engine)
+    return async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
 
 @pytest.fixture(scope="function")
-def client(session):
+def client(session_factory):
     """
     Create a TestClient that uses the override_get_db dependency.
     """
-    def override_get_db():
-        try:
-            yield session
-        finally:
-            pass
+    async def override_get_db():
+        async with session_factory() as db:
+            yield db
 
     app.dependency_overrides[get_db] = override_get_db
+    crud.leaderboard_cache.clear()
+    crud.rank_index.clear()
+    active_players.clear()
+    shared_state.clear()
+    metrics.clear()
+    token_cache.clear()
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
+
+@pytest.fixture(scope="function")
+def auth_headers():
+    """Bearer headers for a username, signed without going through signup"""
+    def headers(username: str) -> dict:
+        user = User(id=f"user-{username}", username=username, email=f"{username}@example.com")
+        return {"Authorization": f"Bearer {create_access_token(user)}"}
+    return headers
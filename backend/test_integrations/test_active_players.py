@@ -0,0 +1,48 @@
+import asyncio
+
+from src.active_players import ActivePlayerRegistry
+from src.models import GameMode
+
+
+def make_registry(session_factory=None, ttl=30):
+    return ActivePlayerRegistry(ttl=ttl, sweep_interval=1, persist=False, session_factory=session_factory)
+
+
+def test_sweep_expires_only_stale_players():
+    registry = make_registry(ttl=30)
+    registry.heartbeat("a", "alice", 10, GameMode.WALLS, now=0)
+    registry.heartbeat("b", "bob", 20, GameMode.WALLS, now=10)
+    registry.heartbeat("c", "carol", 30, GameMode.WALLS, now=20)
+    # alice is still playing
+    registry.heartbeat("a", "alice", 40, GameMode.WALLS, now=25)
+
+    assert registry.sweep(now=45) == ["b"]
+    assert [p.id for p in registry.list()] == ["a", "c"]
+    assert registry.sweep(now=100) == ["c", "a"]
+    assert len(registry) == 0
+    assert registry.expired == 3
+
+
+def test_new_mode_starts_a_new_game():
+    registry = make_registry()
+    first = registry.heartbeat("a", "alice", 50, GameMode.WALLS)
+    again = registry.heartbeat("a", "alice", 60, GameMode.WALLS)
+    assert again.startedAt == first.startedAt
+    other = registry.heartbeat("a", "alice", 0, GameMode.PASS_THROUGH)
+    assert other.mode == GameMode.PASS_THROUGH
+    assert registry.list() == [other]
+
+
+def test_persistence_round_trip(session_factory):
+    async def run():
+        registry = make_registry(session_factory)
+        registry.heartbeat("a", "alice", 10, GameMode.WALLS)
+        registry.heartbeat("b", "bob", 20, GameMode.PASS_THROUGH)
+        await registry.save()
+
+        restored = make_registry(session_factory)
+        await restored.load()
+        return registry.list(), restored.list()
+
+    saved, restored = asyncio.run(run())
+    assert [(p.id, p.score, p.mode) for p in restored] == [(p.id, p.score, p.mode) for p in saved]
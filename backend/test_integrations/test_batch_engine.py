@@ -0,0 +1,58 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.batch_engine import DIRECTIONS, NO_TURN, BatchSimulator
+from src.game_engine import SnakeGame
+from src.models import GameMode
+
+
+def random_plan(ticks, n, seed=0):
+    rng = np.random.default_rng(seed)
+    plan = rng.integers(0, 4, size=(ticks, n), dtype=np.int8)
+    plan[rng.random((ticks, n)) < 0.7] = NO_TURN
+    return plan
+
+
+def test_matches_scalar_engine():
+    n, ticks = 200, 400
+    modes = [GameMode.WALLS if i % 2 else GameMode.PASS_THROUGH for i in range(n)]
+    plan = random_plan(ticks, n)
+    batch = BatchSimulator(n, modes=modes, seeds=range(n))
+    batch.run(ticks, plan)
+
+    for i in range(n):
+        game = SnakeGame(modes[i], seed=i)
+        game.run(None if code == NO_TURN else DIRECTIONS[code] for code in plan[:, i])
+        assert batch.state(i) == game.state()
+        assert batch.ticks[i] == game.ticks
+
+
+def test_crowded_board_food_matches_scalar_engine():
+    # With over three quarters of the board taken, food is the nth free cell
+    from collections import deque
+
+    n = 20
+    batch = BatchSimulator(n, seeds=range(n))
+    games = [SnakeGame(seed=i) for i in range(n)]
+    for i, game in enumerate(games):
+        taken = 320 + 3 * i
+        game.body = deque(range(taken))
+        game.occupied[:] = bytes(400)
+        game.occupied[:taken] = b"\x01" * taken
+        batch.occupied[i] = False
+        batch.occupied[i, :taken] = True
+        batch.length[i] = taken
+    batch._place_food(np.arange(n))
+
+    for i, game in enumerate(games):
+        assert batch.food[i] == game._place_food()
+        assert batch.food[i] >= len(game.body)
+
+
+def test_walls_end_games():
+    batch = BatchSimulator(3)
+    batch.food[:] = 0
+    batch.run(20)
+    assert not batch.alive.any()
+    assert (batch.ticks == 10).all()
@@ -0,0 +1,35 @@
+import asyncio
+
+from sqlalchemy import text
+
+from src.config import Settings
+
+
+def test_sqlite_connections_get_pragmas(session):
+    assert session.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+    # NORMAL == 1
+    assert session.execute(text("PRAGMA synchronous")).scalar() == 1
+    assert session.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+
+
+def test_async_connections_get_pragmas(session_factory):
+    async def read_pragmas():
+        async with session_factory() as db:
+            journal_mode = (await db.execute(text("PRAGMA journal_mode"))).scalar()
+            busy_timeout = (await db.execute(text("PRAGMA busy_timeout"))).scalar()
+            return journal_mode, busy_timeout
+
+    assert asyncio.run(read_pragmas()) == ("wal", 5000)
+
+
+def test_pool_options_only_for_server_databases():
+    settings = Settings()
+    settings.DATABASE_URL = "postgresql://user:pass@db/snake_social"
+    settings.DB_POOL_SIZE = 40
+    options = settings.engine_options
+    assert options["pool_size"] == 40
+    assert options["pool_pre_ping"] is True
+    assert {"max_overflow", "pool_timeout", "pool_recycle"} <= options.keys()
+
+    settings.DATABASE_URL = "sqlite:///./snake_social.db"
+    assert settings.engine_options == {}
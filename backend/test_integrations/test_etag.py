@@ -0,0 +1,93 @@
+import asyncio
+
+from src import crud, etag
+from src.models import GameMode
+from src.shared_state import SqliteSharedState
+
+
+def _submit(client, username, score, mode="walls"):
+    assert client.post("/api/leaderboard", json={"username": username, "score": score, "mode": mode}).status_code == 201
+
+
+def test_leaderboard_revalidation(client):
+    _submit(client, "p1", 10)
+    first = client.get("/api/leaderboard?mode=walls")
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "no-cache"
+
+    again = client.get("/api/leaderboard?mode=walls", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["etag"] == etag
+    # Weak comparison, and lists of tags
+    assert client.get("/api/leaderboard?mode=walls", headers={"If-None-Match": f'"x", W/{etag}'}).status_code == 304
+
+    # A score in the other mode leaves this mode's tag alone
+    _submit(client, "p2", 20, "pass-through")
+    assert client.get("/api/leaderboard?mode=walls", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/api/leaderboard").headers["etag"] != etag
+
+    _submit(client, "p3", 30)
+    changed = client.get("/api/leaderboard?mode=walls", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert [entry["username"] for entry in changed.json()] == ["p3", "p1"]
+
+
+def test_not_modified_skips_the_database(client, monkeypatch):
+    _submit(client, "p1", 10)
+    etag = client.get("/api/leaderboard?unbounded=true").headers["etag"]
+
+    async def fail(*args, **kwargs):
+        raise AssertionError("the database was queried")
+
+    monkeypatch.setattr(crud, "get_leaderboard_async", fail)
+    monkeypatch.setattr(crud, "get_leaderboard_rows_async", fail)
+    response = client.get("/api/leaderboard?unbounded=true", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+
+def test_active_players_revalidation(client, auth_headers):
+    headers = auth_headers("p1")
+    client.post("/api/games/heartbeat", json={"id": "g1", "username": "p1", "score": 0, "mode": "walls"}, headers=headers)
+    first = client.get("/api/games/active")
+    etag = first.headers["etag"]
+    assert client.get("/api/games/active", headers={"If-None-Match": etag}).status_code == 304
+
+    client.post("/api/games/heartbeat", json={"id": "g1", "username": "p1", "score": 5, "mode": "walls"}, headers=headers)
+    changed = client.get("/api/games/active", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()[0]["score"] == 5
+
+    etag = changed.headers["etag"]
+    assert client.delete("/api/games/g1", headers=headers).status_code == 204
+    assert client.get("/api/games/active", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_workers_sharing_state_issue_the_same_tags(tmp_path, monkeypatch):
+
+    async def run():
+        path = str(tmp_path / "shared.db")
+        a = SqliteSharedState(path, poll_interval=3600, message_ttl=60)
+        b = SqliteSharedState(path, poll_interval=3600, message_ttl=60)
+        await a.start()
+        await b.start()
+        try:
+            await check(a, b)
+        finally:
+            await a.stop()
+            await b.stop()
+
+    async def check(a, b):
+        monkeypatch.setattr(etag, "shared_state", a)
+        first = await etag.make_etag(*await etag.leaderboard_versions(None))
+        monkeypatch.setattr(etag, "shared_state", b)
+        assert await etag.make_etag(*await etag.leaderboard_versions(None)) == first
+
+        # A score stored by either worker changes the tag in both
+        await etag.bump_leaderboard([GameMode.WALLS])
+        changed = await etag.make_etag(*await etag.leaderboard_versions(None))
+        monkeypatch.setattr(etag, "shared_state", a)
+        assert await etag.make_etag(*await etag.leaderboard_versions(None)) == changed != first
+
+    asyncio.run(run())
@@ -0,0 +1,58 @@
+from datetime import date
+
+from src import crud
+from src.config import settings
+from src.models import GameMode
+
+
+def _fetch_all(client, monkeypatch, fast, urls):
+    monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", fast)
+    crud.leaderboard_cache.clear()
+    responses = []
+    for url in urls:
+        response = client.get(url)
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        responses.append(response.json())
+    return responses
+
+
+def test_fast_path_matches_the_model_path(client, auth_headers, monkeypatch):
+    for i in range(12):
+        client.post(
+            "/api/leaderboard",
+            json={"username": f"p{i}", "score": (i * 37) % 10 * 10, "mode": "walls" if i % 3 else "pass-through"},
+        )
+    for i in range(3):
+        client.post(
+            "/api/games/heartbeat",
+            json={"id": f"g{i}", "username": f"p{i}", "score": i * 5, "mode": "walls"},
+            headers=auth_headers(f"p{i}"),
+        )
+
+    first = client.get("/api/leaderboard?limit=5").json()
+    last = first[-1]
+    urls = [
+        "/api/leaderboard?limit=5",
+        # Served from the page cache the first request filled
+        "/api/leaderboard?limit=5",
+        "/api/leaderboard?mode=walls&limit=3",
+        f"/api/leaderboard?limit=5&after_score={last['score']}&after_id={last['id']}",
+        "/api/leaderboard?unbounded=true",
+        "/api/games/active",
+        "/api/games/active?limit=2",
+    ]
+    slow = _fetch_all(client, monkeypatch, False, urls)
+    fast = _fetch_all(client, monkeypatch, True, urls)
+    assert fast == slow
+    assert len(fast[4]) == 12
+    assert len(fast[5]) == 3
+
+
+def test_rows_match_entries(session):
+    for i in range(5):
+        crud.add_score(session, f"id{i}", f"p{i}", i * 10, GameMode.WALLS, date(2026, 1, 1))
+    rows = crud.get_leaderboard_rows(session, limit=3)
+    entries = [crud.leaderboard_entry_from_db(e) for e in crud.get_leaderboard(session, limit=3)]
+    assert [row["id"] for row in rows] == [entry.id for entry in entries]
+    assert rows[0]["mode"] == "walls"
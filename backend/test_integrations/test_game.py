@@ -1,42 +1,25 @@
-import pytest
-from datetime import datetime, UTC
-from src.database import ActivePlayerDB
-
 def test_get_active_players_empty(client):
     response = client.get("/api/games/active")
     assert response.status_code == 200
     assert response.json() == []
 
-def test_get_active_players_with_data(client, session):
-    # Manually add an active player to the test session
-    player = ActivePlayerDB(
-        id="test-player-id",
-        username="player1",
-        score=10,
-        mode="walls",
-        startedAt=datetime.now(UTC)
-    )
-    session.add(player)
-    session.commit()
-    
+def test_get_active_players_with_data(client, auth_headers):
+    response = client.post("/api/games/heartbeat", json={
+        "id": "test-player-id", "username": "player1", "score": 10, "mode": "walls"
+    }, headers=auth_headers("player1"))
+    assert response.status_code == 200
+
     response = client.get("/api/games/active")
     assert response.status_code == 200
     data = response.json()
     assert len(data) == 1
     assert data[0]["username"] == "player1"
-    # Route adds a random offset to score
-    assert data[0]["score"] >= 10
-
-def test_get_player_game_state(client, session):
-    player = ActivePlayerDB(
-        id="state-player-id",
-        username="player2",
-        score=25,
-        mode="pass-through",
-        startedAt=datetime.now(UTC)
-    )
-    session.add(player)
-    session.commit()
+    assert data[0]["score"] == 10
+
+def test_get_player_game_state(client, auth_headers):
+    client.post("/api/games/heartbeat", json={
+        "id": "state-player-id", "username": "player2", "score": 25, "mode": "pass-through"
+    }, headers=auth_headers("player2"))
     
     response = client.get("/api/games/state-player-id")
     assert response.status_code == 200
@@ -48,3 +31,37 @@ def test_get_player_game_state(client, session):
 def test_get_player_game_state_not_found(client):
     response = client.get("/api/games/non-existent")
     assert response.status_code == 404
+
+def test_active_players_ordered_by_score(client, auth_headers):
+    for player_id, score in [("a", 30), ("b", 90), ("c", 60)]:
+        client.post("/api/games/heartbeat", json={
+            "id": player_id, "username": player_id, "score": score, "mode": "walls"
+        }, headers=auth_headers(player_id))
+    # A heartbeat updates the running score
+    client.post("/api/games/heartbeat", json={"id": "a", "username": "a", "score": 120, "mode": "walls"}, headers=auth_headers("a"))
+
+    response = client.get("/api/games/active")
+    assert [p["id"] for p in response.json()] == ["a", "b", "c"]
+    response = client.get("/api/games/active", params={"limit": 2})
+    assert [p["score"] for p in response.json()] == [120, 90]
+
+def test_end_game(client, auth_headers):
+    headers = auth_headers("gone")
+    client.post("/api/games/heartbeat", json={"id": "gone", "username": "gone", "score": 5, "mode": "walls"}, headers=headers)
+    assert client.delete("/api/games/gone", headers=headers).status_code == 204
+    assert client.get("/api/games/gone").status_code == 404
+    assert client.delete("/api/games/gone", headers=headers).status_code == 404
+
+def test_games_are_changed_only_by_their_player(client, auth_headers):
+    beat = {"id": "g1", "username": "viper", "score": 5, "mode": "walls"}
+    assert client.post("/api/games/heartbeat", json=beat).status_code == 401
+    assert client.delete("/api/games/g1").status_code == 401
+
+    viper, mallory = auth_headers("viper"), auth_headers("mallory")
+    assert client.post("/api/games/heartbeat", json=beat, headers=viper).status_code == 200
+    # Nobody else can report on the game, take it over or end it
+    assert client.post("/api/games/heartbeat", json={**beat, "score": 0}, headers=mallory).status_code == 403
+    assert client.post("/api/games/heartbeat", json={**beat, "username": "mallory"}, headers=mallory).status_code == 403
+    assert client.delete("/api/games/g1", headers=mallory).status_code == 403
+    assert client.get("/api/games/active").json()[0]["score"] == 5
+    assert client.delete("/api/games/g1", headers=viper).status_code == 204
@@ -0,0 +1,104 @@
+import random
+
+from src.game_engine import ATE, DIED, GRID_SIZE, MOVED, Rng, SnakeGame
+from src.models import Direction, GameMode
+
+DIRECTIONS = list(Direction)
+
+
+def move_snake(snake, direction, mode, food):
+    """Straight port of moveSnake from frontend/src/hooks/useSnakeGame.ts"""
+    x, y = snake[0]
+    dx, dy = {"UP": (0, -1), "DOWN": (0, 1), "LEFT": (-1, 0), "RIGHT": (1, 0)}[direction.value]
+    x, y = x + dx, y + dy
+    if mode == GameMode.WALLS:
+        if x < 0 or x >= GRID_SIZE or y < 0 or y >= GRID_SIZE:
+            return snake, False, True
+    else:
+        x, y = x % GRID_SIZE, y % GRID_SIZE
+    ate = (x, y) == food
+    body = snake if ate else snake[:-1]
+    if (x, y) in body:
+        return snake, False, True
+    return [(x, y)] + body, ate, False
+
+
+def coords(game):
+    return [(p.x, p.y) for p in game.positions()]
+
+
+def test_initial_state():
+    game = SnakeGame(seed=1)
+    state = game.state()
+    assert [(p.x, p.y) for p in state.snake] == [(10, 10), (9, 10), (8, 10)]
+    assert state.direction == Direction.RIGHT
+    assert state.score == 0 and not state.gameOver
+    assert (state.food.x, state.food.y) not in coords(game)
+
+
+def test_walls_kill_and_pass_through_wraps():
+    walls = SnakeGame(GameMode.WALLS, seed=3)
+    walls.food = None
+    results = [walls.tick() for _ in range(10)]
+    assert results[:9] == [MOVED] * 9
+    assert results[9] == DIED and walls.game_over
+
+    wrap = SnakeGame(GameMode.PASS_THROUGH, seed=3)
+    wrap.food = None
+    for _ in range(10):
+        assert wrap.tick() == MOVED
+    assert coords(wrap)[0] == (0, 10)
+
+
+def test_reverse_direction_is_ignored():
+    game = SnakeGame(seed=1)
+    game.change_direction(Direction.LEFT)
+    assert game.direction == Direction.RIGHT
+    game.change_direction(Direction.UP)
+    assert game.direction == Direction.UP
+
+
+def test_eating_grows_and_scores():
+    game = SnakeGame(seed=1)
+    game.food = 10 * GRID_SIZE + 11
+    assert game.tick() == ATE
+    assert game.score == 10
+    assert len(game.body) == 4
+    assert game.food is not None and not game.occupied[game.food]
+
+
+def test_moving_into_the_vacating_tail_is_allowed():
+    game = SnakeGame(GameMode.PASS_THROUGH, seed=1)
+    game.food = None
+    # Tight square: the head follows the tail around
+    for direction in [Direction.DOWN, Direction.LEFT, Direction.UP]:
+        game.change_direction(direction)
+        assert game.tick() == MOVED
+
+
+def test_rng_is_mulberry32():
+    # First outputs of mulberry32(42) as produced by the JavaScript reference
+    rng = Rng(42)
+    assert [rng.next_uint32() for _ in range(3)] == [2581720956, 1925393290, 3661312704]
+
+
+def test_matches_frontend_rules_on_random_games():
+    rng = random.Random(7)
+    for mode in GameMode:
+        for seed in range(50):
+            game = SnakeGame(mode, seed=seed)
+            snake = coords(game)
+            direction = game.direction
+            while not game.game_over and game.ticks < 500:
+                if rng.random() < 0.3:
+                    turn = rng.choice(DIRECTIONS)
+                    game.change_direction(turn)
+                    if {turn, direction} not in ({Direction.UP, Direction.DOWN}, {Direction.LEFT, Direction.RIGHT}):
+                        direction = turn
+                food = (game.food % GRID_SIZE, game.food // GRID_SIZE)
+                expected, ate, dead = move_snake(snake, direction, mode, food)
+                result = game.tick()
+                assert result == (DIED if dead else ATE if ate else MOVED)
+                if not dead:
+                    snake = expected
+                    assert coords(game) == snake
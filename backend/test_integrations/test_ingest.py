@@ -0,0 +1,147 @@
+import asyncio
+from datetime import date
+
+from fastapi.testclient import TestClient
+
+from src.config import settings
+from src.database import LeaderboardEntryDB
+from src.ingest import ScoreIngestQueue, QueueFull, ingest_queue
+from src.main import app
+from src.models import GameMode, LeaderboardEntry
+
+def make_entry(i, score=10):
+    return LeaderboardEntry(
+        id=f"entry-{i}",
+        username=f"player{i}",
+        score=score,
+        mode=GameMode.WALLS,
+        date=date.today(),
+    )
+
+def test_queue_group_commits_and_drains(session, session_factory):
+    queue = ScoreIngestQueue(
+        session_factory=session_factory,
+        batch_size=10,
+        flush_interval_ms=5_000,
+        max_queue=100,
+        enqueue_timeout=1.0,
+    )
+
+    async def run():
+        await queue.start()
+        for i in range(25):
+            await queue.submit(make_entry(i))
+        # Two full batches go out immediately, the rest on shutdown
+        await queue.stop()
+
+    asyncio.run(run())
+    stats = queue.stats()
+    assert stats["flushed_entries"] == 25
+    assert stats["flushed_batches"] == 3
+    assert stats["failed_entries"] == 0
+    assert stats["depth"] == 0
+    assert session.query(LeaderboardEntryDB).count() == 25
+
+def test_queue_backpressure(session_factory):
+    queue = ScoreIngestQueue(
+        session_factory=session_factory,
+        batch_size=10,
+        flush_interval_ms=5_000,
+        max_queue=2,
+        enqueue_timeout=0.01,
+    )
+
+    async def run():
+        # Not started: nothing consumes, so the third put times out
+        queue._queue = asyncio.Queue(maxsize=queue.max_queue)
+        await queue.submit(make_entry(0))
+        await queue.submit(make_entry(1))
+        try:
+            await queue.submit(make_entry(2))
+        except QueueFull:
+            return True
+        return False
+
+    assert asyncio.run(run())
+
+def test_submit_score_queue_mode(session, session_factory, monkeypatch):
+    monkeypatch.setattr(settings, "SCORE_INGEST_MODE", "queue")
+    monkeypatch.setattr(ingest_queue, "session_factory", session_factory)
+    with TestClient(app) as client:
+        response = client.post(
+            "/api/leaderboard",
+            json={"username": "queued", "score": 42, "mode": "walls"}
+        )
+        assert response.status_code == 202
+        assert response.json()["rank"] is None
+        assert client.get("/api/leaderboard/ingest").json()["running"] is True
+    # Shutdown drained the queue
+    assert session.query(LeaderboardEntryDB).filter_by(username="queued").count() == 1
+
+def _failing_factory(session_factory, failures):
+    """Session factory whose first ``failures`` sessions fail to commit"""
+    calls = {"n": 0}
+
+    def fail_commit():
+        raise RuntimeError("database is locked")
+
+    def factory():
+        calls["n"] += 1
+        session = session_factory()
+        if calls["n"] <= failures:
+            # crud commits through the AsyncSession's sync session
+            session.sync_session.commit = fail_commit
+        return session
+
+    return factory
+
+def test_failed_commits_are_retried(session, session_factory):
+    queue = ScoreIngestQueue(
+        session_factory=_failing_factory(session_factory, failures=2),
+        batch_size=10,
+        flush_interval_ms=5_000,
+        max_queue=100,
+        enqueue_timeout=1.0,
+        max_retries=3,
+        retry_backoff_ms=1,
+    )
+
+    async def run():
+        await queue.start()
+        for i in range(5):
+            await queue.submit(make_entry(i))
+        await queue.stop()
+
+    asyncio.run(run())
+    stats = queue.stats()
+    assert stats["retried_batches"] == 2
+    assert stats["flushed_entries"] == 5
+    assert stats["failed_entries"] == 0
+    assert session.query(LeaderboardEntryDB).count() == 5
+
+def test_unsaved_scores_are_dead_lettered(session, session_factory, tmp_path):
+    dead_letters = tmp_path / "dead.jsonl"
+    queue = ScoreIngestQueue(
+        session_factory=_failing_factory(session_factory, failures=100),
+        batch_size=10,
+        flush_interval_ms=5_000,
+        max_queue=100,
+        enqueue_timeout=1.0,
+        max_retries=2,
+        retry_backoff_ms=1,
+        dead_letter_path=str(dead_letters),
+    )
+
+    async def run():
+        await queue.start()
+        for i in range(3):
+            await queue.submit(make_entry(i))
+        await queue.stop()
+
+    asyncio.run(run())
+    stats = queue.stats()
+    assert stats["retried_batches"] == 2
+    assert stats["failed_entries"] == 3
+    assert session.query(LeaderboardEntryDB).count() == 0
+    saved = [LeaderboardEntry.model_validate_json(line) for line in dead_letters.read_text().splitlines()]
+    assert saved == [make_entry(i) for i in range(3)]
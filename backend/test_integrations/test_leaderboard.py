@@ -1,3 +1,13 @@
+import asyncio
+import time
+from datetime import date
+
+from sqlalchemy import func
+
+from src import crud
+from src.database import BestScoreDB, GameModeEnum
+from src.models import GameMode, LeaderboardEntry
+
 def test_submit_score(client):
     response = client.post(
         "/api/leaderboard",
@@ -43,3 +53,256 @@ def test_get_leaderboard(client):
     # Check ordering if implemented (usually high score first)
     # The current implementation in routes/leaderboard.py just calls crud.get_leaderboard
     # We'd expect crud to order them, but let's just check existence for now.
+
+def test_get_leaderboard_ordering_and_limit(client):
+    for username, score in [("a", 10), ("b", 30), ("c", 20), ("d", 40)]:
+        client.post(
+            "/api/leaderboard",
+            json={"username": username, "score": score, "mode": "walls"}
+        )
+
+    response = client.get("/api/leaderboard?mode=walls&limit=2")
+    assert response.status_code == 200
+    data = response.json()
+    assert [entry["score"] for entry in data] == [40, 30]
+
+def test_get_leaderboard_keyset_pagination(client):
+    for i in range(5):
+        client.post(
+            "/api/leaderboard",
+            json={"username": f"p{i}", "score": 100, "mode": "walls"}
+        )
+    client.post(
+        "/api/leaderboard",
+        json={"username": "low", "score": 5, "mode": "walls"}
+    )
+
+    seen = []
+    params = {"mode": "walls", "limit": 2}
+    while True:
+        page = client.get("/api/leaderboard", params=params).json()
+        if not page:
+            break
+        seen.extend(page)
+        params["after_score"] = page[-1]["score"]
+        params["after_id"] = page[-1]["id"]
+
+    assert len(seen) == 6
+    assert len({entry["id"] for entry in seen}) == 6
+    assert seen[-1]["username"] == "low"
+
+def test_get_leaderboard_cursor_requires_both_parts(client):
+    response = client.get("/api/leaderboard?after_score=10")
+    assert response.status_code == 400
+
+def test_get_leaderboard_unbounded_opt_in(client):
+    for i in range(3):
+        client.post(
+            "/api/leaderboard",
+            json={"username": f"u{i}", "score": i, "mode": "walls"}
+        )
+
+    assert len(client.get("/api/leaderboard?limit=1").json()) == 1
+    assert len(client.get("/api/leaderboard?limit=1&unbounded=true").json()) == 3
+
+def test_leaderboard_cache_hit(client):
+    client.post(
+        "/api/leaderboard",
+        json={"username": "cached", "score": 10, "mode": "walls"}
+    )
+    first = client.get("/api/leaderboard?mode=walls").json()
+    second = client.get("/api/leaderboard?mode=walls").json()
+    assert first == second
+    stats = crud.leaderboard_cache.stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 1
+
+def test_leaderboard_cache_write_through(client):
+    for username, score in [("a", 30), ("b", 20)]:
+        client.post(
+            "/api/leaderboard",
+            json={"username": username, "score": score, "mode": "walls"}
+        )
+    assert [e["score"] for e in client.get("/api/leaderboard?mode=walls&limit=2").json()] == [30, 20]
+
+    # Qualifying score is pushed into the cached page
+    client.post(
+        "/api/leaderboard",
+        json={"username": "c", "score": 25, "mode": "walls"}
+    )
+    # Non-qualifying and other-mode scores leave it untouched
+    client.post(
+        "/api/leaderboard",
+        json={"username": "d", "score": 1, "mode": "walls"}
+    )
+    client.post(
+        "/api/leaderboard",
+        json={"username": "e", "score": 99, "mode": "pass-through"}
+    )
+    assert [e["score"] for e in client.get("/api/leaderboard?mode=walls&limit=2").json()] == [30, 25]
+    assert [e["score"] for e in client.get("/api/leaderboard?limit=2").json()] == [99, 30]
+    assert crud.leaderboard_cache.stats()["hits"] == 1
+
+def test_best_scores_one_row_per_player(client):
+    for username, score, mode in [
+        ("grinder", 10, "walls"),
+        ("grinder", 50, "walls"),
+        ("grinder", 20, "walls"),
+        ("casual", 30, "walls"),
+        ("grinder", 70, "pass-through"),
+    ]:
+        client.post(
+            "/api/leaderboard",
+            json={"username": username, "score": score, "mode": mode}
+        )
+
+    response = client.get("/api/leaderboard/best?mode=walls")
+    assert response.status_code == 200
+    data = response.json()
+    assert [(e["username"], e["score"]) for e in data] == [("grinder", 50), ("casual", 30)]
+
+    data = client.get("/api/leaderboard/best").json()
+    assert [(e["username"], e["mode"]) for e in data] == [
+        ("grinder", "pass-through"),
+        ("grinder", "walls"),
+        ("casual", "walls"),
+    ]
+
+def test_best_scores_pagination(client):
+    for i in range(3):
+        client.post(
+            "/api/leaderboard",
+            json={"username": f"p{i}", "score": 10, "mode": "walls"}
+        )
+
+    first = client.get("/api/leaderboard/best?limit=2").json()
+    assert [e["username"] for e in first] == ["p0", "p1"]
+    rest = client.get(
+        "/api/leaderboard/best",
+        params={"limit": 2, "after_score": 10, "after_username": "p1"},
+    ).json()
+    assert [e["username"] for e in rest] == ["p2"]
+
+def test_player_rank(client):
+    for username, score in [("a", 10), ("b", 30), ("b", 5), ("c", 20)]:
+        client.post(
+            "/api/leaderboard",
+            json={"username": username, "score": score, "mode": "walls"}
+        )
+
+    response = client.get("/api/leaderboard/rank?username=c&mode=walls")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["score"] == 20
+    assert data["rank"] == 2
+    assert data["total"] == 3
+
+    # Index is kept current by later submissions
+    client.post(
+        "/api/leaderboard",
+        json={"username": "a", "score": 50, "mode": "walls"}
+    )
+    data = client.get("/api/leaderboard/rank?username=c&mode=walls").json()
+    assert data["rank"] == 3
+    assert data["total"] == 3
+
+def test_rank_index_builds_in_background(client, session):
+    for username, score in [("a", 10), ("b", 30), ("c", 20)]:
+        client.post("/api/leaderboard", json={"username": username, "score": score, "mode": "walls"})
+
+    # Answered from SQL until the index is built
+    crud.rank_index.clear()
+    assert crud.rank_index.rank(session, GameMode.WALLS, 20) == (2, 3)
+    assert not crud.rank_index.is_loaded(GameMode.WALLS)
+
+    # The first rank request starts the build
+    data = client.get("/api/leaderboard/rank?username=c&mode=walls").json()
+    assert (data["rank"], data["total"]) == (2, 3)
+
+    deadline = time.monotonic() + 5
+    while not crud.rank_index.is_loaded(GameMode.WALLS):
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    data = client.get("/api/leaderboard/rank?username=c&mode=walls").json()
+    assert (data["rank"], data["total"]) == (2, 3)
+
+    client.post("/api/leaderboard", json={"username": "d", "score": 40, "mode": "walls"})
+    data = client.get("/api/leaderboard/rank?username=c&mode=walls").json()
+    assert (data["rank"], data["total"]) == (3, 4)
+
+def test_rank_index_counts_writes_made_while_building(session, session_factory, monkeypatch):
+    crud.rank_index.clear()
+    monkeypatch.setattr(crud.rank_index, "LOAD_CHUNK_SIZE", 1)
+
+    def entry(id, username, score):
+        return LeaderboardEntry(id=id, username=username, score=score, mode=GameMode.WALLS, date=date.today())
+
+    async def scenario():
+        async with session_factory() as db:
+            await crud.add_scores_async(db, [entry(f"seed{i}", f"p{i}", i) for i in range(300)])
+            bind = db.bind
+        crud.rank_index.load_in_background(bind, GameMode.WALLS)
+        during_build = 0
+        for i in range(40):
+            async with session_factory() as db:
+                # Raise an existing player's best and add a new player
+                await crud.add_scores_async(db, [entry(f"up{i}", f"p{i}", 1000 + i), entry(f"new{i}", f"n{i}", 5 * i)])
+            during_build += not crud.rank_index.is_loaded(GameMode.WALLS)
+        deadline = time.monotonic() + 5
+        while not crud.rank_index.is_loaded(GameMode.WALLS):
+            assert time.monotonic() < deadline
+            await asyncio.sleep(0.01)
+        return during_build
+
+    assert asyncio.run(scenario()) > 0
+    for score in (0, 7, 150, 299, 1000, 1039):
+        in_mode = BestScoreDB.mode == GameModeEnum.WALLS
+        greater = session.query(func.count()).select_from(BestScoreDB).filter(in_mode, BestScoreDB.score > score).scalar()
+        total = session.query(func.count()).select_from(BestScoreDB).filter(in_mode).scalar()
+        assert crud.rank_index.rank(session, GameMode.WALLS, score) == (greater + 1, total)
+
+def test_player_rank_not_found(client):
+    response = client.get("/api/leaderboard/rank?username=nobody&mode=walls")
+    assert response.status_code == 404
+
+def test_submit_score_returns_rank(client):
+    client.post(
+        "/api/leaderboard",
+        json={"username": "first", "score": 100, "mode": "walls"}
+    )
+    response = client.post(
+        "/api/leaderboard",
+        json={"username": "second", "score": 50, "mode": "walls"}
+    )
+    data = response.json()
+    assert data["rank"] == 2
+    assert data["percentile"] == 50.0
+
+def test_submit_scores_batch(client):
+    response = client.post(
+        "/api/leaderboard/batch",
+        json=[
+            {"username": "b1", "score": 40, "mode": "walls"},
+            {"username": "b2", "score": "not a number", "mode": "walls"},
+            {"username": "b1", "score": 70, "mode": "walls"},
+            {"username": "b3", "score": 10, "mode": "unknown"},
+            "garbage",
+        ]
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [e["score"] for e in data["created"]] == [40, 70]
+    assert [e["index"] for e in data["errors"]] == [1, 3, 4]
+    assert "score" in data["errors"][0]["detail"]
+
+    scores = [e["score"] for e in client.get("/api/leaderboard?mode=walls").json()]
+    assert scores == [70, 40]
+    best = client.get("/api/leaderboard/best?mode=walls").json()
+    assert [(e["username"], e["score"]) for e in best] == [("b1", 70)]
+    assert client.get("/api/leaderboard/rank?username=b1&mode=walls").json()["rank"] == 1
+
+def test_submit_scores_batch_too_large(client):
+    from src.config import settings
+    items = [{"username": "x", "score": 1, "mode": "walls"}] * (settings.SCORE_BATCH_MAX_SIZE + 1)
+    response = client.post("/api/leaderboard/batch", json=items)
+    assert response.status_code == 413
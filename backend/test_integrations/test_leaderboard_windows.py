@@ -0,0 +1,90 @@
+from datetime import date, timedelta
+
+from src import crud
+from src.config import settings
+from src.database import GameModeEnum, LeaderboardWindowDB
+from src.models import LeaderboardWindow
+
+# A Wednesday
+TODAY = date(2026, 10, 14)
+
+
+def _row(entry_id, score, day, mode=GameModeEnum.WALLS, username="p1"):
+    return dict(id=entry_id, username=username, score=score, mode=mode, date=day)
+
+
+def _ids(session, window, today=TODAY, **kwargs):
+    return [row["id"] for row in crud.get_window_leaderboard_rows(session, window, today=today, **kwargs)]
+
+
+def test_window_start():
+    assert crud.window_start(LeaderboardWindow.DAY, TODAY) == TODAY
+    assert crud.window_start(LeaderboardWindow.WEEK, TODAY) == date(2026, 10, 12)
+    assert crud.window_start(LeaderboardWindow.WEEK, date(2026, 10, 12)) == date(2026, 10, 12)
+
+
+def test_rows_land_in_current_windows_only(session):
+    crud.add_window_rows(session, [
+        _row("today", 10, TODAY),
+        _row("monday", 30, date(2026, 10, 12)),
+        _row("last-week", 50, date(2026, 10, 11)),
+    ], today=TODAY)
+    session.commit()
+
+    assert _ids(session, LeaderboardWindow.DAY) == ["today"]
+    assert _ids(session, LeaderboardWindow.WEEK) == ["monday", "today"]
+    assert session.query(LeaderboardWindowDB).filter_by(id="last-week").count() == 0
+
+
+def test_window_pagination_and_mode(session):
+    crud.add_window_rows(session, [
+        _row("a", 30, TODAY),
+        _row("b", 20, TODAY, GameModeEnum.PASS_THROUGH),
+        _row("c", 20, TODAY),
+        _row("d", 10, TODAY),
+    ], today=TODAY)
+    session.commit()
+
+    assert _ids(session, LeaderboardWindow.DAY, limit=2) == ["a", "b"]
+    assert _ids(session, LeaderboardWindow.DAY, after_score=20, after_id="b") == ["c", "d"]
+    assert _ids(session, LeaderboardWindow.DAY, mode=GameModeEnum.PASS_THROUGH) == ["b"]
+
+
+def test_roll_over_drops_ended_periods(session):
+    crud.add_window_rows(session, [_row("wednesday", 10, TODAY)], today=TODAY)
+    session.commit()
+
+    thursday = TODAY + timedelta(days=1)
+    crud.add_window_rows(session, [_row("thursday", 5, thursday)], today=thursday)
+    session.commit()
+    assert _ids(session, LeaderboardWindow.DAY, today=thursday) == ["thursday"]
+    assert _ids(session, LeaderboardWindow.WEEK, today=thursday) == ["wednesday", "thursday"]
+    assert session.query(LeaderboardWindowDB).filter_by(period="day").count() == 1
+
+    next_monday = date(2026, 10, 19)
+    crud.add_window_rows(session, [], today=next_monday)
+    session.commit()
+    assert _ids(session, LeaderboardWindow.WEEK, today=next_monday) == []
+    assert session.query(LeaderboardWindowDB).count() == 0
+
+
+def test_window_endpoint(client, monkeypatch):
+    for username, score, mode in (("p1", 10, "walls"), ("p2", 30, "walls"), ("p3", 20, "pass-through")):
+        assert client.post("/api/leaderboard", json={"username": username, "score": score, "mode": mode}).status_code == 201
+    assert client.post("/api/leaderboard/batch", json=[{"username": "p4", "score": 40, "mode": "walls"}]).status_code == 200
+
+    for window in ("day", "week"):
+        response = client.get(f"/api/leaderboard?window={window}")
+        assert response.status_code == 200
+        assert [entry["username"] for entry in response.json()] == ["p4", "p2", "p3", "p1"]
+        walls = client.get(f"/api/leaderboard?window={window}&mode=walls&limit=2").json()
+        assert [entry["username"] for entry in walls] == ["p4", "p2"]
+        assert walls[0]["date"] == date.today().isoformat()
+
+    assert client.get("/api/leaderboard?window=day").headers["etag"] != client.get("/api/leaderboard").headers["etag"]
+    assert client.get("/api/leaderboard?window=month").status_code == 422
+
+    monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", True)
+    fast = client.get("/api/leaderboard?window=week&limit=1")
+    assert fast.json()[0]["username"] == "p4"
+    assert fast.json()[0]["mode"] == "walls"
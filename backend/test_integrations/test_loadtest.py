@@ -0,0 +1,34 @@
+import json
+import os
+import subprocess
+import sys
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = os.path.join(BACKEND, "scripts", "loadtest.py")
+
+
+def _run(*args):
+    env = {**os.environ, "BCRYPT_ROUNDS": "4"}
+    return subprocess.run([sys.executable, SCRIPT, *args], env=env, capture_output=True, text=True, check=True)
+
+
+def test_in_process_run_writes_json(tmp_path):
+    output = tmp_path / "run.json"
+    _run("--users", "10", "--duration", "1", "--ramp-up", "0.2", "--think-time", "0.02",
+         "--accounts", "2", "--scores", "100", "--output", str(output))
+    result = json.loads(output.read_text())
+
+    assert result["target"] == "asgi"
+    assert result["users"] == 10
+    assert "GET /api/games/active" in result["routes"]
+    assert "GET /api/leaderboard (walls)" in result["routes"]
+    assert result["total"]["errors"] == 0
+    assert result["total"]["requests"] == sum(route["requests"] for route in result["routes"].values())
+    latency = result["total"]["latency_ms"]
+    assert latency["p50"] <= latency["p95"] <= latency["p99"] <= latency["max"]
+
+    # Compare a second run against the first
+    compared = _run("--users", "5", "--duration", "0.5", "--ramp-up", "0", "--think-time", "0.02",
+                    "--accounts", "1", "--scores", "0", "--mix", "leaderboard=1", "--baseline", str(output))
+    assert "Change against" in compared.stdout
+    assert "POST /api/leaderboard " not in compared.stdout
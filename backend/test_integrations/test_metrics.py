@@ -0,0 +1,70 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from src import metrics
+
+
+def _submit(client, username, score, mode="walls"):
+    assert client.post("/api/leaderboard", json={"username": username, "score": score, "mode": mode}).status_code == 201
+
+
+def test_requests_are_timed_by_route_template(client):
+    _submit(client, "p1", 10)
+    client.get("/api/leaderboard?mode=walls")
+    client.get("/api/leaderboard/12345/replay")
+    client.get("/api/leaderboard/67890/replay")
+
+    assert metrics.request_duration.count(("POST", "/api/leaderboard", "201")) == 1
+    assert metrics.request_duration.count(("GET", "/api/leaderboard", "200")) == 1
+    # Both ids land in one series
+    assert metrics.request_duration.count(("GET", "/api/leaderboard/{entry_id}/replay", "404")) == 2
+
+
+def test_queries_are_counted_per_request(client, session_factory):
+    metrics.instrument_engine(session_factory.kw["bind"].sync_engine)
+    _submit(client, "p1", 10)
+    client.get("/api/leaderboard?mode=walls&unbounded=true")
+
+    assert metrics.db_queries.value(("/api/leaderboard",)) >= 2
+    assert metrics.request_db_time.count(("/api/leaderboard",)) >= 1
+    assert metrics.db_query_time.value(()) > 0
+    assert metrics.pool_wait._series
+
+
+def test_metrics_endpoint(client):
+    _submit(client, "p1", 10)
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+
+    body = response.text
+    assert "# TYPE snake_http_request_duration_seconds histogram" in body
+    assert 'snake_http_request_duration_seconds_bucket{method="POST",route="/api/leaderboard",status="201",le="+Inf"} 1' in body
+    assert 'snake_http_request_duration_seconds_count{method="POST",route="/api/leaderboard",status="201"} 1' in body
+    assert "snake_active_players 0" in body
+    assert "snake_ingest_queue_depth" in body
+
+
+def test_failed_queries_are_not_timed():
+    engine = create_engine("sqlite://")
+    metrics.instrument_engine(engine)
+    with engine.connect() as conn:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM missing"))
+        before = metrics.db_queries.value(("background",))
+        conn.execute(text("SELECT 1"))
+    engine.dispose()
+    assert metrics.db_queries.value(("background",)) == before + 1
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = metrics.Histogram("h", "Test.", ("route",), (0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        histogram.observe(("/x",), value)
+    lines = histogram.render()
+    assert 'h_bucket{route="/x",le="0.1"} 1' in lines
+    assert 'h_bucket{route="/x",le="1.0"} 3' in lines
+    assert 'h_bucket{route="/x",le="+Inf"} 4' in lines
+    assert 'h_count{route="/x"} 4' in lines
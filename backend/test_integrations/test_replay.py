@@ -0,0 +1,99 @@
+import pytest
+
+from src.game_engine import SnakeGame
+from src.models import Direction, GameMode
+from src.replay import ReplayError, ReplayReader, ReplayRecorder, play_replay
+from src.spectate import _autopilot
+
+
+def record_bot_game(mode=GameMode.WALLS, seed=1234, max_ticks=5000):
+    """Play a game with the spectate autopilot, recording every turn"""
+    game = SnakeGame(mode, seed=seed)
+    recorder = ReplayRecorder(mode, seed)
+    while not game.game_over and game.ticks < max_ticks:
+        direction = _autopilot(game)
+        if direction != game.direction:
+            recorder.turn(direction)
+            game.change_direction(direction)
+        game.tick()
+        recorder.tick()
+    return game, recorder.finish()
+
+
+def test_replay_reproduces_the_game():
+    for mode in GameMode:
+        game, data = record_bot_game(mode)
+        replayed = play_replay(data)
+        assert replayed.score == game.score
+        assert replayed.ticks == game.ticks
+        assert list(replayed.body) == list(game.body)
+
+
+def test_replays_are_compact():
+    game, data = record_bot_game()
+    assert game.score >= 100
+    # Header plus mostly one-byte turn events
+    assert len(data) < 600
+    assert len(data) < game.ticks
+
+
+def test_reader_is_lazy_and_ordered():
+    recorder = ReplayRecorder(GameMode.PASS_THROUGH, 7)
+    recorder.turn(Direction.UP)
+    for _ in range(40):
+        recorder.tick()
+    recorder.turn(Direction.LEFT)
+    recorder.turn(Direction.DOWN)
+    recorder.tick()
+    reader = ReplayReader(recorder.finish())
+
+    assert (reader.mode, reader.seed, reader.ticks) == (GameMode.PASS_THROUGH, 7, 41)
+    assert list(reader.events()) == [(0, Direction.UP), (40, Direction.LEFT), (40, Direction.DOWN)]
+    turns = reader.turns()
+    assert next(turns) == [Direction.UP]
+    assert next(turns) == []
+    assert list(turns)[-1] == [Direction.LEFT, Direction.DOWN]
+
+
+def test_rejects_malformed_data():
+    _, data = record_bot_game()
+    with pytest.raises(ReplayError):
+        ReplayReader(b"nope")
+    with pytest.raises(ReplayError):
+        ReplayReader(b"XXXX" + data[4:])
+    with pytest.raises(ReplayError):
+        # Cut in the middle of a varint
+        ReplayReader(data + b"\x80").validate()
+
+
+def test_replay_endpoints(client):
+    response = client.post("/api/leaderboard", json={"username": "bot", "score": 120, "mode": "walls"})
+    entry_id = response.json()["id"]
+    _, data = record_bot_game()
+
+    headers = {"Content-Type": "application/octet-stream"}
+    response = client.put(f"/api/leaderboard/{entry_id}/replay", content=data, headers=headers)
+    assert response.status_code == 201
+    info = response.json()
+    assert info["size"] == len(data)
+    assert info["mode"] == "walls"
+
+    response = client.get(f"/api/leaderboard/{entry_id}/replay")
+    assert response.status_code == 200
+    assert response.content == data
+    assert client.get(f"/api/leaderboard/{entry_id}/replay/info").json() == info
+
+    # Replays are write-once
+    response = client.put(f"/api/leaderboard/{entry_id}/replay", content=data, headers=headers)
+    assert response.status_code == 409
+
+
+def test_replay_upload_errors(client):
+    response = client.post("/api/leaderboard", json={"username": "bot", "score": 10, "mode": "pass-through"})
+    entry_id = response.json()["id"]
+    _, walls_replay = record_bot_game(GameMode.WALLS)
+
+    assert client.put(f"/api/leaderboard/{entry_id}/replay", content=b"garbage").status_code == 400
+    assert client.put(f"/api/leaderboard/{entry_id}/replay", content=walls_replay).status_code == 400
+    assert client.put("/api/leaderboard/missing/replay", content=walls_replay).status_code == 404
+    assert client.get("/api/leaderboard/missing/replay").status_code == 404
@@ -0,0 +1,66 @@
+import os
+import subprocess
+import sys
+from datetime import date
+
+from sqlalchemy import create_engine, func, inspect, select
+
+from src.crud import verify_password
+from src.database import ActivePlayerDB, Base, BestScoreDB, LeaderboardEntryDB, LeaderboardWindowDB, UserDB
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = os.path.join(BACKEND, "scripts", "seed_db.py")
+
+
+def _seed(url, *args):
+    env = {**os.environ, "DATABASE_URL": url, "BCRYPT_ROUNDS": "4"}
+    return subprocess.run([sys.executable, SCRIPT, "--scale", *args], env=env, capture_output=True, text=True)
+
+
+def test_scale_seed(tmp_path):
+    url = f"sqlite:///{tmp_path / 'scale.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+
+    result = _seed(url, "--users", "500", "--scores", "3000", "--active", "20", "--batch-size", "700")
+    assert result.returncode == 0, result.stderr
+
+    with engine.connect() as conn:
+        count = lambda table: conn.execute(select(func.count()).select_from(table)).scalar()
+        assert count(UserDB) == 500
+        assert count(LeaderboardEntryDB) == 3000
+        assert count(ActivePlayerDB) == 20
+
+        # One shared hash
+        hashes = conn.execute(select(UserDB.hashed_password).distinct()).scalars().all()
+        assert len(hashes) == 1 and verify_password("scale123", hashes[0])
+
+        # best_scores agrees with the leaderboard
+        expected = set(conn.execute(
+            select(LeaderboardEntryDB.username, LeaderboardEntryDB.mode, func.max(LeaderboardEntryDB.score))
+            .group_by(LeaderboardEntryDB.username, LeaderboardEntryDB.mode)
+        ).all())
+        assert set(conn.execute(select(BestScoreDB.username, BestScoreDB.mode, BestScoreDB.score)).all()) == expected
+
+        # Today's entries are in the daily rollup
+        today = conn.execute(select(func.count()).where(LeaderboardEntryDB.date == date.today())).scalar()
+        assert today > 0
+        assert conn.execute(
+            select(func.count()).select_from(LeaderboardWindowDB).where(LeaderboardWindowDB.period == "day")
+        ).scalar() == today
+
+        # Heavy-tailed activity: the busiest tenth of players has over 40% of the games
+        per_player = conn.execute(
+            select(func.count()).select_from(LeaderboardEntryDB).group_by(LeaderboardEntryDB.username)
+        ).scalars().all()
+        top = sorted(per_player, reverse=True)[:50]
+        assert sum(top) > 3000 * 0.4
+
+    # The indexes dropped for the load are back
+    assert {index["name"] for index in inspect(engine).get_indexes("leaderboard")} >= {
+        "ix_leaderboard_mode_score_id", "ix_leaderboard_score_id", "ix_leaderboard_username",
+    }
+
+    # Refuses to seed twice
+    assert _seed(url, "--users", "10", "--scores", "10").returncode != 0
+    engine.dispose()
@@ -0,0 +1,107 @@
+import asyncio
+from datetime import date
+
+from src import crud
+from src.active_players import ActivePlayerRegistry
+from src.models import GameMode, LeaderboardEntry
+from src.shared_state import Message, SharedState, SqliteSharedState
+
+
+def make_worker(path):
+    """A SqliteSharedState as one worker process would open it"""
+    return SqliteSharedState(str(path), poll_interval=3600, message_ttl=60)
+
+
+def test_local_versions_and_pubsub():
+    async def run():
+        state = SharedState()
+        assert await state.version("board") == 0
+        assert await state.set("board", {"top": 1}) == 1
+        assert await state.bump("board") == 2
+        assert await state.get("board") == ({"top": 1}, 2)
+        assert await state.delete("board")
+        assert await state.get("board") is None
+
+        heard = []
+        state.add_listener("news", heard.append)
+        queue = state.subscribe("news")
+        state.publish("news", {"n": 1})
+        assert heard == [Message("news", {"n": 1}, local=True)]
+        assert (await queue.get()).data == {"n": 1}
+        state.unsubscribe("news", queue)
+        state.publish("news", {"n": 2})
+        assert queue.empty()
+
+    asyncio.run(run())
+
+
+def test_sqlite_backend_shares_values_and_messages(tmp_path):
+    async def run():
+        a, b = make_worker(tmp_path / "shared.db"), make_worker(tmp_path / "shared.db")
+        await a.start()
+        await b.start()
+        try:
+            assert await a.set("board", [1, 2]) == 1
+            assert await b.bump("board") == 2
+            assert await a.get("board") == ([1, 2], 2)
+            # The first worker to set a default wins
+            assert await a.setdefault("epoch", "a") == ("a", 1)
+            assert await b.setdefault("epoch", "b") == ("a", 1)
+
+            heard_a, heard_b = [], []
+            a.add_listener("news", heard_a.append)
+            b.add_listener("news", heard_b.append)
+            a.publish("news", {"n": 1})
+            a.publish("news", {"n": 2})
+            assert [m.local for m in heard_a] == [True, True]
+            assert heard_b == []
+
+            await a.poll()
+            assert await a.poll() == 0
+            assert await b.poll() == 2
+            assert heard_b == [Message("news", {"n": 1}, local=False), Message("news", {"n": 2}, local=False)]
+            # Each message is delivered once
+            assert await b.poll() == 0
+        finally:
+            await a.stop()
+            await b.stop()
+
+    asyncio.run(run())
+
+
+def test_active_players_are_replicated(tmp_path):
+    async def run():
+        a, b = make_worker(tmp_path / "shared.db"), make_worker(tmp_path / "shared.db")
+        await a.start()
+        await b.start()
+        try:
+            registry_a = ActivePlayerRegistry(30, 1, False, None, shared_state=a)
+            registry_b = ActivePlayerRegistry(30, 1, False, None, shared_state=b)
+            player = registry_a.heartbeat("p1", "alice", 10, GameMode.WALLS)
+            await a.poll()
+            await b.poll()
+            assert registry_b.list() == [player]
+
+            registry_a.remove("p1")
+            await a.poll()
+            await b.poll()
+            assert len(registry_b) == 0
+        finally:
+            await a.stop()
+            await b.stop()
+
+    asyncio.run(run())
+
+
+def test_scores_from_other_workers_update_the_cache():
+    cached = LeaderboardEntry(id="a", username="alice", score=50, mode=GameMode.WALLS, date=date(2026, 1, 1))
+    crud.leaderboard_cache.clear()
+    crud.leaderboard_cache.put(GameMode.WALLS, 10, [cached], crud.leaderboard_cache.generation(GameMode.WALLS))
+
+    remote = LeaderboardEntry(id="b", username="bob", score=90, mode=GameMode.WALLS, date=date(2026, 1, 2))
+    crud._on_scores_message(Message(crud.SCORES_CHANNEL, {
+        "entries": [remote.model_dump(mode="json")],
+        "previous_bests": [["bob", "walls", None]],
+    }, local=False))
+    assert crud.leaderboard_cache.get(GameMode.WALLS, 10) == [remote, cached]
+    crud.leaderboard_cache.clear()
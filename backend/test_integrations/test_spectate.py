@@ -0,0 +1,99 @@
+import asyncio
+import json
+
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from src.models import GameMode
+from src.spectate import SpectatorChannel, spectate_hub
+
+
+def apply(state, message):
+    """What a spectator does with each message"""
+    if message["type"] == "keyframe":
+        return {key: message[key] for key in ("snake", "food", "score", "gameOver")}
+    if message.get("head"):
+        snake = [message["head"]] + (state["snake"][:-1] if message["tail"] else state["snake"])
+        state = {**state, "snake": snake}
+    for key in ("food", "score", "gameOver"):
+        if key in message:
+            state = {**state, key: message[key]}
+    return state
+
+
+def drain(queue):
+    messages = []
+    while not queue.empty():
+        messages.append(json.loads(queue.get_nowait()))
+    return messages
+
+
+def test_deltas_rebuild_the_game():
+    async def run():
+        channel = SpectatorChannel("p1", GameMode.PASS_THROUGH, 100, tick_ms=1, keyframe_ticks=25, queue_size=1000)
+        queue = channel.subscribe()
+        state = None
+        for _ in range(300):
+            channel.step()
+            for message in drain(queue):
+                state = apply(state, message)
+            if not channel.game.game_over:
+                assert state == apply(None, json.loads(channel.keyframe()))
+        return channel
+
+    channel = asyncio.run(run())
+    assert channel.messages_sent >= 300
+
+
+def test_deltas_are_small_and_shared():
+    async def run():
+        channel = SpectatorChannel("p1", GameMode.WALLS, 0, tick_ms=1, keyframe_ticks=1000, queue_size=10)
+        first, second = channel.subscribe(), channel.subscribe()
+        drain(first), drain(second)
+        channel.step()
+        a, b = first.get_nowait(), second.get_nowait()
+        # One serialization per tick, shared by every spectator
+        assert a is b
+        assert json.loads(a)["type"] == "delta"
+        assert len(a) < len(channel.keyframe())
+
+    asyncio.run(run())
+
+
+def test_slow_spectator_gets_resynced():
+    async def run():
+        channel = SpectatorChannel("p1", GameMode.PASS_THROUGH, 0, tick_ms=1, keyframe_ticks=1000, queue_size=3)
+        queue = channel.subscribe()
+        for _ in range(10):
+            channel.step()
+        assert channel.resyncs > 0
+        messages = drain(queue)
+        assert any(message["type"] == "keyframe" for message in messages)
+
+    asyncio.run(run())
+
+
+def test_spectate_websocket(client, auth_headers, monkeypatch):
+    client.post("/api/games/heartbeat", json={
+        "id": "ws-player", "username": "viper", "score": 40, "mode": "walls"
+    }, headers=auth_headers("viper"))
+    monkeypatch.setattr(spectate_hub, "tick_ms", 5)
+
+    with client.websocket_connect("/api/games/ws-player/ws") as websocket:
+        keyframe = websocket.receive_json()
+        assert keyframe["type"] == "keyframe"
+        assert keyframe["score"] == 40
+        assert len(keyframe["snake"]) == 3
+        delta = websocket.receive_json()
+        assert delta["type"] in ("delta", "keyframe")
+        assert "ws-player" in spectate_hub.channels
+
+    # The last spectator leaving stops the channel
+    assert "ws-player" not in spectate_hub.channels
+
+
+def test_spectate_unknown_player(client):
+    with pytest.raises(WebSocketDisconnect) as excinfo:
+        with client.websocket_connect("/api/games/nobody/ws") as websocket:
+            websocket.receive_json()
+    assert excinfo.value.code == 1008
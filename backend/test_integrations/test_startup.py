@@ -0,0 +1,68 @@
+import asyncio
+import os
+import subprocess
+import sys
+
+import pytest
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from src.database import SCHEMA_REVISION, Base, SchemaError, check_schema_revision
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _python(code, **env):
+    return subprocess.run(
+        [sys.executable, "-c", code], cwd=BACKEND, env={**os.environ, **env},
+        capture_output=True, text=True, check=True,
+    ).stdout
+
+
+def test_schema_revision_is_the_alembic_head():
+    scripts = ScriptDirectory.from_config(Config(os.path.join(BACKEND, "alembic.ini")))
+    assert scripts.get_current_head() == SCHEMA_REVISION
+
+
+def test_check_schema_revision(database_path):
+    sync_engine = create_engine(f"sqlite:///{database_path}")
+    Base.metadata.create_all(sync_engine)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{database_path}", poolclass=NullPool)
+
+    # Created by create_all, never migrated
+    with pytest.raises(SchemaError, match="revision none"):
+        asyncio.run(check_schema_revision(engine))
+
+    with sync_engine.begin() as conn:
+        conn.execute(text("CREATE TABLE alembic_version (version_num VARCHAR(32) NOT NULL)"))
+        conn.execute(text("INSERT INTO alembic_version VALUES ('004')"))
+    with pytest.raises(SchemaError, match="revision 004"):
+        asyncio.run(check_schema_revision(engine))
+
+    with sync_engine.begin() as conn:
+        conn.execute(text("UPDATE alembic_version SET version_num = :revision"), {"revision": SCHEMA_REVISION})
+    asyncio.run(check_schema_revision(engine))
+    sync_engine.dispose()
+
+
+def test_rarely_used_modules_are_not_imported():
+    loaded = _python("import sys, src.main; print(sorted(m for m in ('bcrypt', 'jose', 'multiprocessing') if m in sys.modules))")
+    assert loaded.strip().splitlines()[-1] == "[]"
+
+
+def test_startup_report(tmp_path):
+    output = _python(
+        "from src.main import app\n"
+        "from fastapi.testclient import TestClient\n"
+        "with TestClient(app) as client:\n"
+        "    client.get('/api/games/active')\n"
+        "    client.get('/api/games/active')\n",
+        STARTUP_REPORT="true",
+        DATABASE_URL=f"sqlite:///{tmp_path / 'startup.db'}",
+    )
+    assert output.count("Startup report") == 1
+    assert "first request served" in output
+    assert "fastapi" in output and "sqlalchemy" in output
@@ -0,0 +1,89 @@
+import gzip
+import os
+import subprocess
+import sys
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from src.static_files import IMMUTABLE, REVALIDATE, StaticIndex, accepted_encodings
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_JS = b"console.log('snake');\n" * 200
+
+
+@pytest.fixture
+def static_dir(tmp_path):
+    (tmp_path / "assets").mkdir()
+    (tmp_path / "index.html").write_bytes(b"<!doctype html><div id=root></div>")
+    (tmp_path / "assets" / "index-abc123.js").write_bytes(APP_JS)
+    (tmp_path / "robots.txt").write_bytes(b"User-agent: *\n")
+    subprocess.run(
+        [sys.executable, os.path.join(BACKEND, "scripts", "precompress_static.py"), str(tmp_path)],
+        check=True, capture_output=True,
+    )
+    return tmp_path
+
+
+@pytest.fixture
+def static_client(static_dir):
+    index = StaticIndex(str(static_dir))
+    app = FastAPI()
+
+    @app.get("/{rest_of_path:path}")
+    async def serve_frontend(rest_of_path: str, request: Request):
+        return index.response(request, rest_of_path)
+
+    return TestClient(app)
+
+
+def test_index_skips_variants(static_dir):
+    index = StaticIndex(str(static_dir))
+    assert sorted(index.files) == ["assets/index-abc123.js", "index.html", "robots.txt"]
+    assert "gzip" in index.files["assets/index-abc123.js"].variants
+    # Too small to be worth compressing
+    assert list(index.files["index.html"].variants) == ["identity"]
+
+
+def test_serves_the_best_accepted_encoding(static_client):
+    url = "/assets/index-abc123.js"
+    plain = static_client.get(url, headers={"Accept-Encoding": "identity"})
+    assert plain.content == APP_JS
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["cache-control"] == IMMUTABLE
+    assert plain.headers["content-type"].startswith("text/javascript")
+
+    gzipped = static_client.get(url, headers={"Accept-Encoding": "gzip, br;q=0"})
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert gzipped.headers["vary"] == "Accept-Encoding"
+    assert gzipped.content == APP_JS  # decoded by the client
+    assert int(gzipped.headers["content-length"]) < len(APP_JS)
+
+    pytest.importorskip("brotli")
+    compressed = static_client.get(url, headers={"Accept-Encoding": "gzip, deflate, br"})
+    assert compressed.headers["content-encoding"] == "br"
+    assert int(compressed.headers["content-length"]) < len(gzip.compress(APP_JS))
+    assert compressed.content == APP_JS
+
+
+def test_spa_fallback_and_missing_assets(static_client):
+    page = static_client.get("/leaderboard")
+    assert page.status_code == 200
+    assert page.content.startswith(b"<!doctype html>")
+    assert page.headers["cache-control"] == REVALIDATE
+    assert static_client.get("/robots.txt").content == b"User-agent: *\n"
+    assert static_client.get("/assets/missing-123.js").status_code == 404
+
+
+def test_revalidation(static_client):
+    etag = static_client.get("/").headers["etag"]
+    response = static_client.get("/", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+
+def test_accept_encoding_parsing():
+    assert accepted_encodings("gzip, deflate, br") == {"gzip", "deflate", "br"}
+    assert accepted_encodings("br;q=0, gzip;q=0.5") == {"gzip"}
+    assert accepted_encodings(None) == set()
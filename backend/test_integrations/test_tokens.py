@@ -0,0 +1,144 @@
+import asyncio
+import time
+
+import pytest
+
+from src import crud
+from src.config import settings
+from src.models import User
+from src.shared_state import Message, shared_state
+from src.tokens import (
+    REVOCATIONS_CHANNEL, SecretKeyError, TokenCache, TokenError, check_secret_key, create_access_token, token_cache,
+)
+
+SIGNUP = {"username": "tokenuser", "email": "token@example.com", "password": "securepassword123"}
+
+
+def _bearer(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_signup_and_login_issue_tokens(client):
+    signup = client.post("/api/auth/signup", json=SIGNUP)
+    assert signup.status_code == 201
+    data = signup.json()
+    assert data["token_type"] == "bearer"
+    assert data["expires_in"] > 0
+
+    me = client.get("/api/auth/me", headers=_bearer(data["access_token"]))
+    assert me.status_code == 200
+    assert me.json() == {"id": data["id"], "username": "tokenuser", "email": "token@example.com"}
+
+    login = client.post("/api/auth/login", json={"email": SIGNUP["email"], "password": SIGNUP["password"]})
+    assert login.status_code == 200
+    assert login.json()["access_token"] != data["access_token"]
+
+
+def test_me_requires_a_valid_token(client):
+    missing = client.get("/api/auth/me")
+    assert missing.status_code == 401
+    assert missing.headers["www-authenticate"] == "Bearer"
+    assert client.get("/api/auth/me", headers=_bearer("not-a-token")).status_code == 401
+
+    forged = create_access_token(User(id="x", username="x", email="x@example.com"))[:-2] + "AA"
+    assert client.get("/api/auth/me", headers=_bearer(forged)).status_code == 401
+
+
+def test_authenticated_calls_skip_bcrypt(client, monkeypatch):
+    token = client.post("/api/auth/signup", json=SIGNUP).json()["access_token"]
+
+    def fail(*args):
+        raise AssertionError("bcrypt ran on an authenticated call")
+
+    monkeypatch.setattr(crud, "verify_password", fail)
+    monkeypatch.setattr(crud, "hash_password", fail)
+    for _ in range(3):
+        assert client.get("/api/auth/me", headers=_bearer(token)).status_code == 200
+    stats = token_cache.stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 2
+
+
+def test_logout_revokes_the_token(client):
+    token = client.post("/api/auth/signup", json=SIGNUP).json()["access_token"]
+    assert client.get("/api/auth/me", headers=_bearer(token)).status_code == 200
+
+    response = client.post("/api/auth/logout", headers=_bearer(token))
+    assert response.json() == {"message": "Successfully logged out"}
+    revoked = client.get("/api/auth/me", headers=_bearer(token))
+    assert revoked.status_code == 401
+    assert revoked.json()["detail"] == "Token has been revoked"
+
+    # Logging out without a token is still accepted
+    assert client.post("/api/auth/logout").status_code == 200
+
+
+def test_expired_token_is_rejected(client):
+    token = create_access_token(User(id="x", username="x", email="x@example.com"), ttl=-1)
+    assert client.get("/api/auth/me", headers=_bearer(token)).status_code == 401
+
+
+def test_revocations_from_other_workers(client):
+    token = client.post("/api/auth/signup", json=SIGNUP).json()["access_token"]
+    claims = token_cache.decode(token)
+
+    token_cache._on_message(Message(REVOCATIONS_CHANNEL, {"jti": claims.jti, "exp": claims.expires_at}, local=False))
+    assert client.get("/api/auth/me", headers=_bearer(token)).status_code == 401
+
+
+def test_cache_is_bounded():
+    cache = TokenCache(max_size=2)
+    user = User(id="x", username="x", email="x@example.com")
+    tokens = [create_access_token(user) for _ in range(3)]
+    for token in tokens:
+        cache.decode(token)
+    assert cache.stats()["size"] == 2
+    # The oldest token was evicted, so it is verified again
+    cache.decode(tokens[0])
+    assert cache.stats()["misses"] == 4
+
+
+def test_standalone_caches_do_not_replicate():
+    listeners = len(shared_state._listeners[REVOCATIONS_CHANNEL])
+    cache = TokenCache(max_size=2)
+    claims = cache.decode(create_access_token(User(id="x", username="x", email="x@example.com")))
+    published = shared_state.published
+    cache.revoke(claims)
+    assert shared_state.published == published
+    assert len(shared_state._listeners[REVOCATIONS_CHANNEL]) == listeners
+
+
+def test_workers_need_a_secret_key_outside_development(monkeypatch):
+    monkeypatch.setattr(settings, "SECRET_KEY", "")
+    monkeypatch.setattr(settings, "DEV_MODE", False)
+    with pytest.raises(SecretKeyError):
+        check_secret_key()
+
+    monkeypatch.setattr(settings, "DEV_MODE", True)
+    check_secret_key()
+
+    monkeypatch.setattr(settings, "DEV_MODE", False)
+    monkeypatch.setattr(settings, "SECRET_KEY", "shared")
+    check_secret_key()
+
+
+def test_revocations_survive_a_restart(client, session_factory):
+    token = client.post("/api/auth/signup", json=SIGNUP).json()["access_token"]
+    client.post("/api/auth/logout", headers=_bearer(token))
+
+    async def stored_revocations():
+        async with session_factory() as db:
+            # Revoking another token prunes the expired one
+            await crud.add_revoked_token_async(db, "expired", int(time.time()) - 1)
+            await crud.add_revoked_token_async(db, "other", int(time.time()) + 60)
+            return await crud.get_revoked_tokens_async(db)
+
+    revoked = dict(asyncio.run(stored_revocations()))
+    assert "expired" not in revoked
+    assert len(revoked) == 2
+
+    # A worker started after the logout
+    cache = TokenCache(max_size=10)
+    cache.load_revoked(revoked.items())
+    with pytest.raises(TokenError, match="revoked"):
+        cache.decode(token)
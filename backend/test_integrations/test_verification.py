@@ -0,0 +1,109 @@
+import base64
+
+from src import crud
+from src.config import settings
+from src.models import GameMode
+from src.replay import ReplayRecorder
+from test_integrations.test_replay import record_bot_game
+
+
+def _submission(username, score, mode, data):
+    return {
+        "username": username,
+        "score": score,
+        "mode": mode.value,
+        "replay": base64.b64encode(data).decode(),
+    }
+
+
+def test_verified_score_stores_its_replay(client):
+    game, data = record_bot_game(GameMode.PASS_THROUGH, max_ticks=500)
+    response = client.post("/api/leaderboard", json=_submission("honest", game.score, GameMode.PASS_THROUGH, data))
+    assert response.status_code == 201
+    body = response.json()
+    assert body["verified"] is True
+    assert body["score"] == game.score
+
+    replay = client.get(f"/api/leaderboard/{body['id']}/replay")
+    assert replay.status_code == 200
+    assert replay.content == data
+
+
+def test_score_is_not_stored_without_its_replay(client, monkeypatch):
+    game, data = record_bot_game(GameMode.PASS_THROUGH, max_ticks=500)
+
+    def fail(**kwargs):
+        raise RuntimeError("replay write failed")
+
+    monkeypatch.setattr(crud, "ReplayDB", fail)
+    response = client.post("/api/leaderboard", json=_submission("honest", game.score, GameMode.PASS_THROUGH, data))
+    assert response.status_code == 500
+    assert client.get("/api/leaderboard").json() == []
+
+
+def test_rejects_scores_the_replay_does_not_produce(client):
+    game, data = record_bot_game(GameMode.WALLS, max_ticks=500)
+    response = client.post("/api/leaderboard", json=_submission("cheater", game.score + 100, GameMode.WALLS, data))
+    assert response.status_code == 422
+    assert "does not match" in response.json()["detail"]
+
+    response = client.post("/api/leaderboard", json=_submission("cheater", game.score, GameMode.PASS_THROUGH, data))
+    assert response.status_code == 422
+
+    assert client.get("/api/leaderboard").json() == []
+
+
+def test_rejects_malformed_replays(client):
+    response = client.post(
+        "/api/leaderboard",
+        json={"username": "p1", "score": 10, "mode": "walls", "replay": "not base64!"},
+    )
+    assert response.status_code == 400
+
+    response = client.post(
+        "/api/leaderboard",
+        json={"username": "p1", "score": 10, "mode": "walls", "replay": base64.b64encode(b"SNKR").decode()},
+    )
+    assert response.status_code == 400
+
+
+def test_replays_over_the_tick_limit_are_rejected(client, monkeypatch):
+    recorder = ReplayRecorder(GameMode.WALLS, 1)
+    for _ in range(20):
+        recorder.tick()
+    monkeypatch.setattr(settings, "REPLAY_MAX_TICKS", 10)
+    response = client.post("/api/leaderboard", json=_submission("p1", 0, GameMode.WALLS, recorder.finish()))
+    assert response.status_code == 400
+
+
+def test_verification_modes(client, monkeypatch):
+    monkeypatch.setattr(settings, "SCORE_VERIFICATION", "required")
+    response = client.post("/api/leaderboard", json={"username": "p1", "score": 10, "mode": "walls"})
+    assert response.status_code == 422
+
+    monkeypatch.setattr(settings, "SCORE_VERIFICATION", "off")
+    _, data = record_bot_game(GameMode.WALLS, max_ticks=100)
+    response = client.post("/api/leaderboard", json=_submission("p1", 12345, GameMode.WALLS, data))
+    assert response.status_code == 201
+    assert response.json()["verified"] is False
+
+
+def test_batch_verifies_each_replay(client):
+    honest, honest_data = record_bot_game(GameMode.WALLS, seed=1, max_ticks=300)
+    _, cheat_data = record_bot_game(GameMode.WALLS, seed=2, max_ticks=300)
+    response = client.post(
+        "/api/leaderboard/batch",
+        json=[
+            _submission("honest", honest.score, GameMode.WALLS, honest_data),
+            {"username": "no-replay", "score": 5, "mode": "walls"},
+            _submission("cheater", 99999, GameMode.WALLS, cheat_data),
+        ],
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert [entry["username"] for entry in body["created"]] == ["honest", "no-replay"]
+    assert [error["index"] for error in body["errors"]] == [2]
+
+    honest_id = body["created"][0]["id"]
+    assert client.get(f"/api/leaderboard/{honest_id}/replay").content == honest_data
+    assert client.get(f"/api/leaderboard/{body['created'][1]['id']}/replay").status_code == 404
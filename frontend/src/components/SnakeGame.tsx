@@ -6,6 +6,8 @@ import { api, type GameMode } from "@/services/api";
 import { Button } from "@/components/ui/button";
 import { useToast } from "@/hooks/use-toast";
 
+const HEARTBEAT_MS = 5000;
+
 const SnakeGame: React.FC = () => {
   const { snake, food, score, gameOver, isPlaying, gameMode, start, reset, switchMode } =
     useSnakeGame("walls");
@@ -35,6 +37,20 @@ const SnakeGame: React.FC = () => {
     if (gameOver) handleGameOver();
   }, [gameOver]);
 
+  // Appear in watch mode while playing
+  const scoreRef = React.useRef(score);
+  scoreRef.current = score;
+  React.useEffect(() => {
+    if (!user || !isPlaying) return;
+    const beat = () => api.heartbeat(user.id, user.username, scoreRef.current, gameMode).catch(() => {});
+    beat();
+    const id = setInterval(beat, HEARTBEAT_MS);
+    return () => {
+      clearInterval(id);
+      api.endGame(user.id).catch(() => {});
+    };
+  }, [user, isPlaying, gameMode]);
+
   return (
     <div className="flex flex-col lg:flex-row items-center lg:items-start gap-8 justify-center">
       {/* Left panel — stats & controls */}
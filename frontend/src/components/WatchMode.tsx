@@ -1,54 +1,13 @@
-import React, { useEffect, useState, useRef } from "react";
-import { api, type ActivePlayer, type Position, type Direction } from "@/services/api";
+import React, { useEffect, useState } from "react";
+import { api, type ActivePlayer, type LiveGameState } from "@/services/api";
 import GameBoard from "@/components/GameBoard";
-import { GRID_SIZE, moveSnake } from "@/hooks/useSnakeGame";
 import { Button } from "@/components/ui/button";
 
-function randomPosition(exclude: Position[] = []): Position {
-  let pos: Position;
-  do {
-    pos = { x: Math.floor(Math.random() * GRID_SIZE), y: Math.floor(Math.random() * GRID_SIZE) };
-  } while (exclude.some((p) => p.x === pos.x && p.y === pos.y));
-  return pos;
-}
-
-function aiDirection(snake: Position[], food: Position, currentDir: Direction): Direction {
-  const head = snake[0];
-  const dirs: Direction[] = ["UP", "DOWN", "LEFT", "RIGHT"];
-  const opposite: Record<Direction, Direction> = { UP: "DOWN", DOWN: "UP", LEFT: "RIGHT", RIGHT: "LEFT" };
-  const preferred: Direction[] = [];
-  if (food.x > head.x) preferred.push("RIGHT");
-  if (food.x < head.x) preferred.push("LEFT");
-  if (food.y > head.y) preferred.push("DOWN");
-  if (food.y < head.y) preferred.push("UP");
-  const candidates = [...preferred, currentDir, ...dirs].filter((d) => d !== opposite[currentDir]);
-  for (const d of candidates) {
-    const next = { ...head };
-    if (d === "UP") next.y--;
-    if (d === "DOWN") next.y++;
-    if (d === "LEFT") next.x--;
-    if (d === "RIGHT") next.x++;
-    next.x = ((next.x % GRID_SIZE) + GRID_SIZE) % GRID_SIZE;
-    next.y = ((next.y % GRID_SIZE) + GRID_SIZE) % GRID_SIZE;
-    if (!snake.some((p) => p.x === next.x && p.y === next.y)) return d;
-  }
-  return currentDir;
-}
-
 const WatchMode: React.FC = () => {
   const [players, setPlayers] = useState<ActivePlayer[]>([]);
   const [selectedId, setSelectedId] = useState<string | null>(null);
   const [loading, setLoading] = useState(true);
-  const [simSnake, setSimSnake] = useState<Position[]>([{ x: 10, y: 10 }, { x: 9, y: 10 }, { x: 8, y: 10 }]);
-  const [simFood, setSimFood] = useState<Position>({ x: 5, y: 5 });
-  const [simScore, setSimScore] = useState(0);
-  const [simDir, setSimDir] = useState<Direction>("RIGHT");
-  const snakeRef = useRef(simSnake);
-  const foodRef = useRef(simFood);
-  const dirRef = useRef(simDir);
-  snakeRef.current = simSnake;
-  foodRef.current = simFood;
-  dirRef.current = simDir;
+  const [game, setGame] = useState<LiveGameState | null>(null);
 
   useEffect(() => {
     api.getActivePlayers().then((p) => { setPlayers(p); setLoading(false); });
@@ -56,29 +15,8 @@ const WatchMode: React.FC = () => {
 
   useEffect(() => {
     if (!selectedId) return;
-    const initSnake = [{ x: 10, y: 10 }, { x: 9, y: 10 }, { x: 8, y: 10 }];
-    const initFood = randomPosition(initSnake);
-    setSimSnake(initSnake); setSimFood(initFood); setSimScore(0); setSimDir("RIGHT");
-    snakeRef.current = initSnake; foodRef.current = initFood; dirRef.current = "RIGHT";
-
-    const id = setInterval(() => {
-      const newDir = aiDirection(snakeRef.current, foodRef.current, dirRef.current);
-      dirRef.current = newDir; setSimDir(newDir);
-      const { newSnake, ate, dead } = moveSnake(snakeRef.current, newDir, "pass-through", foodRef.current);
-      if (dead) {
-        const restart = [{ x: 10, y: 10 }, { x: 9, y: 10 }, { x: 8, y: 10 }];
-        const nf = randomPosition(restart);
-        setSimSnake(restart); setSimFood(nf); setSimScore(0); setSimDir("RIGHT");
-        snakeRef.current = restart; foodRef.current = nf; dirRef.current = "RIGHT";
-        return;
-      }
-      setSimSnake(newSnake); snakeRef.current = newSnake;
-      if (ate) {
-        const nf = randomPosition(newSnake);
-        setSimFood(nf); foodRef.current = nf; setSimScore((s) => s + 10);
-      }
-    }, 150);
-    return () => clearInterval(id);
+    setGame(null);
+    return api.watchGame(selectedId, setGame);
   }, [selectedId]);
 
   if (loading) return <p className="text-muted-foreground text-sm text-center py-12">Loading players...</p>;
@@ -90,7 +28,7 @@ const WatchMode: React.FC = () => {
         <h2 className="font-pixel text-lg sm:text-xl text-accent" style={{ textShadow: "var(--accent-glow)" }}>
           WATCH LIVE
         </h2>
-        <p className="text-sm text-muted-foreground mt-1">Spectate active players in real-time</p>
+        <p className="text-sm text-muted-foreground mt-1">See who is playing and preview a simulated game in their mode</p>
       </div>
 
       {!selectedId ? (
@@ -135,17 +73,21 @@ const WatchMode: React.FC = () => {
           <div className="flex items-center gap-6">
             <div className="p-3 rounded-lg border border-border bg-card/50 text-center">
               <span className="text-[10px] font-pixel text-muted-foreground">SCORE</span>
-              <div className="font-pixel text-xl text-primary neon-text">{String(simScore).padStart(4, "0")}</div>
+              <div className="font-pixel text-xl text-primary neon-text">{String(game?.score ?? 0).padStart(4, "0")}</div>
             </div>
             <div className="p-3 rounded-lg border border-border bg-card/50 text-center">
               <span className="text-[10px] font-pixel text-muted-foreground">LENGTH</span>
-              <div className="font-pixel text-xl text-secondary cyan-text">{simSnake.length}</div>
+              <div className="font-pixel text-xl text-secondary cyan-text">{game?.snake.length ?? 0}</div>
             </div>
           </div>
-          <GameBoard snake={simSnake} food={simFood} cellSize="lg" />
+          {game ? (
+            <GameBoard snake={game.snake} food={game.food} cellSize="lg" />
+          ) : (
+            <p className="text-muted-foreground text-sm py-12">Connecting...</p>
+          )}
           <p className="text-xs text-muted-foreground flex items-center gap-2">
             <span className="w-1.5 h-1.5 rounded-full bg-accent animate-pulse" />
-            Live AI simulation
+            Simulated preview of this mode, not the player's actual moves
           </p>
         </div>
       )}
@@ -8,6 +8,7 @@ import type { Position } from "@/client/models/Position";
 import { AuthService } from "@/client/services/AuthService";
 import { LeaderboardService } from "@/client/services/LeaderboardService";
 import { GameService } from "@/client/services/GameService";
+import { request as __request } from "@/client/core/request";
 
 // Configure base URL (Vite proxy handles /api -> localhost:3000)
 OpenAPI.BASE = "/api";
@@ -16,18 +17,62 @@ export type { User, LeaderboardEntry, ActivePlayer, GameState, Position };
 export { GameMode };
 export type Direction = "UP" | "DOWN" | "LEFT" | "RIGHT"; 
 
+// Messages pushed by /api/games/{player_id}/ws
+type Cell = [number, number];
+export type SpectateMessage =
+  | { type: "keyframe"; tick: number; snake: Cell[]; food: Cell; direction: Direction; score: number; gameOver: boolean }
+  | { type: "delta"; tick: number; head?: Cell; tail?: boolean; direction?: Direction; food?: Cell; score?: number; gameOver?: boolean };
+
+export type LiveGameState = Required<GameState>;
+
+const toPosition = ([x, y]: Cell): Position => ({ x, y });
+
+export function applySpectateMessage(state: LiveGameState | null, message: SpectateMessage): LiveGameState | null {
+  if (message.type === "keyframe") {
+    return {
+      snake: message.snake.map(toPosition),
+      food: toPosition(message.food),
+      direction: message.direction as GameState["direction"],
+      score: message.score,
+      gameOver: message.gameOver,
+    } as LiveGameState;
+  }
+  // Deltas only make sense on top of a keyframe
+  if (!state) return null;
+  const next = { ...state };
+  if (message.head) {
+    const body = message.tail ? state.snake.slice(0, -1) : state.snake;
+    next.snake = [toPosition(message.head), ...body];
+  }
+  if (message.direction) next.direction = message.direction as GameState["direction"];
+  if (message.food) next.food = toPosition(message.food);
+  if (message.score !== undefined) next.score = message.score;
+  if (message.gameOver !== undefined) next.gameOver = message.gameOver;
+  return next;
+}
+
+// Login and signup return an access token; later requests send it as a bearer token
+function startSession(user: User & { access_token?: string }): User {
+  OpenAPI.TOKEN = user.access_token;
+  return user;
+}
+
 export const api = {
   // Auth
   async login(email: string, password: string): Promise<User> {
-    return AuthService.postAuthLogin({ email, password });
+    return startSession(await AuthService.postAuthLogin({ email, password }));
   },
 
   async signup(email: string, password: string, username: string): Promise<User> {
-    return AuthService.postAuthSignup({ email, password, username });
+    return startSession(await AuthService.postAuthSignup({ email, password, username }));
   },
 
   async logout(): Promise<void> {
-    return AuthService.postAuthLogout();
+    try {
+      return await AuthService.postAuthLogout();
+    } finally {
+      OpenAPI.TOKEN = undefined;
+    }
   },
 
   // Leaderboard
@@ -44,6 +89,36 @@ export const api = {
     return GameService.getGamesActive();
   },
 
+  // Keeps the signed-in player in the active list while a game is running
+  async heartbeat(id: string, username: string, score: number, mode: GameMode): Promise<ActivePlayer> {
+    return __request(OpenAPI, {
+      method: "POST",
+      url: "/games/heartbeat",
+      body: { id, username, score, mode },
+      mediaType: "application/json",
+    });
+  },
+
+  async endGame(id: string): Promise<void> {
+    return __request(OpenAPI, {
+      method: "DELETE",
+      url: "/games/{playerId}",
+      path: { playerId: id },
+    });
+  },
+
+  // Live spectating; returns a function that closes the stream
+  watchGame(playerId: string, onState: (state: LiveGameState) => void): () => void {
+    const protocol = window.location.protocol === "https:" ? "wss" : "ws";
+    const socket = new WebSocket(`${protocol}://${window.location.host}${OpenAPI.BASE}/games/${playerId}/ws`);
+    let state: LiveGameState | null = null;
+    socket.onmessage = (event) => {
+      state = applySpectateMessage(state, JSON.parse(event.data));
+      if (state) onState(state);
+    };
+    return () => socket.close();
+  },
+
   async getPlayerGameState(playerId: string): Promise<GameState | null> {
       try {
         return await GameService.getGames(playerId);
@@ -1,9 +1,10 @@
 import { describe, it, expect, vi, beforeEach } from "vitest";
-import { api } from "@/services/api";
+import { api, applySpectateMessage } from "@/services/api";
 import { AuthService } from "@/client/services/AuthService";
 import { LeaderboardService } from "@/client/services/LeaderboardService";
 import { GameService } from "@/client/services/GameService";
 import { ApiError } from "@/client/core/ApiError";
+import { OpenAPI } from "@/client/core/OpenAPI";
 import { GameMode } from "@/client/models/GameMode";
 import { GameState } from "@/client/models/GameState";
 
@@ -28,6 +29,17 @@ describe("API Service", () => {
       expect(AuthService.postAuthLogin).toHaveBeenCalledWith({ email: "demo@snake.io", password: "demo123" });
     });
 
+    it("sends the access token on later requests until logout", async () => {
+      const mockUser = { id: "1", username: "SnakeMaster", email: "demo@snake.io", access_token: "signed" };
+      vi.mocked(AuthService.postAuthLogin).mockResolvedValue(mockUser);
+      vi.mocked(AuthService.postAuthLogout).mockResolvedValue(undefined);
+
+      await api.login("demo@snake.io", "demo123");
+      expect(OpenAPI.TOKEN).toBe("signed");
+      await api.logout();
+      expect(OpenAPI.TOKEN).toBeUndefined();
+    });
+
     it("fails with invalid credentials", async () => {
       const request = { method: 'POST', url: '/auth/login' };
       const response = {
@@ -144,3 +156,34 @@ describe("API Service", () => {
     });
   });
 });
+
+describe("applySpectateMessage", () => {
+  const keyframe = {
+    type: "keyframe" as const,
+    tick: 10,
+    snake: [[5, 5], [4, 5], [3, 5]] as [number, number][],
+    food: [9, 9] as [number, number],
+    direction: "RIGHT" as const,
+    score: 40,
+    gameOver: false,
+  };
+
+  it("ignores deltas until a keyframe arrives", () => {
+    expect(applySpectateMessage(null, { type: "delta", tick: 1, head: [1, 1], tail: true })).toBeNull();
+  });
+
+  it("moves the snake and applies changes", () => {
+    let state = applySpectateMessage(null, keyframe);
+    state = applySpectateMessage(state, { type: "delta", tick: 11, head: [6, 5], tail: true });
+    expect(state!.snake).toEqual([{ x: 6, y: 5 }, { x: 5, y: 5 }, { x: 4, y: 5 }]);
+
+    state = applySpectateMessage(state, { type: "delta", tick: 12, head: [7, 5], tail: false, food: [1, 2], score: 50 });
+    expect(state!.snake).toHaveLength(4);
+    expect(state!.food).toEqual({ x: 1, y: 2 });
+    expect(state!.score).toBe(50);
+
+    state = applySpectateMessage(state, { type: "delta", tick: 13, gameOver: true });
+    expect(state!.gameOver).toBe(true);
+    expect(state!.snake).toHaveLength(4);
+  });
+});
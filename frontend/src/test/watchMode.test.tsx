@@ -15,6 +15,10 @@ vi.mock("@/services/api", () => ({
         if (id === "p1") return { snake: [], food: {x:0, y:0}, direction: "UP", score: 100, gameOver: false };
         return null;
     }),
+    watchGame: vi.fn((id, onState) => {
+        onState({ snake: [{ x: 10, y: 10 }], food: { x: 5, y: 5 }, direction: "RIGHT", score: 340, gameOver: false });
+        return () => {};
+    }),
   },
 }));
 
@@ -46,5 +50,7 @@ describe("WatchMode", () => {
     await waitFor(() => {
       expect(screen.getByTestId("game-board")).toBeInTheDocument();
     });
+    // The stream is an autopilot simulation, not the player's game
+    expect(screen.getByText(/simulated preview/i)).toBeInTheDocument();
   });
 });
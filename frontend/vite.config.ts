@@ -15,6 +15,7 @@ export default defineConfig(({ mode }) => ({
       "/api": {
         target: "http://localhost:3000",
         changeOrigin: true,
+        ws: true,
       },
     },
   },